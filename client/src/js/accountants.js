@@ -115,7 +115,10 @@ class AccountantsManager {
 
     async loadAllAccountants() {
         try {
-            const data = await AccountantAPI.getAll();
+            const data = await AccountantAPI.getAll({
+                expand: 'worker',
+                fields: 'worker_id,qual,kit,id_number,worker_surname,worker_firstname,worker_lastname'
+            });
             this.renderAccountants(data.accountants);
         } catch (error) {
             console.error('Ошибка:', error);
@@ -125,7 +128,7 @@ class AccountantsManager {
 
     renderAccountants(accountants) {
         if (!accountants || !Array.isArray(accountants)) {
-            this.tableBody.innerHTML = '<tr><td colspan="4">Нет данных о бухгалтерах</td></tr>';
+            this.tableBody.innerHTML = '<tr><td colspan="5">Нет данных о бухгалтерах</td></tr>';
             return;
         }
 
@@ -136,6 +139,7 @@ class AccountantsManager {
             <thead>
                 <tr>
                     <th>ID</th>
+                    <th>Сотрудник</th>
                     <th>Арсенал</th>
                     <th>Квалификация</th>
                     <th>Номер заявки</th>
@@ -149,6 +153,7 @@ class AccountantsManager {
         this.tableBody.innerHTML = accountants.map(accountant => `
             <tr data-id="${accountant.worker_id}">
                 <td>${accountant.worker_id}</td>
+                <td>${accountant.worker_surname} ${accountant.worker_firstname} ${accountant.worker_lastname}</td>
                 <td>${accountant.kit}</td>
                 <td>${accountant.qual}</td>
                 <td>${accountant.id_number}</td>
@@ -1,14 +1,26 @@
 const API_BASE_URL = 'http://localhost:8000';
 
 class WorkerAPI {
-  static async getAll() {
-    const response = await fetch(`${API_BASE_URL}/workers/`, {
+  static async getAll(params = {}) {
+    const query = new URLSearchParams(
+      Object.entries(params).filter(([, value]) => value !== null && value !== undefined && value !== '')
+    ).toString();
+    const response = await fetch(`${API_BASE_URL}/workers/${query ? `?${query}` : ''}`, {
         credentials: 'include'
     });
     if (!response.ok) throw new Error('Ошибка при получении данных');
     return await response.json();
   }
 
+  static async search(q, limit = 50) {
+    const query = new URLSearchParams({ q, limit }).toString();
+    const response = await fetch(`${API_BASE_URL}/search/workers?${query}`, {
+        credentials: 'include'
+    });
+    if (!response.ok) throw new Error('Ошибка при поиске сотрудников');
+    return await response.json();
+  }
+
   static async get(id) {
     const response = await fetch(`${API_BASE_URL}/workers/${id}`, {
         credentials: 'include'
@@ -54,8 +66,11 @@ class WorkerAPI {
 }
 
 class DirectorAPI {
-  static async getAll() {
-    const response = await fetch(`${API_BASE_URL}/directors/`, {
+  static async getAll(params = {}) {
+    const query = new URLSearchParams(
+      Object.entries(params).filter(([, value]) => value !== null && value !== undefined && value !== '')
+    ).toString();
+    const response = await fetch(`${API_BASE_URL}/directors/${query ? `?${query}` : ''}`, {
         credentials: 'include'
     });
     if (!response.ok) throw new Error('Ошибка при получении данных директоров');
@@ -160,14 +175,26 @@ class CompanyAPI {
 }
 
 class CarAPI {
-  static async getAll() {
-    const response = await fetch(`${API_BASE_URL}/cars/`, {
+  static async getAll(params = {}) {
+    const query = new URLSearchParams(
+      Object.entries(params).filter(([, value]) => value !== null && value !== undefined && value !== '')
+    ).toString();
+    const response = await fetch(`${API_BASE_URL}/cars/${query ? `?${query}` : ''}`, {
         credentials: 'include'
     });
     if (!response.ok) throw new Error('Ошибка при получении данных автомобиля');
     return await response.json();
   }
 
+  static async search(q, limit = 50) {
+    const query = new URLSearchParams({ q, limit }).toString();
+    const response = await fetch(`${API_BASE_URL}/search/cars?${query}`, {
+        credentials: 'include'
+    });
+    if (!response.ok) throw new Error('Ошибка при поиске автомобилей');
+    return await response.json();
+  }
+
   static async get(number_vin) {
     const response = await fetch(`${API_BASE_URL}/cars/${number_vin}`, {
         credentials: 'include'
@@ -372,8 +399,11 @@ class ExpanseAPI {
 }
 
 class AccountantAPI {
-  static async getAll() {
-    const response = await fetch(`${API_BASE_URL}/accountants/`, {
+  static async getAll(params = {}) {
+    const query = new URLSearchParams(
+      Object.entries(params).filter(([, value]) => value !== null && value !== undefined && value !== '')
+    ).toString();
+    const response = await fetch(`${API_BASE_URL}/accountants/${query ? `?${query}` : ''}`, {
         credentials: 'include'
     });
     if (!response.ok) throw new Error('Ошибка при получении данных бухгалтера');
@@ -425,8 +455,11 @@ class AccountantAPI {
 }
 
 class DriverAPI {
-  static async getAll() {
-    const response = await fetch(`${API_BASE_URL}/drivers/`,{
+  static async getAll(params = {}) {
+    const query = new URLSearchParams(
+      Object.entries(params).filter(([, value]) => value !== null && value !== undefined && value !== '')
+    ).toString();
+    const response = await fetch(`${API_BASE_URL}/drivers/${query ? `?${query}` : ''}`, {
         credentials: 'include'
     });
     if (!response.ok) throw new Error('Ошибка при получении данных водителя');
@@ -478,8 +511,11 @@ class DriverAPI {
 }
 
 class SellerAPI {
-  static async getAll() {
-    const response = await fetch(`${API_BASE_URL}/sellers/`, {
+  static async getAll(params = {}) {
+    const query = new URLSearchParams(
+      Object.entries(params).filter(([, value]) => value !== null && value !== undefined && value !== '')
+    ).toString();
+    const response = await fetch(`${API_BASE_URL}/sellers/${query ? `?${query}` : ''}`, {
         credentials: 'include'
     });
     if (!response.ok) throw new Error('Ошибка при получении данных продавца');
@@ -531,8 +567,11 @@ class SellerAPI {
 }
 
 class LifeguardAPI {
-  static async getAll() {
-    const response = await fetch(`${API_BASE_URL}/lifeguards/`, {
+  static async getAll(params = {}) {
+    const query = new URLSearchParams(
+      Object.entries(params).filter(([, value]) => value !== null && value !== undefined && value !== '')
+    ).toString();
+    const response = await fetch(`${API_BASE_URL}/lifeguards/${query ? `?${query}` : ''}`, {
         credentials: 'include'
     });
     if (!response.ok) throw new Error('Ошибка при получении данных охранника');
@@ -714,5 +753,5 @@ class AuthAPI {
     }
 }
 
-export { WorkerAPI, DirectorAPI, CompanyAPI, CarAPI, AdmissionAPI, ClientAPI,
+export { API_BASE_URL, WorkerAPI, DirectorAPI, CompanyAPI, CarAPI, AdmissionAPI, ClientAPI,
 ExpanseAPI, AccountantAPI, DriverAPI, SellerAPI, LifeguardAPI, AuthAPI };
\ No newline at end of file
@@ -1,6 +1,9 @@
 import { CarAPI } from './api.js';
 import { exportToExcel } from './export.js';
 
+// /search/* отдаёт не больше 100 лучших совпадений; страницы по ним листаются на клиенте
+const SEARCH_LIMIT = 100;
+
 function initUserTheme() {
   const savedTheme = localStorage.getItem('userTheme') || 'admin';
   document.body.className = savedTheme + '-theme';
@@ -57,6 +60,8 @@ class CarsManager {
         this.totalСars = 0;
         this.currentSearchTerm = '';
         this.allCars = [];
+        this.pageCursors = [null];
+        this.searchResults = [];
 
         this.init();
         this.setupUI();
@@ -154,32 +159,45 @@ class CarsManager {
         const prevBtn = document.getElementById('prevPage');
         const nextBtn = document.getElementById('nextPage');
 
-        pageInfo.textContent = `Страница ${this.currentPage} из ${totalPages}`;
+        const capped = this.currentSearchTerm && this.totalCars >= SEARCH_LIMIT;
+        pageInfo.textContent = `Страница ${this.currentPage} из ${totalPages}`
+            + (capped ? ` (первые ${SEARCH_LIMIT} совпадений, уточните запрос)` : '');
         prevBtn.disabled = this.currentPage <= 1;
         nextBtn.disabled = this.currentPage >= totalPages;
     }
 
     async loadAllCars() {
         try {
-            const data = await CarAPI.getAll();
-            this.allCars = data.cars;
-            this.totalCars = this.allCars.length;
-
-            let filteredCars = this.allCars;
             if (this.currentSearchTerm) {
-                const searchTerm = this.currentSearchTerm.toLowerCase();
-                filteredCars = this.allCars.filter(car => {
-                    const fullName = `${car.mark}`.toLowerCase();
-                    return fullName.includes(searchTerm);
-                });
-                this.totalCars = filteredCars.length;
+                if (this.currentPage === 1) {
+                    const data = await CarAPI.search(this.currentSearchTerm, SEARCH_LIMIT);
+                    this.searchResults = data.cars;
+                }
+                const start = (this.currentPage - 1) * this.pageSize;
+                this.allCars = this.searchResults.slice(start, start + this.pageSize);
+                this.totalCars = this.searchResults.length;
+                this.renderCars(this.allCars);
+                this.updatePaginationControls();
+                return;
+            }
+
+            if (this.currentPage === 1) {
+                this.pageCursors = [null];
             }
 
-            const startIndex = (this.currentPage - 1) * this.pageSize;
-            const endIndex = startIndex + this.pageSize;
-            const paginatedCars = filteredCars.slice(startIndex, endIndex);
+            const data = await CarAPI.getAll({
+                after: this.pageCursors[this.currentPage - 1],
+                limit: this.pageSize,
+                total: this.currentPage === 1
+            });
+
+            this.allCars = data.cars;
+            if (data.total !== null && data.total !== undefined) {
+                this.totalCars = data.total;
+            }
+            this.pageCursors[this.currentPage] = data.next_after;
 
-            this.renderCars(paginatedCars);
+            this.renderCars(this.allCars);
             this.updatePaginationControls();
         } catch (error) {
             console.error('Ошибка:', error);
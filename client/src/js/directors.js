@@ -115,7 +115,10 @@ class DirectorsManager {
 
     async loadAllDirectors() {
         try {
-            const data = await DirectorAPI.getAll();
+            const data = await DirectorAPI.getAll({
+                expand: 'company',
+                fields: 'inn,surname,firstname,lastname,profit,inn_company,company_name'
+            });
             this.renderDirectors(data.directors);
         } catch (error) {
             console.error('Ошибка:', error);
@@ -125,7 +128,7 @@ class DirectorsManager {
 
     renderDirectors(directors) {
         if (!directors || !Array.isArray(directors)) {
-            this.tableBody.innerHTML = '<tr><td colspan="4">Нет данных о директорах</td></tr>';
+            this.tableBody.innerHTML = '<tr><td colspan="5">Нет данных о директорах</td></tr>';
             return;
         }
 
@@ -139,6 +142,7 @@ class DirectorsManager {
                     <th>ФИО</th>
                     <th>Прибыль</th>
                     <th>ИНН компании</th>
+                    <th>Компания</th>
                     ${isAdmin ? '<th class="change-th">Изменение</th>' : ''}
                 </tr>
             </thead>
@@ -152,6 +156,7 @@ class DirectorsManager {
                 <td>${director.surname} ${director.firstname} ${director.lastname || ''}</td>
                 <td>${director.profit}</td>
                 <td>${director.inn_company}</td>
+                <td>${director.company_name || ''}</td>
                 ${isAdmin ? `
                 <td class="actions-cell">
                     <button class="action-btn edit-btn" data-id="${director.inn}">
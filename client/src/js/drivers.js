@@ -115,7 +115,10 @@ class DriversManager {
 
     async loadAllDrivers() {
         try {
-            const data = await DriverAPI.getAll();
+            const data = await DriverAPI.getAll({
+                expand: 'worker',
+                fields: 'worker_id,car_number,snacks,number_vin,worker_surname,worker_firstname,worker_lastname'
+            });
             this.renderDrivers(data.drivers);
         } catch (error) {
             console.error('Ошибка:', error);
@@ -125,7 +128,7 @@ class DriversManager {
 
     renderDrivers(drivers) {
         if (!drivers || !Array.isArray(drivers)) {
-            this.tableBody.innerHTML = '<tr><td colspan="4">Нет данных о водителях</td></tr>';
+            this.tableBody.innerHTML = '<tr><td colspan="5">Нет данных о водителях</td></tr>';
             return;
         }
 
@@ -136,6 +139,7 @@ class DriversManager {
             <thead>
                 <tr>
                     <th>ID</th>
+                    <th>Сотрудник</th>
                     <th>Номер машины</th>
                     <th>Любимые сухарики</th>
                     <th>VIN-номер</th>
@@ -149,6 +153,7 @@ class DriversManager {
         this.tableBody.innerHTML = drivers.map(driver => `
             <tr data-id="${driver.worker_id}">
                 <td>${driver.worker_id}</td>
+                <td>${driver.worker_surname} ${driver.worker_firstname} ${driver.worker_lastname}</td>
                 <td>${driver.car_number}</td>
                 <td>${driver.snacks}</td>
                 <td>${driver.number_vin}</td>
@@ -1,63 +1,32 @@
-import { WorkerAPI, DirectorAPI, CompanyAPI, CarAPI,
-AdmissionAPI, ClientAPI, ExpanseAPI, AccountantAPI,
-DriverAPI, SellerAPI, LifeguardAPI, AuthAPI } from './api.js';
+import { API_BASE_URL } from './api.js';
 
-export async function exportToExcel(entity) {
+const EXPORT_ENTITIES = [
+    'cars', 'workers', 'directors', 'drivers', 'companies', 'admissions',
+    'accountants', 'sellers', 'lifeguards', 'clients', 'expanses'
+];
+
+export async function exportToExcel(entity, format = 'xlsx') {
     try {
-        let response;
-        switch(entity) {
-            case 'cars':
-                response = await CarAPI.getAll();
-                break;
-            case 'workers':
-                response = await WorkerAPI.getAll();
-                break;
-            case 'directors':
-                response = await DirectorAPI.getAll();
-                break;
-            case 'drivers':
-                response = await DriverAPI.getAll();
-                break;
-            case 'companies':
-                response = await CompanyAPI.getAll();
-                break;
-            case 'admissions':
-                response = await AdmissionAPI.getAll();
-                break;
-            case 'accountants':
-                response = await AccountantAPI.getAll();
-                break;
-            case 'sellers':
-                response = await SellerAPI.getAll();
-                break;
-            case 'lifeguards':
-                response = await LifeguardAPI.getAll();
-                break;
-            case 'clients':
-                response = await ClientAPI.getAll();
-                break;
-            case 'expanses':
-                response = await ExpanseAPI.getAll();
-                break;
-            default:
-                throw new Error('Неизвестный тип сущности');
+        if (!EXPORT_ENTITIES.includes(entity)) {
+            throw new Error('Неизвестный тип сущности');
         }
-        const data = response.cars || response.companies || response.directors ||
-        response.workers || response.drivers || response.accountants || response.lifeguards ||
-        response.sellers || response.admissions || response.clients || response.expanses ||
-        response.rows || response.data || response;
 
-        if (!Array.isArray(data)) {
-            throw new Error('Данные не в формате массива');
-        }
+        const response = await fetch(`${API_BASE_URL}/export/${entity}.${format}`, {
+            credentials: 'include'
+        });
+        if (!response.ok) throw new Error('Ошибка при выгрузке данных');
 
-        const wb = XLSX.utils.book_new();
-        const ws = XLSX.utils.json_to_sheet(data);
-        XLSX.utils.book_append_sheet(wb, ws, "Data");
-        XLSX.writeFile(wb, `${entity}.xlsx`);
+        const url = URL.createObjectURL(await response.blob());
+        const link = document.createElement('a');
+        link.href = url;
+        link.download = `${entity}.${format}`;
+        document.body.appendChild(link);
+        link.click();
+        link.remove();
+        URL.revokeObjectURL(url);
 
     } catch (error) {
         console.error('Export error:', error);
         alert('Не удалось экспортировать данные: ' + error.message);
     }
-}
\ No newline at end of file
+}
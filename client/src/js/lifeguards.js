@@ -115,7 +115,10 @@ class LifeguardsManager {
 
     async loadAllLifeguards() {
         try {
-            const data = await LifeguardAPI.getAll();
+            const data = await LifeguardAPI.getAll({
+                expand: 'worker',
+                fields: 'worker_id,uniform,kit,security_zone,worker_surname,worker_firstname,worker_lastname'
+            });
             this.renderLifeguards(data.lifeguards);
         } catch (error) {
             console.error('Ошибка:', error);
@@ -125,7 +128,7 @@ class LifeguardsManager {
 
     renderLifeguards(lifeguards) {
         if (!lifeguards || !Array.isArray(lifeguards)) {
-            this.tableBody.innerHTML = '<tr><td colspan="4">Нет данных о директорах</td></tr>';
+            this.tableBody.innerHTML = '<tr><td colspan="5">Нет данных о директорах</td></tr>';
             return;
         }
 
@@ -136,6 +139,7 @@ class LifeguardsManager {
             <thead>
                 <tr>
                     <th>ID</th>
+                    <th>Сотрудник</th>
                     <th>Униформа</th>
                     <th>Арсенал</th>
                     <th>Охраняемая зона</th>
@@ -149,6 +153,7 @@ class LifeguardsManager {
         this.tableBody.innerHTML = lifeguards.map(lifeguard => `
             <tr data-id="${lifeguard.worker_id}">
                 <td>${lifeguard.worker_id}</td>
+                <td>${lifeguard.worker_surname} ${lifeguard.worker_firstname} ${lifeguard.worker_lastname}</td>
                 <td>${lifeguard.uniform}</td>
                 <td>${lifeguard.kit}</td>
                 <td>${lifeguard.security_zone}</td>
@@ -116,7 +116,10 @@ class SellersManager {
 
     async loadAllSellers() {
         try {
-            const data = await SellerAPI.getAll();
+            const data = await SellerAPI.getAll({
+                expand: 'worker',
+                fields: 'worker_id,seller_type,app_number,worker_surname,worker_firstname,worker_lastname'
+            });
             this.renderSellers(data.sellers);
         } catch (error) {
             console.error('Ошибка:', error);
@@ -126,7 +129,7 @@ class SellersManager {
 
     renderSellers(sellers) {
         if (!sellers || !Array.isArray(sellers)) {
-            this.tableBody.innerHTML = '<tr><td colspan="3">Нет данных о продавцах</td></tr>';
+            this.tableBody.innerHTML = '<tr><td colspan="4">Нет данных о продавцах</td></tr>';
             return;
         }
 
@@ -137,6 +140,7 @@ class SellersManager {
             <thead>
                 <tr>
                     <th>ID</th>
+                    <th>Сотрудник</th>
                     <th>Тип продавца</th>
                     <th>Номер заявки клиента</th>
                     ${isAdmin ? '<th class="change-th">Изменение</th>' : ''}
@@ -149,6 +153,7 @@ class SellersManager {
         this.tableBody.innerHTML = sellers.map(seller => `
             <tr data-id="${seller.worker_id}">
                 <td>${seller.worker_id}</td>
+                <td>${seller.worker_surname} ${seller.worker_firstname} ${seller.worker_lastname}</td>
                 <td>${seller.seller_type}</td>
                 <td>${seller.app_number}</td>
                 ${isAdmin ? `
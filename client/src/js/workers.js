@@ -1,6 +1,9 @@
 import { WorkerAPI } from './api.js';
 import { exportToExcel } from './export.js';
 
+// /search/* отдаёт не больше 100 лучших совпадений; страницы по ним листаются на клиенте
+const SEARCH_LIMIT = 100;
+
 function initUserTheme() {
   const savedTheme = localStorage.getItem('userTheme') || 'admin';
   document.body.className = savedTheme + '-theme';
@@ -58,6 +61,8 @@ class WorkersManager {
         this.totalWorkers = 0;
         this.currentSearchTerm = '';
         this.allWorkers = [];
+        this.pageCursors = [null];
+        this.searchResults = [];
 
         this.init();
         this.setupUI();
@@ -154,33 +159,45 @@ class WorkersManager {
         const prevBtn = document.getElementById('prevPage');
         const nextBtn = document.getElementById('nextPage');
 
-        pageInfo.textContent = `Страница ${this.currentPage} из ${totalPages}`;
+        const capped = this.currentSearchTerm && this.totalWorkers >= SEARCH_LIMIT;
+        pageInfo.textContent = `Страница ${this.currentPage} из ${totalPages}`
+            + (capped ? ` (первые ${SEARCH_LIMIT} совпадений, уточните запрос)` : '');
         prevBtn.disabled = this.currentPage <= 1;
         nextBtn.disabled = this.currentPage >= totalPages;
     }
 
     async loadAllWorkers() {
         try {
-            const data = await WorkerAPI.getAll();
-
-            this.allWorkers = data.workers;
-            this.totalWorkers = this.allWorkers.length;
-
-            let filteredWorkers = this.allWorkers;
             if (this.currentSearchTerm) {
-                const searchTerm = this.currentSearchTerm.toLowerCase();
-                filteredWorkers = this.allWorkers.filter(worker => {
-                    const fullName = `${worker.surname} ${worker.firstname} ${worker.lastname || ''}`.toLowerCase();
-                    return fullName.includes(searchTerm);
-                });
-                this.totalWorkers = filteredWorkers.length;
+                if (this.currentPage === 1) {
+                    const data = await WorkerAPI.search(this.currentSearchTerm, SEARCH_LIMIT);
+                    this.searchResults = data.workers;
+                }
+                const start = (this.currentPage - 1) * this.pageSize;
+                this.allWorkers = this.searchResults.slice(start, start + this.pageSize);
+                this.totalWorkers = this.searchResults.length;
+                this.renderWorkers(this.allWorkers);
+                this.updatePaginationControls();
+                return;
             }
 
-            const startIndex = (this.currentPage - 1) * this.pageSize;
-            const endIndex = startIndex + this.pageSize;
-            const paginatedWorkers = filteredWorkers.slice(startIndex, endIndex);
+            if (this.currentPage === 1) {
+                this.pageCursors = [null];
+            }
+
+            const data = await WorkerAPI.getAll({
+                after: this.pageCursors[this.currentPage - 1],
+                limit: this.pageSize,
+                total: this.currentPage === 1
+            });
+
+            this.allWorkers = data.workers;
+            if (data.total !== null && data.total !== undefined) {
+                this.totalWorkers = data.total;
+            }
+            this.pageCursors[this.currentPage] = data.next_after;
 
-            this.renderWorkers(paginatedWorkers);
+            this.renderWorkers(this.allWorkers);
             this.updatePaginationControls();
         } catch (error) {
             console.error('Ошибка:', error);
@@ -0,0 +1,333 @@
+"""Нагрузочный тест API на локальном PostgreSQL.
+
+Заполняет все таблицы сущностей данными нужного масштаба (--seed, от 10 тыс. до
+10 млн строк в крупных таблицах), затем гоняет смесь запросов к роутерам из
+server/src/routes и сохраняет пропускную способность и перцентили задержек по
+каждому эндпоинту в JSON - для сравнения между коммитами.
+
+    python -m server.benchmarks.load_test --seed 100000 --seed-only
+    python -m server.benchmarks.load_test --duration 60 --concurrency 32
+    python -m server.benchmarks.load_test --base-url http://127.0.0.1:8000 --compare results/abc123.json
+
+Без --base-url приложение поднимается в этом же процессе (ASGI без сети).
+--seed ОЧИЩАЕТ таблицы сущностей (TRUNCATE ... RESTART IDENTITY CASCADE).
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+import httpx
+from server.benchmarks.common import summarize
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Размер справочников относительно крупных таблиц
+REFERENCE_RATIO = 100
+
+TRUNCATE_ENTITIES = """
+    TRUNCATE accountant, driver, lifeguards, seller, car, workers, admission_journal,
+        client, director, company, expanse_journal
+    RESTART IDENTITY CASCADE;
+"""
+
+# $1 (если есть) - число строк; данные детерминированы (setseed), ключи 1..N по порядку
+SEED_STATEMENTS = (
+    ("company", "reference", """
+        INSERT INTO company (inn, name_company, address)
+        SELECT 100000000000 + g, 'Компания ' || g, 'ул. Заводская, ' || g
+        FROM generate_series(1, $1) g;
+    """),
+    ("director", "reference", """
+        INSERT INTO director (inn, profit, surname, firstname, lastname, inn_company)
+        SELECT 200000000000 + g, round((random() * 1000000)::numeric, 2),
+            'Директоров' || g, 'Иван', 'Иванович', 100000000000 + g
+        FROM generate_series(1, $1) g;
+    """),
+    ("expanse_journal", "reference", """
+        INSERT INTO expanse_journal (expanse_type, expanse_sum, expanse_name)
+        SELECT (ARRAY['Аренда', 'Зарплата', 'Закупка', 'Реклама'])[1 + g % 4],
+            round((random() * 100000)::numeric, 2), 'Расход ' || g
+        FROM generate_series(1, $1) g;
+    """),
+    ("client", "main", """
+        INSERT INTO client (budget, current_car, prefer_car)
+        SELECT round((random() * 5000000)::numeric, 2), 'Отсутствует',
+            (ARRAY['Lada', 'Toyota', 'BMW', 'Kia', 'Skoda'])[1 + g % 5]
+        FROM generate_series(1, $1) g;
+    """),
+    ("admission_journal", "main", """
+        INSERT INTO admission_journal (admission_date, complectation, color, mark, model, year_create)
+        SELECT DATE '2015-01-01' + g % 3650, 'Комфорт',
+            (ARRAY['Белый', 'Чёрный', 'Серый', 'Красный'])[1 + g % 4],
+            (ARRAY['Lada', 'Toyota', 'BMW', 'Kia', 'Skoda'])[1 + g % 5],
+            'Model ' || g % 200, 1990 + g % 35
+        FROM generate_series(1, $1) g;
+    """),
+    ("workers", "main", """
+        INSERT INTO workers (
+            salary, post, experience, surname, firstname,
+            lastname, phone_number, address, id_expanse, inn_director
+        )
+        SELECT 20000 + (random() * 100000)::int,
+            (ARRAY['Бухгалтер', 'Водитель', 'Охранник', 'Продавец', 'Безработный'])[1 + g % 5],
+            g % 40, 'Сотрудников' || g, 'Пётр', 'Петрович', 79000000000 + g, 'ул. Ленина, ' || g,
+            1 + g % greatest($1 / 100, 10), 200000000000 + 1 + g % greatest($1 / 100, 10)
+        FROM generate_series(1, $1) g;
+    """),
+    ("car", "main", """
+        INSERT INTO car (number_vin, complectation, color, mark, model, year_create, app_number)
+        SELECT 'X' || lpad(g::text, 16, '0'), 'Комфорт',
+            (ARRAY['Белый', 'Чёрный', 'Серый', 'Красный'])[1 + g % 4],
+            (ARRAY['Lada', 'Toyota', 'BMW', 'Kia', 'Skoda'])[1 + g % 5],
+            'Model ' || g % 200, 1990 + g % 35, 1 + g % $1
+        FROM generate_series(1, $1) g;
+    """),
+    # Роли получает половина сотрудников с нужной должностью - остальные свободны для POST
+    ("accountant", "main", """
+        INSERT INTO accountant (worker_id, qual, kit, id_number)
+        SELECT worker_id, worker_id % 5, 'Отсутствует', 1 + worker_id % $1
+        FROM workers WHERE post = 'Бухгалтер' AND worker_id % 2 = 0;
+    """),
+    ("driver", "main", """
+        INSERT INTO driver (worker_id, car_number, snacks, number_vin)
+        SELECT worker_id, 'А' || worker_id || 'ВС', 'Отсутствует', 'X' || lpad((1 + worker_id % $1)::text, 16, '0')
+        FROM workers WHERE post = 'Водитель' AND worker_id % 2 = 0;
+    """),
+    ("lifeguards", "main", """
+        INSERT INTO lifeguards (worker_id, uniform, kit, security_zone)
+        SELECT worker_id, 'Форма', 'Отсутствует', 'Вход'
+        FROM workers WHERE post = 'Охранник' AND worker_id % 2 = 0;
+    """),
+    ("seller", "main", """
+        INSERT INTO seller (worker_id, seller_type, app_number)
+        SELECT worker_id, 'Консультант', 1 + worker_id % $1
+        FROM workers WHERE post = 'Продавец' AND worker_id % 2 = 0;
+    """),
+)
+
+# Ключи для запросов: до SAMPLE_KEYS случайных существующих ключей каждой таблицы
+SAMPLE_KEYS = 2000
+
+KEY_COLUMNS = {
+    "accountant": "worker_id",
+    "admission_journal": "id_number",
+    "car": "number_vin",
+    "client": "app_number",
+    "company": "inn",
+    "director": "inn",
+    "expanse_journal": "id_expanse",
+    "workers": "worker_id",
+}
+
+MARKS = ("Lada", "Toyota", "BMW", "Kia", "Skoda")
+
+
+async def seed(conn, rows: int):
+    """Очистка и заполнение таблиц (rows строк в крупных таблицах)"""
+    references = max(rows // REFERENCE_RATIO, 10)
+    await conn.execute("SELECT setseed(0.42)")
+    await conn.execute(TRUNCATE_ENTITIES)
+    for table, kind, statement in SEED_STATEMENTS:
+        count = references if kind == "reference" else rows
+        started = time.perf_counter()
+        status = await conn.execute(statement, *((count,) if "$1" in statement else ()))
+        print(f"seeded {table:<18} {status.split()[-1]:>9} rows  {time.perf_counter() - started:7.1f} s")
+    await conn.execute("ANALYZE")
+
+
+async def sample_keys(conn) -> Dict[str, List]:
+    keys = {}
+    for table, column in KEY_COLUMNS.items():
+        estimate = await conn.fetchval(
+            "SELECT greatest(reltuples, 1) FROM pg_class WHERE relname = $1", table
+        )
+        percent = min(100.0, 100.0 * SAMPLE_KEYS * 4 / estimate)
+        records = await conn.fetch(
+            f"SELECT {column} FROM {table} TABLESAMPLE SYSTEM ({percent}) LIMIT {SAMPLE_KEYS}"
+        )
+        keys[table] = [record[0] for record in records]
+        if not keys[table]:
+            raise SystemExit(f"Table {table} is empty, run with --seed first")
+    return keys
+
+
+Send = Callable[[httpx.AsyncClient, Dict[str, List], random.Random], Awaitable[httpx.Response]]
+
+
+@dataclass
+class Operation:
+    name: str
+    weight: int
+    send: Send
+
+
+def pick(keys: Dict[str, List], table: str, rng: random.Random):
+    return rng.choice(keys[table])
+
+
+# Смесь запросов: в основном чтение одной записи и страниц, немного записи
+MIX = (
+    Operation("GET /workers/{worker_id}", 15, lambda c, k, r: c.get(f"/workers/{pick(k, 'workers', r)}")),
+    Operation("GET /workers/?after&limit=50", 10, lambda c, k, r: c.get(
+        "/workers/", params={"after": pick(k, "workers", r), "limit": 50})),
+    Operation("GET /workers/?post&limit=50", 4, lambda c, k, r: c.get(
+        "/workers/", params={"post": "Продавец", "after": pick(k, "workers", r), "limit": 50})),
+    Operation("GET /cars/{number_vin}", 10, lambda c, k, r: c.get(f"/cars/{pick(k, 'car', r)}")),
+    Operation("GET /cars/?search&limit=50", 6, lambda c, k, r: c.get(
+        "/cars/", params={"search": r.choice(MARKS), "after": pick(k, "car", r), "limit": 50})),
+    Operation("GET /clients/{app_number}", 8, lambda c, k, r: c.get(f"/clients/{pick(k, 'client', r)}")),
+    Operation("GET /companies/{inn}", 5, lambda c, k, r: c.get(f"/companies/{pick(k, 'company', r)}")),
+    Operation("GET /companies/", 2, lambda c, k, r: c.get("/companies/")),
+    Operation("GET /directors/{inn}", 5, lambda c, k, r: c.get(f"/directors/{pick(k, 'director', r)}")),
+    Operation("GET /admissions/{id_number}", 4, lambda c, k, r: c.get(
+        f"/admissions/{pick(k, 'admission_journal', r)}")),
+    Operation("GET /expanses/{id_expanse}", 3, lambda c, k, r: c.get(
+        f"/expanses/{pick(k, 'expanse_journal', r)}")),
+    Operation("GET /accountants/{worker_id}", 3, lambda c, k, r: c.get(
+        f"/accountants/{pick(k, 'accountant', r)}")),
+    Operation("POST /clients/", 4, lambda c, k, r: c.post("/clients/", json={"budget": r.randrange(100000)})),
+    Operation("PUT /clients/{app_number}", 3, lambda c, k, r: c.put(
+        f"/clients/{pick(k, 'client', r)}", json={"budget": r.randrange(100000)})),
+    Operation("PATCH /workers/batch", 2, lambda c, k, r: c.patch("/workers/batch", json={"items": [
+        {"key": pick(k, "workers", r), "values": {"salary": 20000 + r.randrange(100000)}} for _ in range(10)
+    ]})),
+    Operation("POST /accountants/", 1, lambda c, k, r: c.post("/accountants/", json={"qual": 1})),
+)
+
+
+async def drive(client: httpx.AsyncClient, keys: Dict[str, List], args) -> List[Dict]:
+    operations = [operation for operation in MIX if operation.weight]
+    weights = [operation.weight for operation in operations]
+    latencies = {operation.name: [] for operation in operations}
+    errors = {operation.name: 0 for operation in operations}
+
+    async def worker(number: int, deadline: float):
+        rng = random.Random(args.random_seed + number)
+        while time.perf_counter() < deadline:
+            operation = rng.choices(operations, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await operation.send(client, keys, rng)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[operation.name].append(time.perf_counter() - started)
+            errors[operation.name] += failed
+
+    if args.warmup:
+        await asyncio.gather(*(worker(n, time.perf_counter() + args.warmup) for n in range(args.concurrency)))
+        for name in latencies:
+            latencies[name].clear()
+            errors[name] = 0
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(worker(n, deadline) for n in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    results = [summarize(name, latencies[name], errors[name], elapsed) for name in latencies]
+    everything = [latency for values in latencies.values() for latency in values]
+    results.append(summarize("TOTAL", everything, sum(errors.values()), elapsed))
+    return results
+
+
+async def run(args) -> Dict:
+    from server.src.database.db import db
+    from server.src.database.migrate import apply_migrations
+
+    conn = await db.connect_direct()
+    try:
+        await apply_migrations(conn)
+        if args.seed:
+            await seed(conn, args.seed)
+        if args.seed_only:
+            return {}
+        keys = await sample_keys(conn)
+        rows = {table: await conn.fetchval(f"SELECT count(*) FROM {table}") for table in KEY_COLUMNS}
+        server_version = await conn.fetchval("SHOW server_version")
+    finally:
+        await conn.close()
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+            results = await drive(client, keys, args)
+    else:
+        from server.src.main import app
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=60) as client:
+                results = await drive(client, keys, args)
+
+    return {
+        "commit": git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "target": args.base_url or "in-process",
+        "postgres": server_version,
+        "rows": rows,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "random_seed": args.random_seed,
+        "results": results,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(report: Dict, baseline: Optional[Dict]):
+    before = {row["name"]: row for row in baseline["results"]} if baseline else {}
+    for row in report["results"]:
+        line = (
+            f"{row['name']:<34} {row['requests']:>7} req {row['errors']:>5} err "
+            f"{row['rps']:>8.1f} rps  p50 {row['p50_ms']:>7.2f}  p90 {row['p90_ms']:>7.2f}  "
+            f"p99 {row['p99_ms']:>7.2f} ms"
+        )
+        old = before.get(row["name"])
+        if old and old["p50_ms"] and old["rps"]:
+            line += (
+                f"  | rps {100 * (row['rps'] / old['rps'] - 1):+6.1f}%"
+                f"  p50 {100 * (row['p50_ms'] / old['p50_ms'] - 1):+6.1f}%"
+            )
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="адрес запущенного сервера; без него - приложение в процессе")
+    parser.add_argument("--seed", type=int, metavar="ROWS", help="очистить и заполнить таблицы (строк в крупных)")
+    parser.add_argument("--seed-only", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--random-seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="файл результатов (по умолчанию results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="предыдущий файл результатов для сравнения")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if not report:
+        return
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_results(report, baseline)
+
+    output = args.output or RESULTS_DIR / f"{report['commit'] or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"\nsaved {output}")
+
+
+if __name__ == "__main__":
+    main()
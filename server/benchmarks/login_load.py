@@ -0,0 +1,72 @@
+"""Нагрузочный тест /auth/login.
+
+Параллельно с потоком логинов опрашивает другой эндпоинт и показывает, как вход
+пользователей влияет на его задержки. Требует запущенного сервера и httpx:
+
+    python -m server.benchmarks.login_load --username admin --password secret --duration 30
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+import httpx
+from server.benchmarks.common import summarize
+
+
+async def worker(client: httpx.AsyncClient, send, deadline: float, latencies: List[float], errors: List[int]):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await send(client)
+            if response.status_code >= 400:
+                errors[0] += 1
+        except httpx.HTTPError:
+            errors[0] += 1
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(args) -> List[Dict]:
+    limits = httpx.Limits(max_connections=args.login_concurrency + args.probe_concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        async def login(c: httpx.AsyncClient):
+            return await c.post("/auth/login", data={"username": args.username, "password": args.password})
+
+        async def probe(c: httpx.AsyncClient):
+            return await c.get(args.probe_path)
+
+        results = []
+        phases = [("baseline", 0), ("with_logins", args.login_concurrency)]
+        for phase, login_workers in phases:
+            login_latencies, probe_latencies = [], []
+            login_errors, probe_errors = [0], [0]
+            deadline = time.perf_counter() + args.duration
+            await asyncio.gather(
+                *(worker(client, login, deadline, login_latencies, login_errors) for _ in range(login_workers)),
+                *(worker(client, probe, deadline, probe_latencies, probe_errors) for _ in range(args.probe_concurrency)),
+            )
+            results.append(summarize(f"{phase}: GET {args.probe_path}", probe_latencies, probe_errors[0], args.duration))
+            if login_workers:
+                results.append(summarize(f"{phase}: POST /auth/login", login_latencies, login_errors[0], args.duration))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--login-concurrency", type=int, default=16)
+    parser.add_argument("--probe-concurrency", type=int, default=8)
+    parser.add_argument("--probe-path", default="/")
+    parser.add_argument("--duration", type=float, default=15.0)
+    args = parser.parse_args()
+
+    for row in asyncio.run(run(args)):
+        print(
+            f"{row['name']:<40} {row['requests']:>7} req  {row['errors']:>5} err  "
+            f"{row['rps']:>8.1f} rps  p50 {row['p50_ms']:>8.2f} ms  p99 {row['p99_ms']:>8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
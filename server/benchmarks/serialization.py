@@ -0,0 +1,97 @@
+"""Сравнение сериализации списка сотрудников: pydantic-модели против RecordsJSONResponse.
+
+База данных не нужна: записи генерируются заранее, оба варианта отдаются из
+одинаковых эндпоинтов FastAPI и вызываются через ASGI без сети:
+
+    python -m server.benchmarks.serialization --rows 1000 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+import httpx
+from fastapi import FastAPI, Response
+from server.benchmarks.common import summarize
+from server.src.models.worker import WorkerHelp, WorkerLine
+from server.src.routes.serialization import encode_records, orjson, records_response
+
+
+def make_records(rows: int) -> List[Dict]:
+    return [
+        {
+            "worker_id": i,
+            "salary": 20000 + i,
+            "post": "Продавец",
+            "experience": i % 40,
+            "surname": f"Иванов{i}",
+            "firstname": "Иван",
+            "lastname": "Иванович",
+            "phone_number": 79000000000 + i,
+            "address": f"ул. Ленина, {i}",
+            "id_expanse": 1 + i % 100,
+            "inn_director": 100000000000 + i % 50,
+        }
+        for i in range(1, rows + 1)
+    ]
+
+
+def build_app(records: List[Dict]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/pydantic", response_model=WorkerLine)
+    async def pydantic_path():
+        return WorkerLine(workers=[WorkerHelp(**worker) for worker in records])
+
+    @app.get("/fast", response_model=WorkerLine)
+    async def fast_path(response: Response):
+        body = encode_records("workers", WorkerHelp, records, next_after=None, total=None)
+        return records_response(body, response)
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> Dict:
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        begin = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - begin)
+        if response.status_code != 200:
+            errors += 1
+    return summarize(path.strip("/"), latencies, errors, time.perf_counter() - started)
+
+
+async def run(args) -> List[Dict]:
+    records = make_records(args.rows)
+    transport = httpx.ASGITransport(app=build_app(records))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        slow = (await client.get("/pydantic")).json()
+        fast = (await client.get("/fast")).json()
+        if slow != fast:
+            raise SystemExit("Ответы /pydantic и /fast различаются")
+        await measure(client, "/pydantic", args.warmup)
+        await measure(client, "/fast", args.warmup)
+        return [
+            await measure(client, "/pydantic", args.requests),
+            await measure(client, "/fast", args.requests),
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps({"rows": args.rows, "orjson": orjson is not None, "results": results}, indent=2))
+    slow, fast = results
+    if fast["mean_ms"]:
+        print(f"speedup: {slow['mean_ms'] / fast['mean_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
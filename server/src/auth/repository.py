@@ -3,28 +3,69 @@ from datetime import date, datetime, timedelta
 from server.src.config import settings
 from server.src.database.db import db
 
+CLEANUP_UNVERIFIED_USERS = """
+    DELETE FROM users WHERE user_id IN (
+        SELECT user_id FROM users
+        WHERE email_verified = false AND email_expires < $1
+        LIMIT $2
+        FOR UPDATE SKIP LOCKED
+    )
+"""
+
+GET_USER_BY_USERNAME = "SELECT * FROM users WHERE username = $1"
+
+GET_USER_BY_EMAIL = "SELECT * FROM users WHERE email = $1"
+
+DELETE_USER_BY_EMAIL = "DELETE FROM users WHERE email = $1"
+
+CREATE_USER = """
+    INSERT INTO users (
+        username, email, hashed_password, 
+        fio, birthday, status,
+        email_verified, email_code, email_expires
+    )
+    VALUES ($1, $2, $3, $4, $5, 'pending', false, NULL, NULL)
+    RETURNING *
+"""
+
+CONFIRM_EMAIL = """
+    UPDATE users 
+    SET status = 'active', email_verified = true
+    WHERE user_id = $1
+"""
+
+UPDATE_EMAIL_CODE = """
+    UPDATE users 
+    SET email_code = $1, 
+        email_expires = $2
+    WHERE user_id = $3
+    RETURNING *
+"""
+
 class AuthRepository:
     @staticmethod
-    async def cleanup_unverified_users():
+    async def cleanup_unverified_users() -> int:
+        """Удаление неподтверждённых пользователей пачками по CLEANUP_BATCH_SIZE (возвращает их число)"""
         expire_time = datetime.utcnow() - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        await db.execute(
-            "DELETE FROM users WHERE email_verified = false AND email_expires < $1",
-            expire_time
-        )
+        deleted = 0
+        while True:
+            status = await db.execute(CLEANUP_UNVERIFIED_USERS, expire_time, settings.CLEANUP_BATCH_SIZE)
+            count = int(status.split()[-1])
+            deleted += count
+            if count < settings.CLEANUP_BATCH_SIZE:
+                return deleted
 
     @staticmethod
     async def get_user_by_username(username: str):
-        return await db.fetch_one(
-            "SELECT * FROM users WHERE username = $1",
-            username
-        )
+        return await db.fetch_one(GET_USER_BY_USERNAME, username)
 
     @staticmethod
     async def get_user_by_email(email: str):
-        return await db.fetch_one(
-            "SELECT * FROM users WHERE email = $1",
-            email
-        )
+        return await db.fetch_one(GET_USER_BY_EMAIL, email)
+
+    @staticmethod
+    async def delete_user_by_email(email: str):
+        await db.execute(DELETE_USER_BY_EMAIL, email)
 
     @staticmethod
     async def create_user(
@@ -35,41 +76,16 @@ class AuthRepository:
             birthday: date
     ):
         return await db.execute_returning(
-            """
-            INSERT INTO users (
-                username, email, hashed_password, 
-                fio, birthday, status,
-                email_verified, email_code, email_expires
-            )
-            VALUES ($1, $2, $3, $4, $5, 'pending', false, NULL, NULL)
-            RETURNING *
-            """,
+            CREATE_USER,
             username, email, hashed_password,
             fio, birthday
         )
 
     @staticmethod
     async def confirm_email(user_id: int):
-        return await db.execute_returning(
-            """
-            UPDATE users 
-            SET status = 'active', email_verified = true
-            WHERE user_id = $1
-            """,
-            user_id
-        )
+        return await db.execute_returning(CONFIRM_EMAIL, user_id)
 
     @staticmethod
     async def update_email_code(user_id: int, code: str):
-        await AuthRepository.cleanup_unverified_users()
         expire_at = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        return await db.execute_returning(
-            """
-            UPDATE users 
-            SET email_code = $1, 
-                email_expires = $2
-            WHERE user_id = $3
-            RETURNING *
-            """,
-            code, expire_at, user_id
-        )
\ No newline at end of file
+        return await db.execute_returning(UPDATE_EMAIL_CODE, code, expire_at, user_id)
@@ -1,17 +1,13 @@
 from datetime import datetime, timezone, time
-from email.header import Header
 from jose import jwt
 from asyncpg.pgproto.pgproto import timedelta
 from server.src.auth.repository import AuthRepository
 from server.src.auth.models import UserRegister, UserResponse
-from passlib.context import CryptContext
+from server.src.auth.hashing import password_hasher
 from server.src.config import settings
-import smtplib
-from email.mime.text import MIMEText
-import random
 from server.src.database.db import db
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+import random
+from server.src.mail.outbox import mail_queue
 
 class AuthService:
     @staticmethod
@@ -22,23 +18,23 @@ class AuthService:
             raise ValueError("This name had created")
 
         existing_email = await AuthRepository.get_user_by_email(user_data.email)
-        if existing_email:
-            if not existing_email['email_verified']:
-                await db.execute("DELETE FROM users WHERE email = $1", user_data.email)
-            else:
-                raise ValueError("Email already registered")
+        if existing_email and existing_email['email_verified']:
+            raise ValueError("Email already registered")
 
-        hashed_password = pwd_context.hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
 
-        user = await AuthRepository.create_user(
-            username=user_data.username,
-            email=user_data.email,
-            hashed_password=hashed_password,
-            fio=user_data.fio,
-            birthday=user_data.birthday
-        )
         code = str(random.randint(100000, 999999))
-        await AuthRepository.update_email_code(user["user_id"], code)
+        async with db.transaction():
+            if existing_email:
+                await AuthRepository.delete_user_by_email(user_data.email)
+            user = await AuthRepository.create_user(
+                username=user_data.username,
+                email=user_data.email,
+                hashed_password=hashed_password,
+                fio=user_data.fio,
+                birthday=user_data.birthday
+            )
+            await AuthRepository.update_email_code(user["user_id"], code)
         await AuthService.send_confirmation_email(user["email"], code)
 
         return UserResponse(
@@ -53,7 +49,7 @@ class AuthService:
     async def authenticate_user(username: str, password: str) -> dict:
         """Аунтефикация пользователя"""
         user = await AuthRepository.get_user_by_username(username)
-        if not user or not pwd_context.verify(password, user['hashed_password']):
+        if not user or not await password_hasher.verify(password, user['hashed_password']):
             raise ValueError('Incorrect data')
         return user
 
@@ -67,28 +63,13 @@ class AuthService:
 
     @staticmethod
     async def send_confirmation_email(email: str, code: str):
-        """Отправка email с надежным подключением"""
-        msg = MIMEText(
+        """Постановка письма с кодом подтверждения в очередь отправки"""
+        await mail_queue.enqueue(
+            email,
+            "Код подтверждения AutoCompany",
             f"Ваш код подтверждения: {code}\n"
-            f"Код действителен {settings.ACCESS_TOKEN_EXPIRE_MINUTES} минут.",
-            'plain', 'utf-8'
+            f"Код действителен {settings.ACCESS_TOKEN_EXPIRE_MINUTES} минут."
         )
-        msg['Subject'] = Header("Код подтверждения AutoCompany", 'utf-8')
-        msg['From'] = settings.EMAIL_FROM
-        msg['To'] = email
-
-        server = smtplib.SMTP_SSL(
-            host=settings.SMTP_HOST,
-            port=settings.SMTP_PORT,
-            timeout=10
-        )
-
-        server.noop()
-
-        server.login(settings.EMAIL_FROM, settings.SMTP_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-
         return True
 
     @staticmethod
@@ -108,7 +89,6 @@ class AuthService:
         email_expires_datetime = datetime.combine(now_utc.date(), email_expires_time, tzinfo=timezone.utc)
 
         if now_utc > email_expires_datetime:
-            await AuthRepository.cleanup_unverified_users()
             raise ValueError("Confirmation code expired")
 
         await AuthRepository.confirm_email(user["user_id"])
@@ -1,3 +1,272 @@
-from typing import Dict
+import asyncio
+import json
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional
+from server.src.config import settings
+from server.src.database.db import db
 
-sessions: Dict[str, dict] = {}
\ No newline at end of file
+
+class Session(dict):
+    """Данные сессии запроса; в хранилище попадают только изменённые сессии"""
+
+    def __init__(self, session_id: Optional[str] = None, data: Optional[dict] = None):
+        super().__init__(data or {})
+        self.session_id = session_id
+        self.previous_id: Optional[str] = None
+        self.modified = False
+        self.invalidated = False
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.modified = True
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.modified = True
+
+    def clear(self):
+        super().clear()
+        self.modified = True
+
+    def pop(self, *args):
+        self.modified = True
+        return super().pop(*args)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.modified = True
+
+    def setdefault(self, key, default=None):
+        self.modified = True
+        return super().setdefault(key, default)
+
+    @property
+    def is_new(self) -> bool:
+        return self.session_id is None
+
+    def rotate(self):
+        """Выдать сессии новый идентификатор (например, при входе)"""
+        if self.session_id is not None:
+            self.previous_id = self.session_id
+        self.session_id = None
+        self.modified = True
+
+    def invalidate(self):
+        """Удалить сессию из хранилища и куки"""
+        self.clear()
+        self.invalidated = True
+
+    def ensure_id(self) -> str:
+        if self.session_id is None:
+            self.session_id = str(uuid.uuid4())
+        return self.session_id
+
+
+class SessionBackend(ABC):
+    """Хранилище сессий с TTL; просроченные удаляет задача планировщика cleanup_sessions"""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    async def save(self, session_id: str, data: dict):
+        await self.set(session_id, data)
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def set(self, session_id: str, data: dict):
+        ...
+
+    @abstractmethod
+    async def delete(self, session_id: str):
+        ...
+
+    async def cleanup(self) -> int:
+        """Удаление просроченных сессий (возвращает их число)"""
+        return 0
+
+
+class MemorySessionBackend(SessionBackend):
+    """Сессии в памяти процесса с вытеснением по TTL и LRU"""
+
+    def __init__(self, ttl: int, max_entries: int):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, session_id: str) -> Optional[dict]:
+        entry = self.entries.get(session_id)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at < time.time():
+            del self.entries[session_id]
+            return None
+        self.entries.move_to_end(session_id)
+        return data
+
+    async def set(self, session_id: str, data: dict):
+        self.entries[session_id] = (time.time() + self.ttl, data)
+        self.entries.move_to_end(session_id)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def delete(self, session_id: str):
+        self.entries.pop(session_id, None)
+
+    async def cleanup(self) -> int:
+        now = time.time()
+        expired = [session_id for session_id, (expires_at, _) in self.entries.items() if expires_at < now]
+        for session_id in expired:
+            del self.entries[session_id]
+        return len(expired)
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """Сессии в файле SQLite, общем для всех процессов на одной машине"""
+
+    def __init__(self, ttl: int, path: str):
+        super().__init__(ttl)
+        self.path = path
+        self.conn: Optional[sqlite3.Connection] = None
+        self.lock = asyncio.Lock()
+
+    async def run(self, query: str, *args) -> sqlite3.Cursor:
+        async with self.lock:
+            return await asyncio.to_thread(self._run, query, args)
+
+    def _run(self, query: str, args: tuple) -> sqlite3.Cursor:
+        with self.conn:
+            return self.conn.execute(query, args)
+
+    async def open(self):
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        await self.run(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    async def close(self):
+        if self.conn:
+            self.conn.close()
+
+    async def get(self, session_id: str) -> Optional[dict]:
+        cursor = await self.run(
+            "SELECT data FROM sessions WHERE session_id = ? AND expires_at > ?",
+            session_id, time.time()
+        )
+        row = cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def set(self, session_id: str, data: dict):
+        await self.run(
+            "INSERT OR REPLACE INTO sessions (session_id, data, expires_at) VALUES (?, ?, ?)",
+            session_id, json.dumps(data), time.time() + self.ttl
+        )
+
+    async def delete(self, session_id: str):
+        await self.run("DELETE FROM sessions WHERE session_id = ?", session_id)
+
+    async def cleanup(self) -> int:
+        cursor = await self.run("DELETE FROM sessions WHERE expires_at <= ?", time.time())
+        return cursor.rowcount
+
+
+class PostgresSessionBackend(SessionBackend):
+    """Сессии в таблице sessions основной БД (создаётся миграцией 0003_service_tables)"""
+
+    async def get(self, session_id: str) -> Optional[dict]:
+        record = await db.fetch_one(
+            "SELECT data FROM sessions WHERE session_id = $1 AND expires_at > now()",
+            session_id
+        )
+        return json.loads(record["data"]) if record else None
+
+    async def set(self, session_id: str, data: dict):
+        await db.execute(
+            """
+            INSERT INTO sessions (session_id, data, expires_at)
+            VALUES ($1, $2::jsonb, now() + make_interval(secs => $3))
+            ON CONFLICT (session_id) DO UPDATE
+            SET data = EXCLUDED.data, expires_at = EXCLUDED.expires_at
+            """,
+            session_id, json.dumps(data), self.ttl
+        )
+
+    async def delete(self, session_id: str):
+        await db.execute("DELETE FROM sessions WHERE session_id = $1", session_id)
+
+    async def cleanup(self) -> int:
+        deleted = 0
+        while True:
+            status = await db.execute(
+                """
+                DELETE FROM sessions WHERE session_id IN (
+                    SELECT session_id FROM sessions WHERE expires_at <= now() LIMIT $1
+                )
+                """,
+                settings.CLEANUP_BATCH_SIZE
+            )
+            count = int(status.split()[-1])
+            deleted += count
+            if count < settings.CLEANUP_BATCH_SIZE:
+                return deleted
+
+
+class RedisSessionBackend(SessionBackend):
+    """Сессии в Redis или совместимом сервере (KeyDB, Valkey); TTL через EXPIRE, LRU через maxmemory-policy"""
+
+    def __init__(self, ttl: int, url: str):
+        super().__init__(ttl)
+        self.url = url
+        self.client = None
+
+    async def open(self):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("SESSION_BACKEND=redis requires the redis package")
+        self.client = aioredis.from_url(self.url)
+
+    async def close(self):
+        if self.client:
+            await self.client.aclose()
+
+    async def get(self, session_id: str) -> Optional[dict]:
+        data = await self.client.get(f"session:{session_id}")
+        return json.loads(data) if data else None
+
+    async def set(self, session_id: str, data: dict):
+        await self.client.set(f"session:{session_id}", json.dumps(data), ex=self.ttl)
+
+    async def delete(self, session_id: str):
+        await self.client.delete(f"session:{session_id}")
+
+
+def create_session_store() -> SessionBackend:
+    """Хранилище сессий по настройке SESSION_BACKEND"""
+    backends: Dict[str, callable] = {
+        "memory": lambda: MemorySessionBackend(settings.SESSION_TTL, settings.SESSION_MAX_ENTRIES),
+        "sqlite": lambda: SQLiteSessionBackend(settings.SESSION_TTL, settings.SESSION_SQLITE_PATH),
+        "postgres": lambda: PostgresSessionBackend(settings.SESSION_TTL),
+        "redis": lambda: RedisSessionBackend(settings.SESSION_TTL, settings.SESSION_REDIS_URL),
+    }
+    if settings.SESSION_BACKEND not in backends:
+        raise ValueError(f"Unknown SESSION_BACKEND: {settings.SESSION_BACKEND}")
+    return backends[settings.SESSION_BACKEND]()
+
+
+session_store = create_session_store()
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 import os
 from dotenv import load_dotenv
@@ -10,6 +11,14 @@ class Settings(BaseSettings):
     DB_USER: str = os.getenv("DB_USER")
     DB_NAME: str = os.getenv("DB_NAME")
     DB_PASS: str = os.getenv("DB_PASS")
+    DB_POOL_MIN_SIZE: int = os.getenv("DB_POOL_MIN_SIZE", 10)
+    DB_POOL_MAX_SIZE: int = os.getenv("DB_POOL_MAX_SIZE", 10)
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = os.getenv("DB_POOL_MAX_INACTIVE_LIFETIME", 300.0)
+    DB_STATEMENT_CACHE_SIZE: int = os.getenv("DB_STATEMENT_CACHE_SIZE", 256)
+    DB_COMMAND_TIMEOUT: Optional[float] = os.getenv("DB_COMMAND_TIMEOUT")
+    DB_MIGRATE_ON_STARTUP: bool = os.getenv("DB_MIGRATE_ON_STARTUP", True)
+    SLOW_QUERY_SECONDS: Optional[float] = os.getenv("SLOW_QUERY_SECONDS")
+    SERVER_TIMING_HEADER: bool = os.getenv("SERVER_TIMING_HEADER", True)
     ALGORITHM: str = os.getenv("ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
     SECRET_KEY: str = os.getenv("SECRET_KEY")
@@ -20,6 +29,35 @@ class Settings(BaseSettings):
     SMTP_PORT: int = os.getenv("SMTP_PORT")
     SMTP_HOST: str = os.getenv("SMTP_HOST")
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD")
+    KEY_POOL_TTL: int = os.getenv("KEY_POOL_TTL", 300)
+    SESSION_BACKEND: str = os.getenv("SESSION_BACKEND", "memory")
+    SESSION_TTL: int = os.getenv("SESSION_TTL", 3600 * 24 * 30)
+    SESSION_MAX_ENTRIES: int = os.getenv("SESSION_MAX_ENTRIES", 100000)
+    SESSION_SQLITE_PATH: str = os.getenv("SESSION_SQLITE_PATH", "sessions.sqlite3")
+    SESSION_REDIS_URL: str = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+    PASSWORD_HASH_WORKERS: int = os.getenv("PASSWORD_HASH_WORKERS", 4)
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    MAIL_TRANSPORT: str = os.getenv("MAIL_TRANSPORT", "smtp")
+    MAIL_BATCH_SIZE: int = os.getenv("MAIL_BATCH_SIZE", 20)
+    MAIL_MAX_ATTEMPTS: int = os.getenv("MAIL_MAX_ATTEMPTS", 5)
+    MAIL_RETRY_BASE: float = os.getenv("MAIL_RETRY_BASE", 30.0)
+    MAIL_POLL_INTERVAL: float = os.getenv("MAIL_POLL_INTERVAL", 5.0)
+    SMTP_IDLE_TIMEOUT: float = os.getenv("SMTP_IDLE_TIMEOUT", 60.0)
+    MAIL_STUB_FAILURES: int = os.getenv("MAIL_STUB_FAILURES", 0)
+    CACHE_MAX_ENTRIES: int = os.getenv("CACHE_MAX_ENTRIES", 1024)
+    CACHE_TTL: float = os.getenv("CACHE_TTL", 60.0)
+    CACHE_NOTIFY: bool = os.getenv("CACHE_NOTIFY", False)
+    CLEANUP_BATCH_SIZE: int = os.getenv("CLEANUP_BATCH_SIZE", 1000)
+    USER_CLEANUP_INTERVAL: float = os.getenv("USER_CLEANUP_INTERVAL", 300.0)
+    SESSION_CLEANUP_INTERVAL: float = os.getenv("SESSION_CLEANUP_INTERVAL", 600.0)
+    SEARCH_CANDIDATES: int = os.getenv("SEARCH_CANDIDATES", 1000)
+    REPORTS_MATERIALIZED: bool = os.getenv("REPORTS_MATERIALIZED", False)
+    REPORT_REFRESH_INTERVAL: float = os.getenv("REPORT_REFRESH_INTERVAL", 60.0)
+    REPORT_CACHE_MAX_ENTRIES: int = os.getenv("REPORT_CACHE_MAX_ENTRIES", 256)
+    REPORT_CACHE_TTL: float = os.getenv("REPORT_CACHE_TTL", 300.0)
+    ADMISSION_BATCH_SIZE: int = os.getenv("ADMISSION_BATCH_SIZE", 1000)
+    ADMISSION_PIPELINE_INTERVAL: float = os.getenv("ADMISSION_PIPELINE_INTERVAL", 0.0)
+    TABLE_VERSION_FOLD_INTERVAL: float = os.getenv("TABLE_VERSION_FOLD_INTERVAL", 300.0)
     class Config:
         env_file = ".env"
 
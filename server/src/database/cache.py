@@ -0,0 +1,173 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+import asyncpg
+from server.src.config import settings
+from server.src.database.db import db
+
+logger = logging.getLogger(__name__)
+
+CACHE_CHANNEL = "cache_invalidation"
+
+CacheKey = Tuple[str, str, tuple]
+
+
+class QueryCache:
+    """Кэш ответов для справочных таблиц с вытеснением по LRU и TTL.
+
+    Ключ записи - таблица, запрос и его параметры. Обработчики записи вызывают
+    invalidate(table, key): сбрасываются списки таблицы и записи с этим ключом.
+    При CACHE_NOTIFY сброс рассылается другим процессам через LISTEN/NOTIFY.
+
+    Одновременные промахи по одному ключу ждут одну загрузку. Загрузка, во время
+    которой таблицу сбросили, отдаёт результат, но не сохраняет его: поколение
+    таблицы к её концу уже другое.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, notify: bool):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.notify = notify
+        self.entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self.tables: Dict[str, Set[CacheKey]] = {}
+        self.generations: Dict[str, int] = {}
+        self.loading: Dict[CacheKey, asyncio.Task] = {}
+        self.origin = f"{os.getpid()}:{id(self)}"
+        self.listener = None
+        self.reconnecting: Optional[asyncio.Task] = None
+        self.closing = False
+        self.hits = 0
+        self.misses = 0
+
+    async def open(self):
+        if self.notify:
+            self.closing = False
+            await self.listen()
+
+    async def listen(self):
+        self.listener = await db.listen(CACHE_CHANNEL, self.on_notify)
+        self.listener.add_termination_listener(self.on_listener_lost)
+
+    def on_listener_lost(self, connection):
+        if self.closing:
+            return
+        # Сбросы, разосланные за время обрыва, потеряны: кэш очищается, а до
+        # переподключения новые значения не сохраняются (см. storable)
+        logger.warning("Cache invalidation listener lost, flushing cache and reconnecting")
+        self.listener = None
+        self.clear()
+        self.reconnecting = asyncio.get_running_loop().create_task(self.reconnect())
+
+    async def reconnect(self):
+        delay = 1.0
+        while not self.closing:
+            try:
+                await self.listen()
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Cache listener reconnect failed: %s", e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60.0)
+            else:
+                # Сбросы между потерей соединения и LISTEN тоже потеряны
+                self.clear()
+                return
+
+    async def close(self):
+        self.closing = True
+        if self.reconnecting is not None:
+            self.reconnecting.cancel()
+            self.reconnecting = None
+        if self.listener is not None:
+            await self.listener.close()
+            self.listener = None
+
+    @property
+    def storable(self) -> bool:
+        """Без подписки на сбросы других процессов значения не кэшируются"""
+        return not self.notify or self.listener is not None
+
+    async def get_or_load(self, table: str, query: str, args: tuple, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Значение из кэша или результат loader(), сохранённый в кэш"""
+        key = (table, query, args)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        task = self.loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.load(key, loader))
+            self.loading[key] = task
+        # shield: отмена одного ожидающего запроса не прерывает общую загрузку
+        return await asyncio.shield(task)
+
+    async def load(self, key: CacheKey, loader: Callable[[], Awaitable[Any]]) -> Any:
+        table = key[0]
+        generation = self.generations.get(table, 0)
+        try:
+            value = await loader()
+        finally:
+            if self.loading.get(key) is asyncio.current_task():
+                del self.loading[key]
+        if self.generations.get(table, 0) == generation and self.storable:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            self.tables.setdefault(table, set()).add(key)
+            while len(self.entries) > self.max_entries:
+                self.forget(next(iter(self.entries)))
+        return value
+
+    def forget(self, key: CacheKey):
+        self.entries.pop(key, None)
+        keys = self.tables.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+
+    def drop(self, table: str, key: Optional[Any] = None):
+        """Сброс списков таблицы и записей с ключом key (или всей таблицы, если key не задан)"""
+        # Идущие загрузки таблицы могли прочитать старые данные: их результат не сохранится,
+        # а новые промахи не присоединятся к ним
+        self.generations[table] = self.generations.get(table, 0) + 1
+        for loading in [cached for cached in self.loading if cached[0] == table]:
+            del self.loading[loading]
+        for cached in list(self.tables.get(table, ())):
+            args = cached[2]
+            if key is None or not args or args == (key,):
+                self.forget(cached)
+
+    def clear(self):
+        """Сброс всех таблиц"""
+        tables = {*self.tables, *self.generations, *(key[0] for key in self.loading)}
+        for table in tables:
+            self.drop(table)
+
+    async def invalidate(self, table: str, key: Optional[Any] = None):
+        self.drop(table, key)
+        if self.notify:
+            payload = json.dumps({"origin": self.origin, "table": table, "key": key}, default=str)
+            await db.execute("SELECT pg_notify($1, $2)", CACHE_CHANNEL, payload)
+
+    def on_notify(self, connection, pid, channel, payload):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Malformed cache invalidation payload: %s", payload)
+            return
+        if message.get("origin") != self.origin:
+            self.drop(message["table"], message.get("key"))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+reference_cache = QueryCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL, settings.CACHE_NOTIFY)
+
+# Результаты отчётов: версия исходной таблицы входит в ключ, поэтому сброс не нужен -
+# устаревшие записи вытесняются по LRU и TTL
+report_cache = QueryCache(settings.REPORT_CACHE_MAX_ENTRIES, settings.REPORT_CACHE_TTL, notify=False)
@@ -1,11 +1,23 @@
-from typing import Optional, Dict, Any, List
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List, AsyncIterable, AsyncIterator, Callable, Tuple
 from server.src.config import settings
+from server.src.database.metrics import DatabaseMetrics, request_timings
+from server.src.database.statements import RegistryConnection, registry
 import asyncpg
-from asyncpg import Pool
+from asyncpg import Pool, Connection
+
+logger = logging.getLogger(__name__)
+
+# Соединение, закреплённое за текущей задачей блоком db.bind() / db.transaction()
+current_connection: ContextVar[Optional[Connection]] = ContextVar("current_connection", default=None)
 
 class Database:
     def __init__(self):
         self.pool: Optional[Pool] = None
+        self.metrics = DatabaseMetrics()
 
     async def connect(self):
         """Для подключения к БД"""
@@ -14,7 +26,14 @@ class Database:
             port=settings.DB_PORT,
             user=settings.DB_USER,
             database=settings.DB_NAME,
-            password=settings.DB_PASS
+            password=settings.DB_PASS,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_LIFETIME,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+            command_timeout=settings.DB_COMMAND_TIMEOUT,
+            connection_class=RegistryConnection,
+            init=registry.prepare
         )
 
     async def disconnect(self):
@@ -22,25 +41,147 @@ class Database:
         if self.pool:
             await self.pool.close()
 
+    async def connect_direct(self) -> Connection:
+        """Отдельное соединение вне пула"""
+        return await asyncpg.connect(
+            host=settings.DB_HOST,
+            port=settings.DB_PORT,
+            user=settings.DB_USER,
+            database=settings.DB_NAME,
+            password=settings.DB_PASS
+        )
+
+    async def listen(self, channel: str, callback: Callable) -> Connection:
+        """Отдельное соединение вне пула, подписанное на канал LISTEN/NOTIFY"""
+        conn = await self.connect_direct()
+        await conn.add_listener(channel, callback)
+        return conn
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Connection]:
+        """Соединение из пула с учётом времени ожидания (внутри bind() - закреплённое)"""
+        bound = current_connection.get()
+        if bound is not None:
+            yield bound
+            return
+        started = time.perf_counter()
+        async with self.pool.acquire() as conn:
+            self.metrics.acquire_wait.observe(time.perf_counter() - started)
+            yield conn
+
+    @asynccontextmanager
+    async def bind(self) -> AsyncIterator[Connection]:
+        """Одно соединение на все запросы блока: fetch_one, execute и др. берут его вместо пула.
+
+        Задачи, запущенные внутри блока, наследуют контекст - параллельно
+        выполнять запросы из них нельзя.
+        """
+        async with self.connection() as conn:
+            token = current_connection.set(conn)
+            try:
+                yield conn
+            finally:
+                current_connection.reset(token)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Connection]:
+        """Запросы блока в одной транзакции на одном соединении (вложенный блок - точка сохранения)"""
+        async with self.bind() as conn:
+            async with conn.transaction():
+                yield conn
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Состояние пула и гистограммы задержек"""
+        size = self.pool.get_size() if self.pool else 0
+        idle = self.pool.get_idle_size() if self.pool else 0
+        return {
+            "min_size": settings.DB_POOL_MIN_SIZE,
+            "max_size": settings.DB_POOL_MAX_SIZE,
+            "size": size,
+            "idle": idle,
+            "acquired": size - idle,
+            "acquire_wait_seconds": self.metrics.acquire_wait.snapshot(),
+            "query_latency_seconds": self.metrics.query_latency.snapshot(),
+        }
+
+    def observe_query(self, name: Optional[str], query: str, elapsed: float):
+        """Учёт выполненного запроса: гистограмма, реестр, текущий HTTP-запрос, журнал медленных"""
+        self.metrics.query_latency.observe(elapsed)
+        registry.observe(name, elapsed)
+        timings = request_timings.get()
+        if timings is not None:
+            timings.add(elapsed)
+        if settings.SLOW_QUERY_SECONDS is not None and elapsed >= settings.SLOW_QUERY_SECONDS:
+            logger.warning(
+                "Slow query %s: %.1f ms (%s)",
+                name or " ".join(query.split())[:80],
+                elapsed * 1000,
+                timings.path if timings is not None else "background"
+            )
+
+    async def run(self, conn: Connection, method: str, query: str, *args):
+        """Выполнение запроса с учётом статистики реестра по имени запроса"""
+        started = time.perf_counter()
+        try:
+            return await getattr(conn, method)(query, *args)
+        finally:
+            self.observe_query(registry.name_of(query), query, time.perf_counter() - started)
+
     async def fetch_one(self, query: str, *args) -> Optional[Dict[str, Any]]:
         """Получение одной записи"""
-        async with self.pool.acquire() as conn:
-            return await conn.fetchrow(query, *args)
+        async with self.connection() as conn:
+            return await self.run(conn, "fetchrow", query, *args)
 
     async def fetch_all(self, query: str, *args) -> List[Dict[str, Any]]:
         """Получение всех записей"""
-        async with self.pool.acquire() as conn:
-            return await conn.fetch(query, *args)
+        async with self.connection() as conn:
+            return await self.run(conn, "fetch", query, *args)
+
+    async def describe(self, query: str) -> List[Tuple[str, str]]:
+        """Имена и типы столбцов результата запроса (без его выполнения)"""
+        async with self.connection() as conn:
+            statement = await conn.prepare(query)
+            return [(attribute.name, attribute.type.name) for attribute in statement.get_attributes()]
+
+    async def iterate(self, query: str, *args, chunk_size: int = 1000) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Получение записей пачками через серверный курсор"""
+        async with self.connection() as conn:
+            async with conn.transaction():
+                cursor = await conn.cursor(query, *args)
+                name = registry.name_of(query)
+                while True:
+                    started = time.perf_counter()
+                    records = await cursor.fetch(chunk_size)
+                    self.observe_query(name, query, time.perf_counter() - started)
+                    if not records:
+                        break
+                    yield records
 
     async def execute(self, query: str, *args) -> str:
         """Выполнение запроса (возвращает строку с информацией о выполнении)"""
-        async with self.pool.acquire() as conn:
-            return await conn.execute(query, *args)
-        pass
+        async with self.connection() as conn:
+            return await self.run(conn, "execute", query, *args)
 
     async def execute_returning(self, query: str, *args) -> Dict[str, Any]:
         """Выполнение запроса с возвратом данных"""
-        async with self.pool.acquire() as conn:
-             return await conn.fetchrow(query, *args)
+        async with self.connection() as conn:
+            return await self.run(conn, "fetchrow", query, *args)
+
+    async def copy_records(
+            self,
+            table: str,
+            columns: List[str],
+            batches: AsyncIterable[List[tuple]]
+    ) -> int:
+        """Массовая вставка пачек записей через COPY в одной транзакции (возвращает число строк)"""
+        inserted = 0
+        async with self.connection() as conn:
+            async with conn.transaction():
+                async for records in batches:
+                    started = time.perf_counter()
+                    await conn.copy_records_to_table(table, records=records, columns=columns)
+                    self.observe_query(None, f"COPY {table}", time.perf_counter() - started)
+                    inserted += len(records)
+        return inserted
 
 db = Database()
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""Проверка планов запросов из requests.py и auth/repository.py.
+
+Для каждого запроса строится generic-план (как у подготовленного запроса без
+известных параметров) с enable_seqscan = off и ищутся оставшиеся Seq Scan -
+результат не зависит от объёма данных. Запускать против локальной базы с
+применёнными миграциями:
+
+    python -m server.src.database.explain
+    python -m server.src.database.explain --only GET_WORKER GET_CAR
+
+Код возврата 1, если есть неожиданные последовательные чтения.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+from asyncpg import Connection
+from server.src.auth import repository
+from server.src.database import requests
+from server.src.database.db import db
+from server.src.database.statements import named_queries
+
+# Запросы, которые по смыслу читают всю таблицу (списки, выгрузки, подсчёты, отчёты,
+# свёртка счётчиков версий, пул ключей)
+FULL_SCAN_PREFIXES = ("GET_ALL_", "COUNT_", "REPORT_", "FOLD_")
+FULL_SCAN_SUFFIXES = ("_KEYS",)
+
+# Запросы, которым нужно необязательное расширение; без него они пропускаются
+EXTENSION_SUFFIXES = {"_FUZZY": "pg_trgm"}
+
+
+def collect_queries() -> Dict[str, str]:
+    return {**named_queries(requests), **named_queries(repository)}
+
+
+def expects_full_scan(name: str) -> bool:
+    return name.startswith(FULL_SCAN_PREFIXES) or name.endswith(FULL_SCAN_SUFFIXES)
+
+
+def required_extension(name: str) -> Optional[str]:
+    for suffix, extension in EXTENSION_SUFFIXES.items():
+        if name.endswith(suffix):
+            return extension
+    return None
+
+
+def seq_scans(plan: Dict) -> Iterator[str]:
+    """Таблицы, читаемые узлами Seq Scan (рекурсивно по дереву плана)"""
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan.get("Relation Name", "?")
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+async def explain(conn: Connection, query: str) -> Dict:
+    """Generic-план запроса: параметры не подставляются и не влияют на план"""
+    statement = await conn.prepare(query)
+    arity = len(statement.get_parameters())
+    async with conn.transaction():
+        await conn.execute("SET LOCAL plan_cache_mode = force_generic_plan")
+        # Seq Scan остаётся в плане, только если подходящего индекса нет вовсе
+        await conn.execute("SET LOCAL enable_seqscan = off")
+        await conn.execute(f"PREPARE explain_check AS {query.strip().rstrip(';')}")
+        try:
+            arguments = f"({', '.join(['NULL'] * arity)})" if arity else ""
+            rows = await conn.fetchval(f"EXPLAIN (FORMAT JSON) EXECUTE explain_check{arguments}")
+        finally:
+            await conn.execute("DEALLOCATE explain_check")
+    return json.loads(rows)[0]["Plan"]
+
+
+async def check(names: List[str]) -> List[Tuple[str, str, List[str]]]:
+    """(имя, статус, таблицы): статус ok / expected / skipped / seq_scan / error"""
+    queries = collect_queries()
+    results = []
+    conn = await db.connect_direct()
+    try:
+        installed = {record[0] for record in await conn.fetch("SELECT extname FROM pg_extension")}
+        for name in names or sorted(queries):
+            extension = required_extension(name)
+            if extension is not None and extension not in installed:
+                results.append((name, "skipped", [f"{extension} is not installed"]))
+                continue
+            try:
+                tables = sorted(set(seq_scans(await explain(conn, queries[name]))))
+            except Exception as e:
+                results.append((name, "error", [str(e).splitlines()[0]]))
+                continue
+            if not tables:
+                status = "ok"
+            elif expects_full_scan(name):
+                status = "expected"
+            else:
+                status = "seq_scan"
+            results.append((name, status, tables))
+    finally:
+        await conn.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN всех запросов и поиск Seq Scan")
+    parser.add_argument("--only", nargs="*", default=[], help="имена констант для проверки")
+    args = parser.parse_args()
+
+    results = asyncio.run(check(args.only))
+    for name, status, tables in results:
+        print(f"{status:9} {name:32} {', '.join(tables)}")
+    failed = [name for name, status, _ in results if status in ("seq_scan", "error")]
+    if failed:
+        print(f"\n{len(failed)} queries need attention: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Перенос поставок из admission_journal в car пачками.
+
+Каждая пачка - один запрос CONVERT_ADMISSIONS в своей транзакции: автомобили
+вставляются, VIN выдаются последовательностью car_vin_seq, поставки отмечаются
+выданным VIN. Прерванный перенос продолжается с первой неотмеченной поставки.
+"""
+from typing import Optional, Tuple
+from server.src.config import settings
+from server.src.database.db import db
+from server.src.database.key_pool import key_pool
+from server.src.database.requests import CONVERT_ADMISSIONS, COUNT_PENDING_ADMISSIONS
+
+
+async def pending_admissions() -> int:
+    """Число поставок, ещё не перенесённых в car"""
+    record = await db.fetch_one(COUNT_PENDING_ADMISSIONS)
+    return record["count"]
+
+
+async def convert_admissions(batch_size: int, max_batches: Optional[int] = None) -> Tuple[int, int]:
+    """Перенос до max_batches пачек (все, если None); возвращает (автомобилей, пачек)"""
+    converted = batches = 0
+    while max_batches is None or batches < max_batches:
+        records = await db.fetch_all(CONVERT_ADMISSIONS, batch_size)
+        if not records:
+            break
+        converted += len(records)
+        batches += 1
+        if len(records) < batch_size:
+            break
+    if converted:
+        key_pool.invalidate("car")
+    return converted, batches
+
+
+async def convert_pending_admissions() -> int:
+    """Задача планировщика: перенос всех накопившихся поставок"""
+    converted, _ = await convert_admissions(settings.ADMISSION_BATCH_SIZE)
+    return converted
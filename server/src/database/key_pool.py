@@ -0,0 +1,141 @@
+import asyncio
+import random
+from typing import Any, Callable, Dict, List, Optional
+from server.src.database.db import db, Database
+from server.src.database.versions import get_table_version, get_table_versions
+from server.src.database.requests import (
+    GET_ADMISSION_KEYS,
+    GET_CAR_KEYS,
+    GET_CLIENT_KEYS,
+    GET_COMPANY_KEYS,
+    GET_DIRECTOR_KEYS,
+    GET_EXPANSE_KEYS
+)
+
+KEY_SOURCES = {
+    "admission_journal": GET_ADMISSION_KEYS,
+    "car": GET_CAR_KEYS,
+    "client": GET_CLIENT_KEYS,
+    "company": GET_COMPANY_KEYS,
+    "director": GET_DIRECTOR_KEYS,
+    "expanse_journal": GET_EXPANSE_KEYS,
+}
+
+
+class EmptyKeyPool(Exception):
+    """В таблице-справочнике нет записей, на которые можно сослаться"""
+
+    def __init__(self, table: str):
+        self.table = table
+        super().__init__(f"No rows in {table} to reference")
+
+
+class KeySet:
+    """Множество ключей с добавлением, удалением и выборкой за O(1)"""
+
+    def __init__(self, keys: List[Any], version: int):
+        self.keys: List[Any] = list(dict.fromkeys(keys))
+        self.positions: Dict[Any, int] = {key: i for i, key in enumerate(self.keys)}
+        # Версия таблицы (table_versions), с которой загружены ключи
+        self.version = version
+
+    def add(self, key: Any):
+        if key not in self.positions:
+            self.positions[key] = len(self.keys)
+            self.keys.append(key)
+
+    def discard(self, key: Any):
+        position = self.positions.pop(key, None)
+        if position is None:
+            return
+        last = self.keys.pop()
+        if position < len(self.keys):
+            self.keys[position] = last
+            self.positions[last] = position
+
+    def sample(self) -> Optional[Any]:
+        if not self.keys:
+            return None
+        return self.keys[random.randrange(len(self.keys))]
+
+
+class KeyPool:
+    """Пул первичных ключей таблиц-справочников для выбора случайного внешнего ключа.
+
+    Ключи загружаются при первом обращении и поддерживаются обработчиками
+    create/delete через add/discard. Изменения из других процессов подхватывает
+    задача планировщика refresh: раз в KEY_POOL_TTL секунд она сравнивает версии
+    таблиц (table_versions) и в фоне перечитывает только изменившиеся.
+    """
+
+    def __init__(self, database: Database):
+        self.database = database
+        self.sets: Dict[str, KeySet] = {}
+        self.locks: Dict[str, asyncio.Lock] = {table: asyncio.Lock() for table in KEY_SOURCES}
+
+    async def load(self, table: str) -> KeySet:
+        """Полная загрузка ключей таблицы"""
+        # Версия читается до ключей: изменение между запросами даст лишнюю, но не пропущенную перезагрузку
+        version = await get_table_version(table)
+        records = await self.database.fetch_all(KEY_SOURCES[table])
+        key_set = KeySet([record[0] for record in records], version)
+        self.sets[table] = key_set
+        return key_set
+
+    async def get(self, table: str) -> KeySet:
+        key_set = self.sets.get(table)
+        if key_set is not None:
+            return key_set
+        async with self.locks[table]:
+            key_set = self.sets.get(table)
+            if key_set is None:
+                key_set = await self.load(table)
+            return key_set
+
+    async def sample(self, table: str) -> Any:
+        """Случайный ключ таблицы (EmptyKeyPool, если таблица пуста)"""
+        key = (await self.get(table)).sample()
+        if key is None:
+            raise EmptyKeyPool(table)
+        return key
+
+    async def sampler(self, table: str) -> Callable[[], Any]:
+        """Выборка случайных ключей без обращений к базе - для циклов внутри COPY и транзакций"""
+        key_set = await self.get(table)
+        if not key_set.keys:
+            raise EmptyKeyPool(table)
+        return key_set.sample
+
+    async def refresh(self) -> int:
+        """Перечитывает ключи таблиц, изменившихся с загрузки (возвращает число прочитанных ключей)"""
+        tables = list(self.sets)
+        if not tables:
+            return 0
+        versions = await get_table_versions(tables)
+        loaded = 0
+        for table in tables:
+            key_set = self.sets.get(table)
+            if key_set is None or key_set.version == versions[table]:
+                continue
+            async with self.locks[table]:
+                loaded += len((await self.load(table)).keys)
+        return loaded
+
+    def add(self, table: str, key: Any):
+        """Регистрирует ключ созданной записи"""
+        key_set = self.sets.get(table)
+        if key_set is not None:
+            key_set.add(key)
+
+    def discard(self, table: str, key: Any):
+        """Убирает ключ удалённой записи"""
+        key_set = self.sets.get(table)
+        if key_set is not None:
+            key_set.discard(key)
+
+    def invalidate(self, table: str):
+        """Сбрасывает ключи таблицы (перечитаются при следующем обращении)"""
+        self.sets.pop(table, None)
+
+
+key_pool = KeyPool(db)
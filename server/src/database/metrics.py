@@ -0,0 +1,63 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Гистограмма длительностей (в секундах) с накопительными корзинами"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def snapshot(self) -> Dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+class DatabaseMetrics:
+    """Метрики работы с пулом соединений"""
+
+    def __init__(self):
+        self.acquire_wait = Histogram()
+        self.query_latency = Histogram()
+
+
+class RequestTimings:
+    """Запросы к БД в рамках одного HTTP-запроса"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.queries = 0
+        self.db_time = 0.0
+
+    def add(self, elapsed: float):
+        self.queries += 1
+        self.db_time += elapsed
+
+
+# Заполняется middleware на время обработки запроса; вне запроса (фоновые задачи) - None
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
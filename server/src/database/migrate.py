@@ -0,0 +1,109 @@
+"""Версионные миграции схемы.
+
+Миграции - файлы migrations/NNNN_name.sql, применяются по возрастанию номера,
+каждая в своей транзакции; применённые записываются в schema_migrations.
+
+    python -m server.src.database.migrate           # применить недостающие
+    python -m server.src.database.migrate --status  # показать состояние
+"""
+import argparse
+import asyncio
+import logging
+import re
+from pathlib import Path
+from typing import List, NamedTuple
+from asyncpg import Connection
+from server.src.database.db import db
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+# Ключ advisory-блокировки: несколько процессов не применяют миграции одновременно
+MIGRATION_LOCK_ID = 7_214_002
+
+CREATE_SCHEMA_MIGRATIONS = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+"""
+
+GET_APPLIED_MIGRATIONS = "SELECT version FROM schema_migrations;"
+
+ADD_MIGRATION = "INSERT INTO schema_migrations (version, name) VALUES ($1, $2);"
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    path: Path
+
+
+def list_migrations() -> List[Migration]:
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        match = re.fullmatch(r"(\d+)_(\w+)\.sql", path.name)
+        if not match:
+            raise ValueError(f"Bad migration file name: {path.name}")
+        migrations.append(Migration(int(match.group(1)), match.group(2), path))
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError("Duplicate migration versions")
+    return migrations
+
+
+async def applied_versions(conn: Connection) -> set:
+    await conn.execute(CREATE_SCHEMA_MIGRATIONS)
+    return {record["version"] for record in await conn.fetch(GET_APPLIED_MIGRATIONS)}
+
+
+async def apply_migrations(conn: Connection) -> List[Migration]:
+    """Применение недостающих миграций (возвращает применённые)"""
+    applied = []
+    await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+    try:
+        done = await applied_versions(conn)
+        for migration in list_migrations():
+            if migration.version in done:
+                continue
+            async with conn.transaction():
+                await conn.execute(migration.path.read_text(encoding="utf-8"))
+                await conn.execute(ADD_MIGRATION, migration.version, migration.name)
+            logger.info("Applied migration %04d_%s", migration.version, migration.name)
+            applied.append(migration)
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
+    return applied
+
+
+async def migrate() -> List[Migration]:
+    """Миграции через отдельное соединение (до создания пула)"""
+    conn = await db.connect_direct()
+    try:
+        return await apply_migrations(conn)
+    finally:
+        await conn.close()
+
+
+async def main(status: bool):
+    if not status:
+        for migration in await migrate():
+            print(f"applied {migration.version:04d}_{migration.name}")
+        return
+    conn = await db.connect_direct()
+    try:
+        done = await applied_versions(conn)
+    finally:
+        await conn.close()
+    for migration in list_migrations():
+        state = "applied" if migration.version in done else "pending"
+        print(f"{state:8} {migration.version:04d}_{migration.name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Применение миграций схемы")
+    parser.add_argument("--status", action="store_true", help="только показать состояние")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(parser.parse_args().status))
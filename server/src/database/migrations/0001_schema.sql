@@ -0,0 +1,105 @@
+-- Исходная схема. IF NOT EXISTS - чтобы миграция проходила и на базе,
+-- созданной вручную до появления миграций.
+
+CREATE TABLE IF NOT EXISTS company (
+    inn BIGINT PRIMARY KEY,
+    name_company TEXT NOT NULL,
+    address TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS director (
+    inn BIGINT PRIMARY KEY,
+    profit NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    surname TEXT NOT NULL,
+    firstname TEXT NOT NULL,
+    lastname TEXT NOT NULL,
+    inn_company BIGINT REFERENCES company (inn) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS expanse_journal (
+    id_expanse SERIAL PRIMARY KEY,
+    expanse_type TEXT NOT NULL,
+    expanse_sum NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    expanse_name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id SERIAL PRIMARY KEY,
+    salary INTEGER NOT NULL DEFAULT 20000 CHECK (salary >= 20000),
+    post TEXT NOT NULL DEFAULT 'Безработный',
+    experience INTEGER NOT NULL DEFAULT 0,
+    surname TEXT NOT NULL,
+    firstname TEXT NOT NULL,
+    lastname TEXT NOT NULL,
+    phone_number BIGINT NOT NULL,
+    address TEXT NOT NULL,
+    id_expanse INTEGER REFERENCES expanse_journal (id_expanse) ON DELETE SET NULL,
+    inn_director BIGINT REFERENCES director (inn) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS client (
+    app_number SERIAL PRIMARY KEY,
+    budget NUMERIC(14, 2) NOT NULL DEFAULT 0 CHECK (budget >= 0),
+    current_car TEXT NOT NULL DEFAULT 'Отсутствует',
+    prefer_car TEXT NOT NULL DEFAULT 'Отсутствует'
+);
+
+CREATE TABLE IF NOT EXISTS admission_journal (
+    id_number SERIAL PRIMARY KEY,
+    admission_date DATE NOT NULL,
+    complectation TEXT NOT NULL,
+    color TEXT NOT NULL,
+    mark TEXT NOT NULL,
+    model TEXT NOT NULL,
+    year_create INTEGER NOT NULL CHECK (year_create >= 1980)
+);
+
+CREATE TABLE IF NOT EXISTS car (
+    number_vin VARCHAR(17) PRIMARY KEY,
+    complectation TEXT NOT NULL,
+    color TEXT NOT NULL,
+    mark TEXT NOT NULL,
+    model TEXT NOT NULL,
+    year_create INTEGER NOT NULL CHECK (year_create >= 1980),
+    app_number INTEGER REFERENCES client (app_number) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS accountant (
+    worker_id INTEGER PRIMARY KEY REFERENCES workers (worker_id) ON DELETE CASCADE,
+    qual INTEGER NOT NULL DEFAULT 0 CHECK (qual >= 0),
+    kit TEXT NOT NULL DEFAULT 'Отсутствует',
+    id_number INTEGER REFERENCES admission_journal (id_number) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS driver (
+    worker_id INTEGER PRIMARY KEY REFERENCES workers (worker_id) ON DELETE CASCADE,
+    car_number TEXT NOT NULL,
+    snacks TEXT NOT NULL DEFAULT 'Отсутствует',
+    number_vin VARCHAR(17) REFERENCES car (number_vin) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS lifeguards (
+    worker_id INTEGER PRIMARY KEY REFERENCES workers (worker_id) ON DELETE CASCADE,
+    uniform TEXT NOT NULL,
+    kit TEXT NOT NULL DEFAULT 'Отсутствует',
+    security_zone TEXT NOT NULL DEFAULT 'Вход'
+);
+
+CREATE TABLE IF NOT EXISTS seller (
+    worker_id INTEGER PRIMARY KEY REFERENCES workers (worker_id) ON DELETE CASCADE,
+    seller_type TEXT NOT NULL,
+    app_number INTEGER REFERENCES client (app_number) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id SERIAL PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL UNIQUE,
+    hashed_password TEXT NOT NULL,
+    fio TEXT NOT NULL,
+    birthday DATE NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    email_verified BOOLEAN NOT NULL DEFAULT false,
+    email_code TEXT,
+    email_expires TIMESTAMP
+);
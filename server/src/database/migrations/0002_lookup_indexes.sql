@@ -0,0 +1,18 @@
+-- Индексы под условия WHERE/JOIN из requests.py и auth/repository.py.
+-- Первичные ключи и UNIQUE (users.username, users.email) индексируются сами.
+
+-- GET_AVAILABLE_*, CREATE_ACCOUNTANT/DRIVER/LIFEGUARD/SELLER, фильтр post в GET_WORKERS_PAGE
+CREATE INDEX IF NOT EXISTS workers_post_idx ON workers (post, worker_id);
+
+-- Внешние ключи: поиск зависимых строк при удалении родителя и соединения
+CREATE INDEX IF NOT EXISTS car_app_number_idx ON car (app_number);
+CREATE INDEX IF NOT EXISTS director_inn_company_idx ON director (inn_company);
+CREATE INDEX IF NOT EXISTS workers_id_expanse_idx ON workers (id_expanse);
+CREATE INDEX IF NOT EXISTS workers_inn_director_idx ON workers (inn_director);
+CREATE INDEX IF NOT EXISTS accountant_id_number_idx ON accountant (id_number);
+CREATE INDEX IF NOT EXISTS driver_number_vin_idx ON driver (number_vin);
+CREATE INDEX IF NOT EXISTS seller_app_number_idx ON seller (app_number);
+
+-- CLEANUP_UNVERIFIED_USERS: email_verified = false AND email_expires < $1
+CREATE INDEX IF NOT EXISTS users_unverified_expires_idx
+    ON users (email_expires) WHERE email_verified = false;
@@ -0,0 +1,59 @@
+-- Служебные таблицы: очередь писем, сессии, счётчики версий для ETag
+
+CREATE TABLE IF NOT EXISTS mail_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    recipient TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    locked_until TIMESTAMPTZ,
+    sent_at TIMESTAMPTZ,
+    last_error TEXT
+);
+
+CREATE INDEX IF NOT EXISTS mail_outbox_pending_idx
+    ON mail_outbox (next_attempt_at) WHERE sent_at IS NULL;
+
+-- SESSION_BACKEND=postgres
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    data JSONB NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS sessions_expires_at_idx ON sessions (expires_at);
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + 1;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    entity TEXT;
+BEGIN
+    FOREACH entity IN ARRAY ARRAY[
+        'accountant', 'admission_journal', 'car', 'client', 'company', 'director',
+        'driver', 'expanse_journal', 'lifeguards', 'seller', 'workers'
+    ] LOOP
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_trigger WHERE tgname = entity || '_version' AND NOT tgisinternal
+        ) THEN
+            EXECUTE format(
+                'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I '
+                'FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()',
+                entity || '_version', entity
+            );
+        END IF;
+    END LOOP;
+END
+$$;
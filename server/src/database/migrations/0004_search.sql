@@ -0,0 +1,52 @@
+-- Поиск по сотрудникам и автомобилям (SEARCH_WORKERS*, SEARCH_CARS*).
+-- Документы строятся IMMUTABLE-функциями: по ним же построены индексы, и запросы
+-- вызывают их с теми же аргументами. Конфигурация 'simple' - без стемминга,
+-- имена и марки не искажаются, префиксы (иван:*) работают для подсказок.
+
+CREATE OR REPLACE FUNCTION worker_search_document(
+    surname TEXT, firstname TEXT, lastname TEXT, post TEXT, address TEXT
+) RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('simple', surname || ' ' || firstname || ' ' || lastname), 'A')
+        || setweight(to_tsvector('simple', post), 'B')
+        || setweight(to_tsvector('simple', address), 'C')
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION worker_search_text(
+    surname TEXT, firstname TEXT, lastname TEXT, post TEXT, address TEXT
+) RETURNS TEXT AS $$
+    SELECT surname || ' ' || firstname || ' ' || lastname || ' ' || post || ' ' || address
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION car_search_document(
+    number_vin TEXT, mark TEXT, model TEXT, complectation TEXT, color TEXT
+) RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('simple', number_vin || ' ' || mark || ' ' || model), 'A')
+        || setweight(to_tsvector('simple', complectation), 'B')
+        || setweight(to_tsvector('simple', color), 'C')
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION car_search_text(
+    number_vin TEXT, mark TEXT, model TEXT, complectation TEXT, color TEXT
+) RETURNS TEXT AS $$
+    SELECT number_vin || ' ' || mark || ' ' || model || ' ' || complectation || ' ' || color
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE INDEX IF NOT EXISTS workers_search_document_idx ON workers
+    USING gin (worker_search_document(surname, firstname, lastname, post, address));
+
+CREATE INDEX IF NOT EXISTS car_search_document_idx ON car
+    USING gin (car_search_document(number_vin, mark, model, complectation, color));
+
+-- Нечёткий поиск с опечатками (SEARCH_*_FUZZY) - только если в сборке есть pg_trgm;
+-- без него /search работает по полнотекстовым индексам
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS workers_search_text_idx ON workers
+            USING gin (worker_search_text(surname, firstname, lastname, post, address) gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS car_search_text_idx ON car
+            USING gin (car_search_text(number_vin, mark, model, complectation, color) gin_trgm_ops);
+    END IF;
+END
+$$;
@@ -0,0 +1,91 @@
+-- Материализованные отчёты (REPORT_*_VIEW, server/src/database/reports.py).
+-- Определения повторяют REPORT_* из requests.py без фильтров и сортировки.
+-- Создаются пустыми: заполняет их задача refresh_report_views, только при
+-- REPORTS_MATERIALIZED; до первого обновления отчёты считаются по таблицам.
+-- Уникальные индексы нужны для REFRESH MATERIALIZED VIEW CONCURRENTLY.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS report_expanses_by_type AS
+    SELECT
+        expanse_type,
+        count(*) AS entries,
+        sum(expanse_sum) AS total,
+        avg(expanse_sum) AS average,
+        min(expanse_sum) AS minimum,
+        max(expanse_sum) AS maximum
+    FROM expanse_journal
+    GROUP BY expanse_type
+WITH NO DATA;
+CREATE UNIQUE INDEX IF NOT EXISTS report_expanses_by_type_key ON report_expanses_by_type (expanse_type);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS report_payroll_by_post AS
+    SELECT
+        post,
+        count(*) AS workers,
+        sum(salary) AS payroll,
+        avg(salary) AS average_salary,
+        min(salary) AS min_salary,
+        max(salary) AS max_salary
+    FROM workers
+    GROUP BY post
+WITH NO DATA;
+CREATE UNIQUE INDEX IF NOT EXISTS report_payroll_by_post_key ON report_payroll_by_post (post);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS report_payroll_by_director AS
+    SELECT
+        inn_director,
+        count(*) AS workers,
+        sum(salary) AS payroll,
+        avg(salary) AS average_salary,
+        min(salary) AS min_salary,
+        max(salary) AS max_salary
+    FROM workers
+    GROUP BY inn_director
+WITH NO DATA;
+CREATE UNIQUE INDEX IF NOT EXISTS report_payroll_by_director_key ON report_payroll_by_director (inn_director);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS report_stock_by_mark AS
+    SELECT
+        mark,
+        count(*) AS cars,
+        count(*) FILTER (WHERE app_number IS NULL) AS available
+    FROM car
+    GROUP BY mark
+WITH NO DATA;
+CREATE UNIQUE INDEX IF NOT EXISTS report_stock_by_mark_key ON report_stock_by_mark (mark);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS report_stock_by_model AS
+    SELECT
+        mark,
+        model,
+        count(*) AS cars,
+        count(*) FILTER (WHERE app_number IS NULL) AS available
+    FROM car
+    GROUP BY mark, model
+WITH NO DATA;
+CREATE UNIQUE INDEX IF NOT EXISTS report_stock_by_model_key ON report_stock_by_model (mark, model);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS report_stock_by_year AS
+    SELECT
+        year_create,
+        count(*) AS cars,
+        count(*) FILTER (WHERE app_number IS NULL) AS available
+    FROM car
+    GROUP BY year_create
+WITH NO DATA;
+CREATE UNIQUE INDEX IF NOT EXISTS report_stock_by_year_key ON report_stock_by_year (year_create);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS report_admissions_by_month AS
+    SELECT
+        date_trunc('month', admission_date)::date AS month,
+        count(*) AS admissions
+    FROM admission_journal
+    GROUP BY 1
+WITH NO DATA;
+CREATE UNIQUE INDEX IF NOT EXISTS report_admissions_by_month_key ON report_admissions_by_month (month);
+
+-- Версия исходной таблицы (table_versions), по которой построено представление
+CREATE TABLE IF NOT EXISTS report_refreshes (
+    view_name TEXT PRIMARY KEY,
+    source_version BIGINT NOT NULL,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,33 @@
+-- Перенос поставок из admission_journal в car (CONVERT_ADMISSIONS).
+
+-- VIN из номера последовательности: префикс CSH и 14 знаков в 33-ричной записи
+-- алфавитом VIN (без I, O, Q). Разные номера дают разные VIN, поэтому уникальность
+-- обеспечивает последовательность, а не повтор вставки при совпадении.
+CREATE OR REPLACE FUNCTION car_vin(serial BIGINT) RETURNS VARCHAR(17) AS $$
+DECLARE
+    alphabet CONSTANT TEXT := '0123456789ABCDEFGHJKLMNPRSTUVWXYZ';
+    vin TEXT := '';
+BEGIN
+    FOR i IN 1..14 LOOP
+        vin := substr(alphabet, (serial % 33)::int + 1, 1) || vin;
+        serial := serial / 33;
+    END LOOP;
+    RETURN 'CSH' || vin;
+END
+$$ LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE;
+
+-- CACHE: каждое соединение берёт номера пачками, без обращения к последовательности на каждую строку
+CREATE SEQUENCE IF NOT EXISTS car_vin_seq CACHE 64 OWNED BY car.number_vin;
+
+-- CREATE_CAR и COPY в /cars/bulk больше не передают VIN
+ALTER TABLE car ALTER COLUMN number_vin SET DEFAULT car_vin(nextval('car_vin_seq'));
+
+-- VIN автомобиля, созданного из поставки; NULL - поставка ещё не перенесена.
+-- Отметка ставится в той же транзакции, что и вставка в car, и служит контрольной точкой
+ALTER TABLE admission_journal ADD COLUMN IF NOT EXISTS number_vin VARCHAR(17);
+
+CREATE UNIQUE INDEX IF NOT EXISTS admission_journal_number_vin_key ON admission_journal (number_vin);
+
+-- Очередь непереносённых поставок: индекс содержит только их и уменьшается по мере переноса
+CREATE INDEX IF NOT EXISTS admission_journal_pending_idx
+    ON admission_journal (id_number) WHERE number_vin IS NULL;
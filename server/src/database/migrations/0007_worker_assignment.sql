@@ -0,0 +1,65 @@
+-- Признак занятости сотрудника для CREATE_ACCOUNTANT/DRIVER/SELLER/LIFEGUARD.
+-- Свободные сотрудники лежат в частичном индексе workers_unassigned_idx, поэтому
+-- LIMIT 1 ... SKIP LOCKED находит строку сразу, а не проходит мимо всех занятых.
+-- Признак поддерживают триггеры на таблицах ролей.
+
+ALTER TABLE workers ADD COLUMN IF NOT EXISTS assigned BOOLEAN NOT NULL DEFAULT false;
+
+UPDATE workers w SET assigned = true
+WHERE NOT w.assigned
+AND (
+    EXISTS (SELECT 1 FROM accountant a WHERE a.worker_id = w.worker_id)
+    OR EXISTS (SELECT 1 FROM driver d WHERE d.worker_id = w.worker_id)
+    OR EXISTS (SELECT 1 FROM lifeguards l WHERE l.worker_id = w.worker_id)
+    OR EXISTS (SELECT 1 FROM seller s WHERE s.worker_id = w.worker_id)
+);
+
+CREATE INDEX IF NOT EXISTS workers_unassigned_idx ON workers (post, worker_id) WHERE NOT assigned;
+
+CREATE OR REPLACE FUNCTION mark_workers_assigned() RETURNS trigger AS $$
+BEGIN
+    UPDATE workers SET assigned = true
+    WHERE worker_id IN (SELECT worker_id FROM new_roles) AND NOT assigned;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+-- Сотрудник освобождается, только если он не занят ни в одной из ролей
+CREATE OR REPLACE FUNCTION mark_workers_free() RETURNS trigger AS $$
+BEGIN
+    UPDATE workers w SET assigned = false
+    WHERE w.worker_id IN (SELECT worker_id FROM old_roles) AND w.assigned
+    AND NOT EXISTS (SELECT 1 FROM accountant a WHERE a.worker_id = w.worker_id)
+    AND NOT EXISTS (SELECT 1 FROM driver d WHERE d.worker_id = w.worker_id)
+    AND NOT EXISTS (SELECT 1 FROM lifeguards l WHERE l.worker_id = w.worker_id)
+    AND NOT EXISTS (SELECT 1 FROM seller s WHERE s.worker_id = w.worker_id);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    entity TEXT;
+BEGIN
+    FOREACH entity IN ARRAY ARRAY['accountant', 'driver', 'lifeguards', 'seller'] LOOP
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_trigger WHERE tgname = entity || '_assigned' AND NOT tgisinternal
+        ) THEN
+            EXECUTE format(
+                'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_roles '
+                'FOR EACH STATEMENT EXECUTE FUNCTION mark_workers_assigned()',
+                entity || '_assigned', entity
+            );
+        END IF;
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_trigger WHERE tgname = entity || '_freed' AND NOT tgisinternal
+        ) THEN
+            EXECUTE format(
+                'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_roles '
+                'FOR EACH STATEMENT EXECUTE FUNCTION mark_workers_free()',
+                entity || '_freed', entity
+            );
+        END IF;
+    END LOOP;
+END
+$$;
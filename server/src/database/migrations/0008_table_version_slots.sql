@@ -0,0 +1,30 @@
+-- Счётчики версий таблиц без общей блокировки на запись.
+-- Раньше каждая изменяющая команда обновляла одну строку table_versions на таблицу,
+-- и строка оставалась заблокированной до коммита: все пишущие транзакции таблицы
+-- (COPY массовых вставок, занятие сотрудников) выстраивались в очередь. Теперь у
+-- каждого серверного процесса своя строка (backend_pid), и параллельные соединения
+-- не ждут друг друга; версия таблицы - сумма её строк. Сумма меняется только при
+-- коммите, поэтому версия не опережает видимые данные (в отличие от nextval).
+-- Строки завершившихся процессов сворачивает в строку backend_pid = 0
+-- задача планировщика fold_table_versions (FOLD_TABLE_VERSIONS).
+
+ALTER TABLE table_versions ADD COLUMN IF NOT EXISTS backend_pid INT NOT NULL DEFAULT 0;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'table_versions_slot_pkey'
+    ) THEN
+        ALTER TABLE table_versions DROP CONSTRAINT table_versions_pkey;
+        ALTER TABLE table_versions ADD CONSTRAINT table_versions_slot_pkey PRIMARY KEY (table_name, backend_pid);
+    END IF;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_versions (table_name, backend_pid, version) VALUES (TG_TABLE_NAME, pg_backend_pid(), 1)
+    ON CONFLICT (table_name, backend_pid) DO UPDATE SET version = table_versions.version + 1;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
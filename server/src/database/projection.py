@@ -0,0 +1,52 @@
+"""Сужение списка столбцов запросов из requests.py (?fields= в списках).
+
+Запрос вида SELECT * FROM ... или SELECT a.x, b.y AS z FROM ... переписывается
+так, чтобы в нём остались только нужные столбцы: меньше чтения, разбора в asyncpg
+и сериализации для широких таблиц. Имена столбцов берутся из полей модели ответа,
+поэтому в текст SQL попадают только заранее известные идентификаторы.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Sequence, Tuple
+from server.src.database.statements import registry
+
+SELECT_LIST = re.compile(r"^\s*SELECT\s+(?P<columns>.+?)\s+FROM\s", re.IGNORECASE | re.DOTALL)
+
+ALIAS = re.compile(r"\s+AS\s+", re.IGNORECASE)
+
+
+def output_name(item: str) -> str:
+    """Имя столбца результата для элемента списка SELECT (алиас или имя без таблицы)"""
+    parts = ALIAS.split(item)
+    if len(parts) == 2:
+        return parts[1].strip()
+    return item.strip().rsplit(".", 1)[-1]
+
+
+def select_items(columns: str) -> Dict[str, str]:
+    return {output_name(item): " ".join(item.split()) for item in columns.split(",")}
+
+
+@lru_cache(maxsize=1024)
+def narrowed(query: str, columns: Tuple[str, ...]) -> str:
+    match = SELECT_LIST.match(query)
+    if match is None:
+        raise ValueError("Query has no SELECT list to narrow")
+    select_list = match.group("columns").strip()
+    if select_list == "*":
+        items = list(columns)
+    else:
+        available = select_items(select_list)
+        missing = [name for name in columns if name not in available]
+        if missing:
+            raise ValueError(f"Query does not select {', '.join(missing)}")
+        items = [available[name] for name in columns]
+    result = query[:match.start("columns")] + ", ".join(items) + query[match.end("columns"):]
+    # Статистика реестра - под именем исходного запроса
+    registry.alias(result, query)
+    return result
+
+
+def narrow_select(query: str, columns: Sequence[str]) -> str:
+    """Тот же запрос, но только со столбцами columns (результат кэшируется)"""
+    return narrowed(query, tuple(columns))
@@ -0,0 +1,98 @@
+"""Отчёты с группировкой на стороне БД.
+
+Каждый отчёт считается запросом REPORT_* по исходной таблице или, при
+REPORTS_MATERIALIZED, читается из материализованного представления. Задача
+планировщика refresh_report_views пересчитывает представление целиком
+(REFRESH MATERIALIZED VIEW CONCURRENTLY); инкрементального обновления нет -
+экономия только в том, что представления неизменившихся таблиц (по счётчику
+table_versions) не пересчитываются.
+"""
+from datetime import datetime
+from typing import NamedTuple, Optional
+from server.src.config import settings
+from server.src.database.db import db
+from server.src.database.requests import (
+    GET_REPORT_REFRESH,
+    REPORT_ADMISSIONS_BY_MONTH,
+    REPORT_ADMISSIONS_BY_MONTH_VIEW,
+    REPORT_EXPANSES_BY_TYPE,
+    REPORT_EXPANSES_BY_TYPE_VIEW,
+    REPORT_PAYROLL_BY_DIRECTOR,
+    REPORT_PAYROLL_BY_DIRECTOR_VIEW,
+    REPORT_PAYROLL_BY_POST,
+    REPORT_PAYROLL_BY_POST_VIEW,
+    REPORT_STOCK_BY_MARK,
+    REPORT_STOCK_BY_MARK_VIEW,
+    REPORT_STOCK_BY_MODEL,
+    REPORT_STOCK_BY_MODEL_VIEW,
+    REPORT_STOCK_BY_YEAR,
+    REPORT_STOCK_BY_YEAR_VIEW,
+    SET_REPORT_REFRESH
+)
+from server.src.database.versions import get_table_version
+
+
+class Report(NamedTuple):
+    name: str
+    table: str
+    query: str
+    view: str
+    view_query: str
+
+
+class ReportSource(NamedTuple):
+    """Откуда читать отчёт сейчас и какой версии данных он соответствует"""
+    query: str
+    version: int
+    refreshed_at: Optional[datetime]
+
+
+REPORTS = {
+    report.name: report
+    for report in (
+        Report("expanses_by_type", "expanse_journal", REPORT_EXPANSES_BY_TYPE,
+               "report_expanses_by_type", REPORT_EXPANSES_BY_TYPE_VIEW),
+        Report("payroll_by_post", "workers", REPORT_PAYROLL_BY_POST,
+               "report_payroll_by_post", REPORT_PAYROLL_BY_POST_VIEW),
+        Report("payroll_by_director", "workers", REPORT_PAYROLL_BY_DIRECTOR,
+               "report_payroll_by_director", REPORT_PAYROLL_BY_DIRECTOR_VIEW),
+        Report("stock_by_mark", "car", REPORT_STOCK_BY_MARK,
+               "report_stock_by_mark", REPORT_STOCK_BY_MARK_VIEW),
+        Report("stock_by_model", "car", REPORT_STOCK_BY_MODEL,
+               "report_stock_by_model", REPORT_STOCK_BY_MODEL_VIEW),
+        Report("stock_by_year", "car", REPORT_STOCK_BY_YEAR,
+               "report_stock_by_year", REPORT_STOCK_BY_YEAR_VIEW),
+        Report("admissions_by_month", "admission_journal", REPORT_ADMISSIONS_BY_MONTH,
+               "report_admissions_by_month", REPORT_ADMISSIONS_BY_MONTH_VIEW),
+    )
+}
+
+
+async def report_source(report: Report) -> ReportSource:
+    """Представление, если оно включено и уже заполнено, иначе запрос по таблице"""
+    if settings.REPORTS_MATERIALIZED:
+        record = await db.fetch_one(GET_REPORT_REFRESH, report.view)
+        if record is not None:
+            return ReportSource(report.view_query, record["source_version"], record["refreshed_at"])
+    return ReportSource(report.query, await get_table_version(report.table), None)
+
+
+async def refresh_report_views() -> int:
+    """Полный пересчёт представлений изменившихся таблиц (возвращает число обновлённых).
+
+    Версия читается до REFRESH: запись, попавшая между ними, приведёт лишь
+    к повторному обновлению в следующий раз.
+    """
+    refreshed = 0
+    for report in REPORTS.values():
+        version = await get_table_version(report.table)
+        record = await db.fetch_one(GET_REPORT_REFRESH, report.view)
+        if record is not None and record["source_version"] == version:
+            continue
+        # CONCURRENTLY не блокирует чтение, но требует уже заполненного представления
+        concurrently = "CONCURRENTLY " if record is not None else ""
+        async with db.transaction():
+            await db.execute(f"REFRESH MATERIALIZED VIEW {concurrently}{report.view}")
+            await db.execute(SET_REPORT_REFRESH, report.view, version)
+        refreshed += 1
+    return refreshed
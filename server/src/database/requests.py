@@ -1,25 +1,69 @@
 # Бухгалтер
 
+# Занимает до $1 свободных сотрудников в транзакции массовой вставки (claim_workers):
+# блокировки держатся до COPY, параллельные загрузки их пропускают
 GET_AVAILABLE_ACCOUNTANTS = """
-    SELECT w.worker_id 
+    SELECT w.worker_id
     FROM workers w
     WHERE w.post = 'Бухгалтер'
-    AND NOT EXISTS (
-        SELECT 1 FROM accountant a 
-        WHERE a.worker_id = w.worker_id
-    )
+    AND NOT w.assigned
+    ORDER BY w.worker_id
+    LIMIT $1
+    FOR UPDATE OF w SKIP LOCKED
 """
 
+# Атомарно занимает свободного сотрудника: SKIP LOCKED пропускает строки,
+# уже выбранные параллельными транзакциями, частичный индекс workers_unassigned_idx
+# содержит только свободных сотрудников (признак assigned, миграция 0007),
+# ORDER BY по нему берёт первого свободного без прохода по занятым
 CREATE_ACCOUNTANT = """
     INSERT INTO accountant (worker_id, qual, kit, id_number)
-    VALUES ($1, $2, $3, $4)
-    RETURNING *
+    SELECT w.worker_id, $1, $2, $3
+    FROM workers w
+    WHERE w.post = 'Бухгалтер'
+    AND NOT w.assigned
+    ORDER BY w.worker_id
+    LIMIT 1
+    FOR UPDATE OF w SKIP LOCKED
+    RETURNING *;
 """
 
 GET_ALL_ACCOUNTANTS = "SELECT * FROM accountant;"
 
 GET_ACCOUNTANT = "SELECT * FROM accountant WHERE worker_id = $1;"
 
+# Бухгалтеры с полями сотрудника и поставки (?expand=worker,admission)
+GET_ALL_ACCOUNTANTS_EXPANDED = """
+    SELECT
+        a.worker_id, a.qual, a.kit, a.id_number,
+        w.surname AS worker_surname,
+        w.firstname AS worker_firstname,
+        w.lastname AS worker_lastname,
+        w.post AS worker_post,
+        aj.admission_date,
+        aj.mark AS admission_mark,
+        aj.model AS admission_model
+    FROM accountant a
+    JOIN workers w ON w.worker_id = a.worker_id
+    LEFT JOIN admission_journal aj ON aj.id_number = a.id_number
+"""
+
+GET_ACCOUNTANT_EXPANDED = """
+    SELECT
+        a.worker_id, a.qual, a.kit, a.id_number,
+        w.surname AS worker_surname,
+        w.firstname AS worker_firstname,
+        w.lastname AS worker_lastname,
+        w.post AS worker_post,
+        aj.admission_date,
+        aj.mark AS admission_mark,
+        aj.model AS admission_model
+    FROM accountant a
+    JOIN workers w ON w.worker_id = a.worker_id
+    LEFT JOIN admission_journal aj ON aj.id_number = a.id_number
+    WHERE a.worker_id = $1;
+"""
+
 UPDATE_ACCOUNTANT = """
     UPDATE accountant SET 
         qual = $1,
@@ -31,6 +75,10 @@ UPDATE_ACCOUNTANT = """
 
 DELETE_ACCOUNTANT = "DELETE FROM accountant WHERE worker_id = $1 RETURNING worker_id;"
 
+GET_ACCOUNTANTS_FOR_UPDATE = "SELECT * FROM accountant WHERE worker_id = ANY($1) FOR UPDATE;"
+
+DELETE_ACCOUNTANTS = "DELETE FROM accountant WHERE worker_id = ANY($1) RETURNING worker_id;"
+
 
 # Журнал поставок
 
@@ -45,6 +93,30 @@ CREATE_ADMISSION = """
 
 GET_ALL_ADMISSIONS = "SELECT * FROM admission_journal"
 
+# Перенос пачки поставок в car одним запросом: SKIP LOCKED разводит параллельные
+# запуски, отметка number_vin фиксируется вместе со вставкой автомобилей
+CONVERT_ADMISSIONS = """
+    WITH batch AS (
+        SELECT id_number FROM admission_journal
+        WHERE number_vin IS NULL
+        ORDER BY id_number
+        LIMIT $1
+        FOR UPDATE SKIP LOCKED
+    ), allocated AS (
+        SELECT id_number, car_vin(nextval('car_vin_seq')) AS number_vin FROM batch
+    ), marked AS (
+        UPDATE admission_journal SET number_vin = allocated.number_vin
+        FROM allocated
+        WHERE admission_journal.id_number = allocated.id_number
+        RETURNING admission_journal.*
+    )
+    INSERT INTO car (number_vin, complectation, color, mark, model, year_create)
+    SELECT number_vin, complectation, color, mark, model, year_create FROM marked
+    RETURNING number_vin;
+"""
+
+COUNT_PENDING_ADMISSIONS = "SELECT count(*) FROM admission_journal WHERE number_vin IS NULL;"
+
 GET_ADMISSION = "SELECT * FROM admission_journal WHERE id_number = $1;"
 
 UPDATE_ADMISSION = """
@@ -61,20 +133,65 @@ UPDATE_ADMISSION = """
 
 DELETE_ADMISSION = "DELETE FROM admission_journal WHERE id_number = $1 RETURNING id_number;"
 
+GET_ADMISSIONS_FOR_UPDATE = "SELECT * FROM admission_journal WHERE id_number = ANY($1) FOR UPDATE;"
+
+DELETE_ADMISSIONS = "DELETE FROM admission_journal WHERE id_number = ANY($1) RETURNING id_number;"
+
 
 # Автомобиль
 
+# VIN выдаёт значение по умолчанию из car_vin_seq (миграция 0006_inventory_pipeline)
 CREATE_CAR = """
-    INSERT INTO car (number_vin, complectation, color, mark, model, year_create, app_number) 
+    INSERT INTO car (complectation, color, mark, model, year_create, app_number) 
     VALUES (
-        $1, $2, $3, $4, $5, $6, $7
+        $1, $2, $3, $4, $5, $6
     ) RETURNING *;
 """
 
 GET_ALL_CARS = "SELECT * FROM car"
 
+# Страница автомобилей по ключу number_vin (keyset-пагинация)
+GET_CARS_PAGE = """
+    SELECT * FROM car
+    WHERE number_vin > $1
+    AND ($2::text IS NULL OR mark ILIKE $2 OR model ILIKE $2)
+    ORDER BY number_vin
+    LIMIT $3;
+"""
+
+COUNT_CARS = """
+    SELECT count(*) FROM car
+    WHERE ($1::text IS NULL OR mark ILIKE $1 OR model ILIKE $1);
+"""
+
 GET_CAR = "SELECT * FROM car WHERE number_vin = $1;"
 
+# Страница автомобилей с полями клиента (?expand=client), условия - как в GET_CARS_PAGE
+GET_CARS_PAGE_EXPANDED = """
+    SELECT
+        c.number_vin, c.complectation, c.color, c.mark, c.model, c.year_create, c.app_number,
+        cl.budget AS client_budget,
+        cl.current_car AS client_current_car,
+        cl.prefer_car AS client_prefer_car
+    FROM car c
+    LEFT JOIN client cl ON cl.app_number = c.app_number
+    WHERE c.number_vin > $1
+    AND ($2::text IS NULL OR c.mark ILIKE $2 OR c.model ILIKE $2)
+    ORDER BY c.number_vin
+    LIMIT $3;
+"""
+
+GET_CAR_EXPANDED = """
+    SELECT
+        c.number_vin, c.complectation, c.color, c.mark, c.model, c.year_create, c.app_number,
+        cl.budget AS client_budget,
+        cl.current_car AS client_current_car,
+        cl.prefer_car AS client_prefer_car
+    FROM car c
+    LEFT JOIN client cl ON cl.app_number = c.app_number
+    WHERE c.number_vin = $1;
+"""
+
 UPDATE_CAR = """
     UPDATE car SET 
         complectation = $1,
@@ -89,6 +206,10 @@ UPDATE_CAR = """
 
 DELETE_CAR = "DELETE FROM car WHERE number_vin = $1 RETURNING number_vin;"
 
+GET_CARS_FOR_UPDATE = "SELECT * FROM car WHERE number_vin = ANY($1) FOR UPDATE;"
+
+DELETE_CARS = "DELETE FROM car WHERE number_vin = ANY($1) RETURNING number_vin;"
+
 
 # Клиент
 
@@ -113,6 +234,10 @@ UPDATE_CLIENT = """
 
 DELETE_CLIENT = "DELETE FROM client WHERE app_number = $1 RETURNING app_number;"
 
+GET_CLIENTS_FOR_UPDATE = "SELECT * FROM client WHERE app_number = ANY($1) FOR UPDATE;"
+
+DELETE_CLIENTS = "DELETE FROM client WHERE app_number = ANY($1) RETURNING app_number;"
+
 
 # Компания
 
@@ -134,6 +259,10 @@ UPDATE_COMPANY = """
 
 DELETE_COMPANY = "DELETE FROM company WHERE inn = $1 RETURNING inn;"
 
+GET_COMPANIES_FOR_UPDATE = "SELECT * FROM company WHERE inn = ANY($1) FOR UPDATE;"
+
+DELETE_COMPANIES = "DELETE FROM company WHERE inn = ANY($1) RETURNING inn;"
+
 
 # Директор
 
@@ -148,6 +277,26 @@ GET_ALL_DIRECTORS = "SELECT * FROM director"
 
 GET_DIRECTOR = "SELECT * FROM director WHERE inn = $1;"
 
+# Директора с полями компании (?expand=company)
+GET_ALL_DIRECTORS_EXPANDED = """
+    SELECT
+        d.inn, d.profit, d.surname, d.firstname, d.lastname, d.inn_company,
+        co.name_company AS company_name,
+        co.address AS company_address
+    FROM director d
+    LEFT JOIN company co ON co.inn = d.inn_company
+"""
+
+GET_DIRECTOR_EXPANDED = """
+    SELECT
+        d.inn, d.profit, d.surname, d.firstname, d.lastname, d.inn_company,
+        co.name_company AS company_name,
+        co.address AS company_address
+    FROM director d
+    LEFT JOIN company co ON co.inn = d.inn_company
+    WHERE d.inn = $1;
+"""
+
 UPDATE_DIRECTOR = """
     UPDATE director SET 
         profit = $1,
@@ -161,29 +310,77 @@ UPDATE_DIRECTOR = """
 
 DELETE_DIRECTOR = "DELETE FROM director WHERE inn = $1 RETURNING inn;"
 
+GET_DIRECTORS_FOR_UPDATE = "SELECT * FROM director WHERE inn = ANY($1) FOR UPDATE;"
+
+DELETE_DIRECTORS = "DELETE FROM director WHERE inn = ANY($1) RETURNING inn;"
+
 
 # Водитель
 
+# Занимает до $1 свободных сотрудников в транзакции массовой вставки (claim_workers):
+# блокировки держатся до COPY, параллельные загрузки их пропускают
 GET_AVAILABLE_DRIVERS = """
-    SELECT w.worker_id 
+    SELECT w.worker_id
     FROM workers w
     WHERE w.post = 'Водитель'
-    AND NOT EXISTS (
-        SELECT 1 FROM driver d 
-        WHERE d.worker_id = w.worker_id
-    )
+    AND NOT w.assigned
+    ORDER BY w.worker_id
+    LIMIT $1
+    FOR UPDATE OF w SKIP LOCKED
 """
 
+# Атомарно занимает свободного сотрудника: SKIP LOCKED пропускает строки,
+# уже выбранные параллельными транзакциями, частичный индекс workers_unassigned_idx
+# содержит только свободных сотрудников (признак assigned, миграция 0007),
+# ORDER BY по нему берёт первого свободного без прохода по занятым
 CREATE_DRIVER = """
     INSERT INTO driver (worker_id, car_number, snacks, number_vin)
-    VALUES ($1, $2, $3, $4)
-    RETURNING *
+    SELECT w.worker_id, $1, $2, $3
+    FROM workers w
+    WHERE w.post = 'Водитель'
+    AND NOT w.assigned
+    ORDER BY w.worker_id
+    LIMIT 1
+    FOR UPDATE OF w SKIP LOCKED
+    RETURNING *;
 """
 
 GET_ALL_DRIVERS = "SELECT * FROM driver;"
 
 GET_DRIVER = "SELECT * FROM driver WHERE worker_id = $1;"
 
+# Водители с полями сотрудника и автомобиля (?expand=worker,car)
+GET_ALL_DRIVERS_EXPANDED = """
+    SELECT
+        dr.worker_id, dr.car_number, dr.snacks, dr.number_vin,
+        w.surname AS worker_surname,
+        w.firstname AS worker_firstname,
+        w.lastname AS worker_lastname,
+        w.post AS worker_post,
+        c.mark AS car_mark,
+        c.model AS car_model,
+        c.color AS car_color
+    FROM driver dr
+    JOIN workers w ON w.worker_id = dr.worker_id
+    LEFT JOIN car c ON c.number_vin = dr.number_vin
+"""
+
+GET_DRIVER_EXPANDED = """
+    SELECT
+        dr.worker_id, dr.car_number, dr.snacks, dr.number_vin,
+        w.surname AS worker_surname,
+        w.firstname AS worker_firstname,
+        w.lastname AS worker_lastname,
+        w.post AS worker_post,
+        c.mark AS car_mark,
+        c.model AS car_model,
+        c.color AS car_color
+    FROM driver dr
+    JOIN workers w ON w.worker_id = dr.worker_id
+    LEFT JOIN car c ON c.number_vin = dr.number_vin
+    WHERE dr.worker_id = $1;
+"""
+
 UPDATE_DRIVER = """
     UPDATE driver SET 
         car_number = $1,
@@ -195,6 +392,10 @@ UPDATE_DRIVER = """
 
 DELETE_DRIVER = "DELETE FROM driver WHERE worker_id = $1 RETURNING worker_id;"
 
+GET_DRIVERS_FOR_UPDATE = "SELECT * FROM driver WHERE worker_id = ANY($1) FOR UPDATE;"
+
+DELETE_DRIVERS = "DELETE FROM driver WHERE worker_id = ANY($1) RETURNING worker_id;"
+
 
 # Журнал расходов
 
@@ -219,29 +420,69 @@ UPDATE_EXPANSE = """
 
 DELETE_EXPANSE = "DELETE FROM expanse_journal WHERE id_expanse = $1 RETURNING id_expanse;"
 
+GET_EXPANSES_FOR_UPDATE = "SELECT * FROM expanse_journal WHERE id_expanse = ANY($1) FOR UPDATE;"
+
+DELETE_EXPANSES = "DELETE FROM expanse_journal WHERE id_expanse = ANY($1) RETURNING id_expanse;"
+
 
 # Охрана
 
+# Занимает до $1 свободных сотрудников в транзакции массовой вставки (claim_workers):
+# блокировки держатся до COPY, параллельные загрузки их пропускают
 GET_AVAILABLE_LIFEGUARDS = """
-    SELECT w.worker_id 
+    SELECT w.worker_id
     FROM workers w
     WHERE w.post = 'Охранник'
-    AND NOT EXISTS (
-        SELECT 1 FROM lifeguards l 
-        WHERE l.worker_id = w.worker_id
-    )
+    AND NOT w.assigned
+    ORDER BY w.worker_id
+    LIMIT $1
+    FOR UPDATE OF w SKIP LOCKED
 """
 
+# Атомарно занимает свободного сотрудника: SKIP LOCKED пропускает строки,
+# уже выбранные параллельными транзакциями, частичный индекс workers_unassigned_idx
+# содержит только свободных сотрудников (признак assigned, миграция 0007),
+# ORDER BY по нему берёт первого свободного без прохода по занятым
 CREATE_LIFEGUARD = """
     INSERT INTO lifeguards (worker_id, uniform, kit, security_zone)
-    VALUES ($1, $2, $3, $4)
-    RETURNING *
+    SELECT w.worker_id, $1, $2, $3
+    FROM workers w
+    WHERE w.post = 'Охранник'
+    AND NOT w.assigned
+    ORDER BY w.worker_id
+    LIMIT 1
+    FOR UPDATE OF w SKIP LOCKED
+    RETURNING *;
 """
 
 GET_ALL_LIFEGUARDS = "SELECT * FROM lifeguards;"
 
 GET_LIFEGUARD = "SELECT * FROM lifeguards WHERE worker_id = $1;"
 
+# Охранники с полями сотрудника (?expand=worker)
+GET_ALL_LIFEGUARDS_EXPANDED = """
+    SELECT
+        l.worker_id, l.uniform, l.kit, l.security_zone,
+        w.surname AS worker_surname,
+        w.firstname AS worker_firstname,
+        w.lastname AS worker_lastname,
+        w.post AS worker_post
+    FROM lifeguards l
+    JOIN workers w ON w.worker_id = l.worker_id
+"""
+
+GET_LIFEGUARD_EXPANDED = """
+    SELECT
+        l.worker_id, l.uniform, l.kit, l.security_zone,
+        w.surname AS worker_surname,
+        w.firstname AS worker_firstname,
+        w.lastname AS worker_lastname,
+        w.post AS worker_post
+    FROM lifeguards l
+    JOIN workers w ON w.worker_id = l.worker_id
+    WHERE l.worker_id = $1;
+"""
+
 UPDATE_LIFEGUARD = """
     UPDATE lifeguards SET 
         uniform = $1,
@@ -253,29 +494,77 @@ UPDATE_LIFEGUARD = """
 
 DELETE_LIFEGUARD = "DELETE FROM lifeguards WHERE worker_id = $1 RETURNING worker_id;"
 
+GET_LIFEGUARDS_FOR_UPDATE = "SELECT * FROM lifeguards WHERE worker_id = ANY($1) FOR UPDATE;"
+
+DELETE_LIFEGUARDS = "DELETE FROM lifeguards WHERE worker_id = ANY($1) RETURNING worker_id;"
+
 
 # Продавцы
 
+# Занимает до $1 свободных сотрудников в транзакции массовой вставки (claim_workers):
+# блокировки держатся до COPY, параллельные загрузки их пропускают
 GET_AVAILABLE_SELLERS = """
-    SELECT w.worker_id 
+    SELECT w.worker_id
     FROM workers w
     WHERE w.post = 'Продавец'
-    AND NOT EXISTS (
-        SELECT 1 FROM seller s 
-        WHERE s.worker_id = w.worker_id
-    )
+    AND NOT w.assigned
+    ORDER BY w.worker_id
+    LIMIT $1
+    FOR UPDATE OF w SKIP LOCKED
 """
 
+# Атомарно занимает свободного сотрудника: SKIP LOCKED пропускает строки,
+# уже выбранные параллельными транзакциями, частичный индекс workers_unassigned_idx
+# содержит только свободных сотрудников (признак assigned, миграция 0007),
+# ORDER BY по нему берёт первого свободного без прохода по занятым
 CREATE_SELLER = """
     INSERT INTO seller (worker_id, seller_type, app_number)
-    VALUES ($1, $2, $3)
-    RETURNING *
+    SELECT w.worker_id, $1, $2
+    FROM workers w
+    WHERE w.post = 'Продавец'
+    AND NOT w.assigned
+    ORDER BY w.worker_id
+    LIMIT 1
+    FOR UPDATE OF w SKIP LOCKED
+    RETURNING *;
 """
 
 GET_ALL_SELLERS = "SELECT * FROM seller;"
 
 GET_SELLER = "SELECT * FROM seller WHERE worker_id = $1;"
 
+# Продавцы с полями сотрудника и клиента (?expand=worker,client)
+GET_ALL_SELLERS_EXPANDED = """
+    SELECT
+        s.worker_id, s.seller_type, s.app_number,
+        w.surname AS worker_surname,
+        w.firstname AS worker_firstname,
+        w.lastname AS worker_lastname,
+        w.post AS worker_post,
+        cl.budget AS client_budget,
+        cl.current_car AS client_current_car,
+        cl.prefer_car AS client_prefer_car
+    FROM seller s
+    JOIN workers w ON w.worker_id = s.worker_id
+    LEFT JOIN client cl ON cl.app_number = s.app_number
+"""
+
+GET_SELLER_EXPANDED = """
+    SELECT
+        s.worker_id, s.seller_type, s.app_number,
+        w.surname AS worker_surname,
+        w.firstname AS worker_firstname,
+        w.lastname AS worker_lastname,
+        w.post AS worker_post,
+        cl.budget AS client_budget,
+        cl.current_car AS client_current_car,
+        cl.prefer_car AS client_prefer_car
+    FROM seller s
+    JOIN workers w ON w.worker_id = s.worker_id
+    LEFT JOIN client cl ON cl.app_number = s.app_number
+    WHERE s.worker_id = $1;
+"""
+
 UPDATE_SELLER = """
     UPDATE seller SET 
         seller_type = $1,
@@ -286,6 +575,10 @@ UPDATE_SELLER = """
 
 DELETE_SELLER = "DELETE FROM seller WHERE worker_id = $1 RETURNING worker_id;"
 
+GET_SELLERS_FOR_UPDATE = "SELECT * FROM seller WHERE worker_id = ANY($1) FOR UPDATE;"
+
+DELETE_SELLERS = "DELETE FROM seller WHERE worker_id = ANY($1) RETURNING worker_id;"
+
 
 # Сотрудники
 
@@ -295,12 +588,39 @@ CREATE_WORKER = """
         lastname, phone_number, address, id_expanse, inn_director
     ) VALUES (
         $1, $2, $3, $4, $5, $6, $7, $8, $9, $10
-    ) RETURNING *;
+    ) RETURNING worker_id, salary, post, experience, surname, firstname,
+        lastname, phone_number, address, id_expanse, inn_director;
+"""
+
+GET_ALL_WORKERS = """
+    SELECT worker_id, salary, post, experience, surname, firstname,
+        lastname, phone_number, address, id_expanse, inn_director
+    FROM workers
+"""
+
+# Страница сотрудников по ключу worker_id (keyset-пагинация)
+GET_WORKERS_PAGE = """
+    SELECT worker_id, salary, post, experience, surname, firstname,
+        lastname, phone_number, address, id_expanse, inn_director
+    FROM workers
+    WHERE worker_id > $1
+    AND ($2::text IS NULL OR concat_ws(' ', surname, firstname, lastname) ILIKE $2)
+    AND ($3::text IS NULL OR post = $3)
+    ORDER BY worker_id
+    LIMIT $4;
 """
 
-GET_ALL_WORKERS = "SELECT * FROM workers"
+COUNT_WORKERS = """
+    SELECT count(*) FROM workers
+    WHERE ($1::text IS NULL OR concat_ws(' ', surname, firstname, lastname) ILIKE $1)
+    AND ($2::text IS NULL OR post = $2);
+"""
 
-GET_WORKER = "SELECT * FROM workers WHERE worker_id = $1;"
+GET_WORKER = """
+    SELECT worker_id, salary, post, experience, surname, firstname,
+        lastname, phone_number, address, id_expanse, inn_director
+    FROM workers WHERE worker_id = $1;
+"""
 
 UPDATE_WORKER = """
     UPDATE workers SET 
@@ -315,52 +635,302 @@ UPDATE_WORKER = """
         id_expanse = $9,
         inn_director = $10
     WHERE worker_id = $11
-    RETURNING *;
+    RETURNING worker_id, salary, post, experience, surname, firstname,
+        lastname, phone_number, address, id_expanse, inn_director;
 """
 
 DELETE_WORKER = "DELETE FROM workers WHERE worker_id = $1 RETURNING worker_id;"
 
+GET_WORKERS_FOR_UPDATE = """
+    SELECT worker_id, salary, post, experience, surname, firstname,
+        lastname, phone_number, address, id_expanse, inn_director
+    FROM workers WHERE worker_id = ANY($1) FOR UPDATE;
+"""
+
+DELETE_WORKERS = "DELETE FROM workers WHERE worker_id = ANY($1) RETURNING worker_id;"
+
 
 # Дополнительно
 
-# Получение случайного номер поставки таблицы admission_journal
-GET_RANDOM_ID_NUMBER = """
-    SELECT id_number FROM admission_journal 
-    ORDER BY RANDOM() 
-    LIMIT 1
+# Ключи таблиц-справочников для пула внешних ключей (server/src/database/key_pool.py)
+GET_ADMISSION_KEYS = "SELECT id_number FROM admission_journal"
+
+GET_CAR_KEYS = "SELECT number_vin FROM car"
+
+GET_CLIENT_KEYS = "SELECT app_number FROM client"
+
+GET_COMPANY_KEYS = "SELECT inn FROM company"
+
+GET_DIRECTOR_KEYS = "SELECT inn FROM director"
+
+GET_EXPANSE_KEYS = "SELECT id_expanse FROM expanse_journal"
+
+# Версии для условных GET-запросов (server/src/routes/conditional.py): у каждого
+# серверного процесса своя строка счётчика (миграция 0008), версия - их сумма
+GET_TABLE_VERSION = """
+    SELECT coalesce(sum(version), 0)::bigint AS version
+    FROM table_versions WHERE table_name = $1;
 """
 
-# Получение случайного VIN-номер таблицы car
-GET_RANDOM_NUMBER_VIN = """
-    SELECT number_vin FROM car 
-    ORDER BY RANDOM() 
-    LIMIT 1
+# Версии нескольких таблиц: развёрнутые ответы зависят и от связанных таблиц
+GET_TABLE_VERSIONS = """
+    SELECT table_name, sum(version)::bigint AS version
+    FROM table_versions WHERE table_name = ANY($1)
+    GROUP BY table_name;
 """
 
-# Получение случайной заявки клиент таблицы client
-GET_RANDOM_APP_NUMBER = """
-    SELECT app_number FROM client 
-    ORDER BY RANDOM() 
-    LIMIT 1
+# Сворачивает строки счётчиков завершившихся процессов в строку backend_pid = 0;
+# сумма по таблице при этом не меняется
+FOLD_TABLE_VERSIONS = """
+    WITH finished AS (
+        DELETE FROM table_versions v
+        WHERE v.backend_pid <> 0
+        AND NOT EXISTS (SELECT 1 FROM pg_stat_activity a WHERE a.pid = v.backend_pid)
+        RETURNING table_name, version
+    )
+    INSERT INTO table_versions (table_name, backend_pid, version)
+    SELECT table_name, 0, sum(version) FROM finished GROUP BY table_name
+    ON CONFLICT (table_name, backend_pid) DO UPDATE SET version = table_versions.version + excluded.version;
 """
 
-# Получение случайного ИНН компании таблицы company
-GET_RANDOM_INN = """
-    SELECT inn FROM company 
-    ORDER BY RANDOM() 
-    LIMIT 1
+GET_ACCOUNTANT_VERSION = "SELECT xmin::text FROM accountant WHERE worker_id = $1;"
+
+GET_ADMISSION_VERSION = "SELECT xmin::text FROM admission_journal WHERE id_number = $1;"
+
+GET_CAR_VERSION = "SELECT xmin::text FROM car WHERE number_vin = $1;"
+
+GET_CLIENT_VERSION = "SELECT xmin::text FROM client WHERE app_number = $1;"
+
+GET_COMPANY_VERSION = "SELECT xmin::text FROM company WHERE inn = $1;"
+
+GET_DIRECTOR_VERSION = "SELECT xmin::text FROM director WHERE inn = $1;"
+
+GET_DRIVER_VERSION = "SELECT xmin::text FROM driver WHERE worker_id = $1;"
+
+GET_EXPANSE_VERSION = "SELECT xmin::text FROM expanse_journal WHERE id_expanse = $1;"
+
+GET_LIFEGUARD_VERSION = "SELECT xmin::text FROM lifeguards WHERE worker_id = $1;"
+
+GET_SELLER_VERSION = "SELECT xmin::text FROM seller WHERE worker_id = $1;"
+
+GET_WORKER_VERSION = "SELECT xmin::text FROM workers WHERE worker_id = $1;"
+
+# Поиск (server/src/routes/search.py, индексы - миграция 0004_search).
+# $1 - tsquery с префиксами, $4 - тот же запрос только по главным полям (вес A:
+# ФИО сотрудника, VIN, марка и модель автомобиля). Кандидаты ограничены $3 до
+# ранжирования, чтобы короткий префикс на большой таблице не ранжировал все
+# совпавшие строки; места среди кандидатов сначала отдаются совпадениям по главным
+# полям, у которых ранг выше, а остальные совпадения добирают оставшиеся. Если
+# совпадений по главным полям больше $3, ответ - лучшие из первых $3 найденных
+# индексом, а не из всех совпадений
+HAS_EXTENSION = "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = $1);"
+
+SEARCH_WORKERS = """
+    WITH named AS (
+        SELECT * FROM workers
+        WHERE worker_search_document(surname, firstname, lastname, post, address) @@ to_tsquery('simple', $4)
+        LIMIT $3
+    ), candidates AS (
+        SELECT * FROM named
+        UNION ALL
+        (
+            SELECT * FROM workers
+            WHERE worker_search_document(surname, firstname, lastname, post, address) @@ to_tsquery('simple', $1)
+            AND NOT worker_search_document(surname, firstname, lastname, post, address) @@ to_tsquery('simple', $4)
+            LIMIT greatest($3 - (SELECT count(*) FROM named), 0)
+        )
+    )
+    SELECT
+        worker_id, salary, post, experience, surname, firstname,
+        lastname, phone_number, address, id_expanse, inn_director,
+        ts_rank(worker_search_document(surname, firstname, lastname, post, address), to_tsquery('simple', $1)) AS rank
+    FROM candidates
+    ORDER BY rank DESC, worker_id
+    LIMIT $2;
 """
 
-# Получение случайного ИНН директора таблицы director
-GET_RANDOM_INN_DIRECTOR = """
-    SELECT inn FROM director 
-    ORDER BY RANDOM() 
-    LIMIT 1
+# То же с опечатками через pg_trgm: $5 - исходная строка поиска
+SEARCH_WORKERS_FUZZY = """
+    WITH named AS (
+        SELECT * FROM workers
+        WHERE worker_search_document(surname, firstname, lastname, post, address) @@ to_tsquery('simple', $4)
+        LIMIT $3
+    ), candidates AS (
+        SELECT * FROM named
+        UNION ALL
+        (
+            SELECT * FROM workers
+            WHERE (worker_search_document(surname, firstname, lastname, post, address) @@ to_tsquery('simple', $1)
+            OR $5 <% worker_search_text(surname, firstname, lastname, post, address))
+            AND NOT worker_search_document(surname, firstname, lastname, post, address) @@ to_tsquery('simple', $4)
+            LIMIT greatest($3 - (SELECT count(*) FROM named), 0)
+        )
+    )
+    SELECT
+        worker_id, salary, post, experience, surname, firstname,
+        lastname, phone_number, address, id_expanse, inn_director,
+        ts_rank(worker_search_document(surname, firstname, lastname, post, address), to_tsquery('simple', $1))
+        + word_similarity($5, worker_search_text(surname, firstname, lastname, post, address)) AS rank
+    FROM candidates
+    ORDER BY rank DESC, worker_id
+    LIMIT $2;
 """
 
-# Получение случайного номер расхода таблицы expanse_journal
-GET_RANDOM_ID_EXPANSE = """
-    SELECT id_expanse FROM expanse_journal 
-    ORDER BY RANDOM() 
-    LIMIT 1
-"""
\ No newline at end of file
+SEARCH_CARS = """
+    WITH named AS (
+        SELECT * FROM car
+        WHERE car_search_document(number_vin, mark, model, complectation, color) @@ to_tsquery('simple', $4)
+        LIMIT $3
+    ), candidates AS (
+        SELECT * FROM named
+        UNION ALL
+        (
+            SELECT * FROM car
+            WHERE car_search_document(number_vin, mark, model, complectation, color) @@ to_tsquery('simple', $1)
+            AND NOT car_search_document(number_vin, mark, model, complectation, color) @@ to_tsquery('simple', $4)
+            LIMIT greatest($3 - (SELECT count(*) FROM named), 0)
+        )
+    )
+    SELECT
+        number_vin, complectation, color, mark, model, year_create, app_number,
+        ts_rank(car_search_document(number_vin, mark, model, complectation, color), to_tsquery('simple', $1)) AS rank
+    FROM candidates
+    ORDER BY rank DESC, number_vin
+    LIMIT $2;
+"""
+
+SEARCH_CARS_FUZZY = """
+    WITH named AS (
+        SELECT * FROM car
+        WHERE car_search_document(number_vin, mark, model, complectation, color) @@ to_tsquery('simple', $4)
+        LIMIT $3
+    ), candidates AS (
+        SELECT * FROM named
+        UNION ALL
+        (
+            SELECT * FROM car
+            WHERE (car_search_document(number_vin, mark, model, complectation, color) @@ to_tsquery('simple', $1)
+            OR $5 <% car_search_text(number_vin, mark, model, complectation, color))
+            AND NOT car_search_document(number_vin, mark, model, complectation, color) @@ to_tsquery('simple', $4)
+            LIMIT greatest($3 - (SELECT count(*) FROM named), 0)
+        )
+    )
+    SELECT
+        number_vin, complectation, color, mark, model, year_create, app_number,
+        ts_rank(car_search_document(number_vin, mark, model, complectation, color), to_tsquery('simple', $1))
+        + word_similarity($5, car_search_text(number_vin, mark, model, complectation, color)) AS rank
+    FROM candidates
+    ORDER BY rank DESC, number_vin
+    LIMIT $2;
+"""
+
+# Отчёты (server/src/database/reports.py). REPORT_* считаются по таблицам,
+# REPORT_*_VIEW читают материализованные представления из миграции 0005_reports
+REPORT_EXPANSES_BY_TYPE = """
+    SELECT
+        expanse_type,
+        count(*) AS entries,
+        sum(expanse_sum) AS total,
+        avg(expanse_sum) AS average,
+        min(expanse_sum) AS minimum,
+        max(expanse_sum) AS maximum
+    FROM expanse_journal
+    GROUP BY expanse_type
+    ORDER BY total DESC;
+"""
+
+REPORT_EXPANSES_BY_TYPE_VIEW = "SELECT * FROM report_expanses_by_type ORDER BY total DESC;"
+
+REPORT_PAYROLL_BY_POST = """
+    SELECT
+        post,
+        count(*) AS workers,
+        sum(salary) AS payroll,
+        avg(salary) AS average_salary,
+        min(salary) AS min_salary,
+        max(salary) AS max_salary
+    FROM workers
+    GROUP BY post
+    ORDER BY payroll DESC;
+"""
+
+REPORT_PAYROLL_BY_POST_VIEW = "SELECT * FROM report_payroll_by_post ORDER BY payroll DESC;"
+
+REPORT_PAYROLL_BY_DIRECTOR = """
+    SELECT
+        inn_director,
+        count(*) AS workers,
+        sum(salary) AS payroll,
+        avg(salary) AS average_salary,
+        min(salary) AS min_salary,
+        max(salary) AS max_salary
+    FROM workers
+    GROUP BY inn_director
+    ORDER BY payroll DESC;
+"""
+
+REPORT_PAYROLL_BY_DIRECTOR_VIEW = "SELECT * FROM report_payroll_by_director ORDER BY payroll DESC;"
+
+REPORT_STOCK_BY_MARK = """
+    SELECT
+        mark,
+        count(*) AS cars,
+        count(*) FILTER (WHERE app_number IS NULL) AS available
+    FROM car
+    GROUP BY mark
+    ORDER BY cars DESC;
+"""
+
+REPORT_STOCK_BY_MARK_VIEW = "SELECT * FROM report_stock_by_mark ORDER BY cars DESC;"
+
+REPORT_STOCK_BY_MODEL = """
+    SELECT
+        mark,
+        model,
+        count(*) AS cars,
+        count(*) FILTER (WHERE app_number IS NULL) AS available
+    FROM car
+    GROUP BY mark, model
+    ORDER BY cars DESC;
+"""
+
+REPORT_STOCK_BY_MODEL_VIEW = "SELECT * FROM report_stock_by_model ORDER BY cars DESC;"
+
+REPORT_STOCK_BY_YEAR = """
+    SELECT
+        year_create,
+        count(*) AS cars,
+        count(*) FILTER (WHERE app_number IS NULL) AS available
+    FROM car
+    GROUP BY year_create
+    ORDER BY year_create;
+"""
+
+REPORT_STOCK_BY_YEAR_VIEW = "SELECT * FROM report_stock_by_year ORDER BY year_create;"
+
+# $1, $2 - первый и последний месяц (любая дата месяца), NULL - без ограничения
+REPORT_ADMISSIONS_BY_MONTH = """
+    SELECT
+        date_trunc('month', admission_date)::date AS month,
+        count(*) AS admissions
+    FROM admission_journal
+    WHERE ($1::date IS NULL OR admission_date >= date_trunc('month', $1::date))
+    AND ($2::date IS NULL OR admission_date < date_trunc('month', $2::date) + interval '1 month')
+    GROUP BY 1
+    ORDER BY 1;
+"""
+
+REPORT_ADMISSIONS_BY_MONTH_VIEW = """
+    SELECT * FROM report_admissions_by_month
+    WHERE ($1::date IS NULL OR month >= date_trunc('month', $1::date))
+    AND ($2::date IS NULL OR month <= date_trunc('month', $2::date))
+    ORDER BY month;
+"""
+
+GET_REPORT_REFRESH = "SELECT source_version, refreshed_at FROM report_refreshes WHERE view_name = $1;"
+
+SET_REPORT_REFRESH = """
+    INSERT INTO report_refreshes (view_name, source_version) VALUES ($1, $2)
+    ON CONFLICT (view_name) DO UPDATE
+    SET source_version = EXCLUDED.source_version, refreshed_at = now();
+"""
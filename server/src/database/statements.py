@@ -0,0 +1,107 @@
+import logging
+from typing import Dict, List, Optional
+import asyncpg
+from server.src.config import settings
+from server.src.database import requests
+
+logger = logging.getLogger(__name__)
+
+
+class RegistryConnection(asyncpg.Connection):
+    """Соединение с заранее подготовленными запросами реестра"""
+
+    async def prepare_cached(self, query: str):
+        """Подготовка запроса в кэше операторов соединения.
+
+        Это тот же кэш, через который работают fetch/fetchrow/execute, поэтому
+        подготовленный здесь запрос дальше исполняется по имени серверного оператора.
+        В отличие от объектов PreparedStatement кэш переживает возврат соединения в пул.
+        executemany с пустым списком аргументов - публичный способ положить запрос
+        в кэш: он разбирается и описывается сервером, но ни разу не выполняется.
+        """
+        await self.executemany(query, [])
+
+
+class StatementStats:
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, elapsed: float):
+        self.calls += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+
+
+class StatementRegistry:
+    """Реестр именованных SQL-запросов из requests.py.
+
+    Все запросы подготавливаются при инициализации соединения пула, поэтому разбор
+    и построение плана не попадают в обработчики; Database ведёт статистику по имени запроса.
+    """
+
+    def __init__(self, queries: Dict[str, str]):
+        self.queries = queries
+        self.names = {query: name for name, query in queries.items()}
+        self.stats = {name: StatementStats() for name in queries}
+        self.unprepared: set = set()
+
+    def name_of(self, query: str) -> Optional[str]:
+        return self.names.get(query)
+
+    def alias(self, derived: str, query: str):
+        """Производный запрос (например, с частью столбцов) учитывается под именем исходного"""
+        name = self.names.get(query)
+        if name is not None:
+            self.names.setdefault(derived, name)
+
+    async def prepare(self, conn: RegistryConnection):
+        """Подготовка всех запросов реестра на новом соединении (init для пула)"""
+        if settings.DB_STATEMENT_CACHE_SIZE < len(self.queries):
+            logger.warning(
+                "DB_STATEMENT_CACHE_SIZE=%s is smaller than the %s registered statements, skipping prepare",
+                settings.DB_STATEMENT_CACHE_SIZE, len(self.queries)
+            )
+            return
+        for name, query in self.queries.items():
+            try:
+                await conn.prepare_cached(query)
+            except asyncpg.PostgresError as e:
+                # Например, SEARCH_*_FUZZY без pg_trgm; предупреждение - один раз на процесс
+                if name not in self.unprepared:
+                    self.unprepared.add(name)
+                    logger.warning("Statement %s was not prepared: %s", name, e)
+        # asyncpg завершает Parse/Describe сообщением Flush, а не Sync: неявная транзакция
+        # остаётся открытой и держит ACCESS SHARE на всех таблицах запросов до первого
+        # запроса на соединении, блокируя ALTER TABLE, TRUNCATE и REFRESH MATERIALIZED VIEW
+        await conn.execute("SELECT 1")
+
+    def observe(self, name: Optional[str], elapsed: float):
+        if name is not None:
+            self.stats[name].observe(elapsed)
+
+    def snapshot(self) -> List[Dict]:
+        """Статистика вызовов, отсортированная по суммарному времени"""
+        return [
+            {
+                "name": name,
+                "calls": stats.calls,
+                "total_seconds": stats.total,
+                "mean_seconds": stats.total / stats.calls,
+                "max_seconds": stats.max,
+            }
+            for name, stats in sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True)
+            if stats.calls
+        ]
+
+
+def named_queries(module) -> Dict[str, str]:
+    """SQL-константы модуля (имена в верхнем регистре)"""
+    return {
+        name: value for name, value in vars(module).items()
+        if name.isupper() and isinstance(value, str)
+    }
+
+
+registry = StatementRegistry(named_queries(requests))
@@ -0,0 +1,28 @@
+from typing import Dict, Optional, Sequence
+from server.src.database.db import db
+from server.src.database.requests import FOLD_TABLE_VERSIONS, GET_TABLE_VERSION, GET_TABLE_VERSIONS
+
+
+async def get_table_version(table: str) -> int:
+    """Номер версии таблицы (растёт при каждой изменяющей команде)"""
+    record = await db.fetch_one(GET_TABLE_VERSION, table)
+    return record["version"] if record else 0
+
+
+async def get_table_versions(tables: Sequence[str]) -> Dict[str, int]:
+    """Версии нескольких таблиц одним запросом"""
+    records = await db.fetch_all(GET_TABLE_VERSIONS, list(tables))
+    versions = {record["table_name"]: record["version"] for record in records}
+    return {table: versions.get(table, 0) for table in tables}
+
+
+async def fold_table_versions() -> int:
+    """Сворачивание счётчиков завершившихся соединений (возвращает число затронутых таблиц)"""
+    status = await db.execute(FOLD_TABLE_VERSIONS)
+    return int(status.split()[-1])
+
+
+async def get_row_version(query: str, key) -> Optional[str]:
+    """Версия строки по xmin (None, если строки нет)"""
+    record = await db.fetch_one(query, key)
+    return record["xmin"] if record else None
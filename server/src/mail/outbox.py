@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from typing import Optional
+from server.src.config import settings
+from server.src.database.db import db
+from server.src.mail.transport import create_transport
+
+logger = logging.getLogger(__name__)
+
+ENQUEUE_MAIL = """
+    INSERT INTO mail_outbox (recipient, subject, body) VALUES ($1, $2, $3) RETURNING id;
+"""
+
+CLAIM_MAIL = """
+    UPDATE mail_outbox SET locked_until = now() + make_interval(secs => $2)
+    WHERE id IN (
+        SELECT id FROM mail_outbox
+        WHERE sent_at IS NULL
+        AND attempts < $3
+        AND next_attempt_at <= now()
+        AND (locked_until IS NULL OR locked_until < now())
+        ORDER BY next_attempt_at
+        LIMIT $1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, recipient, subject, body, attempts;
+"""
+
+MARK_MAIL_SENT = "UPDATE mail_outbox SET sent_at = now(), locked_until = NULL WHERE id = ANY($1::bigint[]);"
+
+MARK_MAIL_FAILED = """
+    UPDATE mail_outbox SET
+        attempts = attempts + 1,
+        last_error = $2,
+        next_attempt_at = now() + make_interval(secs => $3),
+        locked_until = NULL
+    WHERE id = $1;
+"""
+
+# Сколько секунд письмо остаётся за обработчиком, прежде чем его сможет забрать другой процесс
+CLAIM_TIMEOUT = 120
+
+
+class MailQueue:
+    """Фоновая отправка писем из таблицы mail_outbox пачками с повторами и экспоненциальной задержкой"""
+
+    def __init__(self):
+        self.transport = create_transport()
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    async def open(self):
+        await self.transport.open()
+        self.task = asyncio.create_task(self.run())
+
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        await asyncio.to_thread(self.transport.close)
+        await self.transport.stop()
+
+    async def enqueue(self, recipient: str, subject: str, body: str) -> int:
+        """Постановка письма в очередь (возвращает id письма)"""
+        record = await db.execute_returning(ENQUEUE_MAIL, recipient, subject, body)
+        self.wakeup.set()
+        return record["id"]
+
+    async def process_batch(self) -> int:
+        """Отправка одной пачки писем (возвращает число обработанных)"""
+        records = await db.fetch_all(CLAIM_MAIL, settings.MAIL_BATCH_SIZE, CLAIM_TIMEOUT, settings.MAIL_MAX_ATTEMPTS)
+        if not records:
+            return 0
+
+        errors = await asyncio.to_thread(
+            self.transport.send_batch,
+            [(record["recipient"], record["subject"], record["body"]) for record in records]
+        )
+
+        sent = [record["id"] for record, error in zip(records, errors) if error is None]
+        if sent:
+            await db.execute(MARK_MAIL_SENT, sent)
+        for record, error in zip(records, errors):
+            if error is not None:
+                delay = settings.MAIL_RETRY_BASE * 2 ** record["attempts"]
+                logger.warning("Mail %s to %s failed: %s", record["id"], record["recipient"], error)
+                await db.execute(MARK_MAIL_FAILED, record["id"], error, delay)
+        return len(records)
+
+    async def run(self):
+        while True:
+            self.wakeup.clear()
+            try:
+                processed = await self.process_batch()
+            except Exception:
+                logger.exception("Mail queue iteration failed")
+                processed = 0
+            if processed >= settings.MAIL_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), settings.MAIL_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+
+mail_queue = MailQueue()
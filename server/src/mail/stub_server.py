@@ -0,0 +1,139 @@
+"""Локальный SMTP-сервер-заглушка (в духе aiosmtpd, без зависимостей).
+
+Принимает письма на loopback без TLS и складывает их в messages. fail_next первых
+писем отклоняются кодом 451, чтобы прогнать повторы и задержки очереди mail_outbox
+через настоящий SMTP-клиент (MAIL_TRANSPORT=local, MAIL_STUB_FAILURES).
+
+Отдельно: python -m server.src.mail.stub_server --port 1025
+"""
+import argparse
+import asyncio
+import logging
+from email import message_from_bytes, policy
+from email.message import EmailMessage
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+HOSTNAME = "carshop-stub"
+
+
+class StubSMTPServer:
+    def __init__(self, fail_next: int = 0):
+        self.fail_next = fail_next
+        self.messages: List[EmailMessage] = []
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.port: Optional[int] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Запуск на host:port (0 - свободный порт); возвращает порт"""
+        self.server = await asyncio.start_server(self.handle, host, port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        async def reply(*lines: str):
+            writer.write("".join(f"{line}\r\n" for line in lines).encode())
+            await writer.drain()
+
+        async def read_line() -> str:
+            return (await reader.readline()).decode("utf-8", "replace").rstrip("\r\n")
+
+        await reply(f"220 {HOSTNAME} ESMTP")
+        try:
+            while True:
+                line = await read_line()
+                if not line and reader.at_eof():
+                    return
+                command = line.split(" ", 1)[0].upper()
+                if command == "EHLO":
+                    await reply(f"250-{HOSTNAME}", "250-AUTH PLAIN LOGIN", "250 8BITMIME")
+                elif command == "HELO":
+                    await reply(f"250 {HOSTNAME}")
+                elif command == "AUTH":
+                    await self.authenticate(line, reply, read_line)
+                elif command == "MAIL":
+                    if self.fail_next > 0:
+                        self.fail_next -= 1
+                        await reply("451 4.3.0 Stub failure, try again later")
+                    else:
+                        await reply("250 OK")
+                elif command in ("RCPT", "RSET", "NOOP"):
+                    await reply("250 OK")
+                elif command == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    self.receive(await self.read_data(reader))
+                    await reply("250 OK: queued")
+                elif command == "QUIT":
+                    await reply("221 Bye")
+                    return
+                else:
+                    await reply("502 Command not implemented")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def authenticate(line: str, reply, read_line):
+        """AUTH PLAIN и AUTH LOGIN: любые учётные данные принимаются"""
+        parts = line.split()
+        mechanism = parts[1].upper() if len(parts) > 1 else ""
+        if mechanism == "PLAIN":
+            if len(parts) < 3:
+                await reply("334 ")
+                await read_line()
+        elif mechanism == "LOGIN":
+            await reply("334 VXNlcm5hbWU6")
+            await read_line()
+            await reply("334 UGFzc3dvcmQ6")
+            await read_line()
+        else:
+            await reply("504 Unrecognized authentication type")
+            return
+        await reply("235 Authentication successful")
+
+    @staticmethod
+    async def read_data(reader: asyncio.StreamReader) -> bytes:
+        lines = []
+        while True:
+            line = await reader.readline()
+            if line in (b".\r\n", b".\n", b""):
+                return b"".join(lines)
+            # Снятие экранирования точки в начале строки (RFC 5321, 4.5.2)
+            lines.append(line[1:] if line.startswith(b"..") else line)
+
+    def receive(self, data: bytes):
+        message = message_from_bytes(data, policy=policy.default)
+        self.messages.append(message)
+        body = message.get_body(("plain",))
+        logger.info(
+            "Stub SMTP mail to %s: %s\n%s",
+            message["To"], message["Subject"], body.get_content() if body is not None else ""
+        )
+
+
+async def main(host: str, port: int, fail: int):
+    server = StubSMTPServer(fail)
+    port = await server.start(host, port)
+    logger.info("Stub SMTP server on %s:%s", host, port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Локальный SMTP-сервер-заглушка")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--fail", type=int, default=0, help="сколько первых писем отклонить кодом 451")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.host, args.port, args.fail))
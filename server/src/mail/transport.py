@@ -0,0 +1,133 @@
+import logging
+import smtplib
+import time
+from email.header import Header
+from email.mime.text import MIMEText
+from typing import List, Optional, Tuple
+from server.src.config import settings
+from server.src.mail.stub_server import StubSMTPServer
+
+logger = logging.getLogger(__name__)
+
+Message = Tuple[str, str, str]
+
+
+def build_message(recipient: str, subject: str, body: str) -> MIMEText:
+    msg = MIMEText(body, 'plain', 'utf-8')
+    msg['Subject'] = Header(subject, 'utf-8')
+    msg['From'] = settings.EMAIL_FROM
+    msg['To'] = recipient
+    return msg
+
+
+class SMTPTransport:
+    """Переиспользуемое SMTP-соединение: открывается при первой отправке
+    и закрывается после SMTP_IDLE_TIMEOUT секунд простоя"""
+
+    def __init__(self, idle_timeout: float):
+        self.idle_timeout = idle_timeout
+        self.server: Optional[smtplib.SMTP] = None
+        self.last_used = 0.0
+
+    async def open(self):
+        pass
+
+    def connect(self) -> smtplib.SMTP:
+        # По умолчанию SMTP_SSL, как и раньше; STARTTLS - только если он явно включён
+        # (EMAIL_TLS без EMAIL_SSL). Соединения без шифрования к внешнему серверу нет
+        if settings.EMAIL_TLS and not settings.EMAIL_SSL:
+            server = smtplib.SMTP(host=settings.SMTP_HOST, port=settings.SMTP_PORT, timeout=10)
+            server.starttls()
+        else:
+            server = smtplib.SMTP_SSL(host=settings.SMTP_HOST, port=settings.SMTP_PORT, timeout=10)
+        server.login(settings.EMAIL_FROM, settings.SMTP_PASSWORD)
+        return server
+
+    def get_server(self) -> smtplib.SMTP:
+        if self.server is not None and time.monotonic() - self.last_used > self.idle_timeout:
+            self.close()
+        if self.server is not None:
+            try:
+                self.server.noop()
+            except smtplib.SMTPException:
+                self.close()
+        if self.server is None:
+            self.server = self.connect()
+        return self.server
+
+    def send_batch(self, messages: List[Message]) -> List[Optional[str]]:
+        """Отправка пачки писем через одно соединение (возвращает ошибку по каждому письму или None)"""
+        errors: List[Optional[str]] = []
+        for recipient, subject, body in messages:
+            try:
+                self.get_server().send_message(build_message(recipient, subject, body))
+                errors.append(None)
+            except (smtplib.SMTPException, OSError) as e:
+                self.close()
+                errors.append(str(e) or e.__class__.__name__)
+            self.last_used = time.monotonic()
+        return errors
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.server = None
+
+    async def stop(self):
+        pass
+
+
+class LocalSMTPTransport(SMTPTransport):
+    """SMTP-клиент против локального сервера-заглушки в том же процессе (без TLS).
+
+    Письма проходят настоящий протокол SMTP, а первые MAIL_STUB_FAILURES из них
+    сервер отклоняет - так проверяются повторы и задержки очереди.
+    """
+
+    def __init__(self, idle_timeout: float, failures: int):
+        super().__init__(idle_timeout)
+        self.stub = StubSMTPServer(failures)
+
+    async def open(self):
+        await self.stub.start()
+
+    def connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(host="127.0.0.1", port=self.stub.port, timeout=10)
+        server.login(settings.EMAIL_FROM, settings.SMTP_PASSWORD)
+        return server
+
+    async def stop(self):
+        await self.stub.stop()
+
+
+class StubTransport:
+    """Заглушка SMTP в памяти для локального запуска: письма копятся в sent"""
+
+    def __init__(self):
+        self.sent: List[Message] = []
+
+    async def open(self):
+        pass
+
+    def send_batch(self, messages: List[Message]) -> List[Optional[str]]:
+        for recipient, subject, body in messages:
+            logger.info("Stub mail to %s: %s\n%s", recipient, subject, body)
+        self.sent.extend(messages)
+        return [None] * len(messages)
+
+    def close(self):
+        pass
+
+    async def stop(self):
+        pass
+
+
+def create_transport():
+    if settings.MAIL_TRANSPORT == "stub":
+        return StubTransport()
+    if settings.MAIL_TRANSPORT == "local":
+        return LocalSMTPTransport(settings.SMTP_IDLE_TIMEOUT, settings.MAIL_STUB_FAILURES)
+    return SMTPTransport(settings.SMTP_IDLE_TIMEOUT)
@@ -1,25 +1,66 @@
-import uuid
 from fastapi import FastAPI, Request
 from server.src.routes import (
     cars, drivers, workers,
     lifeguards, clients, expanses,
     admissions, companies, directors,
-    accountants, sellers
+    accountants, sellers, export, metrics,
+    search, reports
 )
 from server.src.database.db import db
+from server.src.config import settings
+import time
 from contextlib import asynccontextmanager
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
 from server.src.auth import users
-from server.src.auth.sessions_store import sessions
+from server.src.auth.sessions_store import Session, session_store
+from server.src.auth.hashing import password_hasher
+from server.src.mail.outbox import mail_queue
+from server.src.database.cache import reference_cache
+from server.src.database.migrate import migrate
+from server.src.routes.conditional import NotModified, not_modified_handler
+from server.src.database.metrics import RequestTimings, request_timings
+from server.src.monitoring import UNMATCHED_ROUTE, request_metrics, server_timing
+from server.src.scheduler import scheduler
+from server.src.auth.repository import AuthRepository
+from server.src.database.reports import refresh_report_views
+from server.src.database.inventory import convert_pending_admissions
+from server.src.database.key_pool import EmptyKeyPool, key_pool
+from server.src.database.versions import fold_table_versions
+from fastapi.responses import JSONResponse
+
+scheduler.add("cleanup_unverified_users", settings.USER_CLEANUP_INTERVAL, AuthRepository.cleanup_unverified_users)
+scheduler.add("cleanup_sessions", settings.SESSION_CLEANUP_INTERVAL, session_store.cleanup)
+if settings.REPORTS_MATERIALIZED:
+    scheduler.add("refresh_report_views", settings.REPORT_REFRESH_INTERVAL, refresh_report_views)
+scheduler.add("convert_admissions", settings.ADMISSION_PIPELINE_INTERVAL, convert_pending_admissions)
+scheduler.add("refresh_key_pool", settings.KEY_POOL_TTL, key_pool.refresh)
+scheduler.add("fold_table_versions", settings.TABLE_VERSION_FOLD_INTERVAL, fold_table_versions)
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
+    if settings.DB_MIGRATE_ON_STARTUP:
+        await migrate()
     await db.connect()
+    await session_store.open()
+    await mail_queue.open()
+    await reference_cache.open()
+    await scheduler.open()
     yield
+    await scheduler.close()
+    await reference_cache.close()
+    await mail_queue.close()
+    await session_store.close()
+    password_hasher.shutdown()
     await db.disconnect()
 
 app = FastAPI(title="Car Shop", lifespan=lifespan)
+app.add_exception_handler(NotModified, not_modified_handler)
+
+@app.exception_handler(EmptyKeyPool)
+async def empty_key_pool_handler(_: Request, exc: EmptyKeyPool):
+    """Нечем заполнить внешний ключ - запись не создаётся"""
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
 
 origins = [
     "http://localhost",
@@ -42,32 +83,56 @@ app.add_middleware(
 @app.middleware("http")
 async def session_middleware(request: Request, call_next):
     session_id = request.cookies.get("session_id")
-    new_session = False
-
-    if session_id and session_id in sessions:
-        request.state.session = sessions[session_id]
-        request.state.session_id = session_id
-    else:
-        session_id = str(uuid.uuid4())
-        sessions[session_id] = {}
-        request.state.session = sessions[session_id]
-        request.state.session_id = session_id
-        new_session = True
+    data = await session_store.get(session_id) if session_id else None
+    session = Session(session_id if data is not None else None, data)
+    request.state.session = session
 
     response = await call_next(request)
 
-    if new_session:
-        response.set_cookie(
-            key="session_id",
-            value=session_id,
-            httponly=True,
-            secure=False,
-            samesite="lax",
-            max_age=3600 * 30 * 24,
-            path="/",
-        )
-        print("Set-Cookie header added to response")
+    if session.previous_id:
+        await session_store.delete(session.previous_id)
+
+    if session.invalidated:
+        if session.session_id:
+            await session_store.delete(session.session_id)
+        response.delete_cookie(key="session_id", path="/")
+    elif session.modified:
+        is_new = session.is_new
+        await session_store.save(session.ensure_id(), dict(session))
+        if is_new:
+            response.set_cookie(
+                key="session_id",
+                value=session.session_id,
+                httponly=True,
+                secure=False,
+                samesite="lax",
+                max_age=settings.SESSION_TTL,
+                path="/",
+            )
+
+    return response
+
+@app.middleware("http")
+async def timing_middleware(request: Request, call_next):
+    timings = RequestTimings(request.url.path)
+    token = request_timings.set(timings)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        request_timings.reset(token)
+    elapsed = time.perf_counter() - started
 
+    route = request.scope.get("route")
+    request_metrics.observe(
+        request.method,
+        route.path if route is not None else UNMATCHED_ROUTE,
+        response.status_code,
+        elapsed,
+        timings
+    )
+    if settings.SERVER_TIMING_HEADER:
+        response.headers["Server-Timing"] = server_timing(elapsed, timings)
     return response
 
 app.include_router(workers.router)
@@ -81,6 +146,10 @@ app.include_router(accountants.router)
 app.include_router(drivers.router)
 app.include_router(lifeguards.router)
 app.include_router(sellers.router)
+app.include_router(export.router)
+app.include_router(metrics.router)
+app.include_router(search.router)
+app.include_router(reports.router)
 app.include_router(users.router)
 
 @app.get("/")
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
+from server.src.models.expand import AdmissionFields, WorkerFields
 
 class AccountantBase(BaseModel):
     qual: int = Field(default=0, ge=0)
@@ -10,4 +11,10 @@ class AccountantResponse(AccountantBase):
     id_number: Optional[int] = None
 
 class AccountantList(BaseModel):
-    accountants: List[AccountantResponse]
\ No newline at end of file
+    accountants: List[AccountantResponse]
+
+class AccountantDetail(AdmissionFields, WorkerFields, AccountantResponse):
+    pass
+
+class AccountantDetailList(BaseModel):
+    accountants: List[AccountantDetail]
@@ -1,6 +1,6 @@
 from datetime import date
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
 
 class AdmissionBase(BaseModel):
@@ -14,6 +14,12 @@ class AdmissionBase(BaseModel):
 
 class AdmissionResponse(AdmissionBase):
     id_number: int
+    number_vin: Optional[str] = None
 
 class AdmissionList(BaseModel):
-    admissions: List[AdmissionResponse]
\ No newline at end of file
+    admissions: List[AdmissionResponse]
+
+class ConversionResult(BaseModel):
+    converted: int
+    batches: int
+    pending: int
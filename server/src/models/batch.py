@@ -0,0 +1,28 @@
+from typing import Any, Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, Field
+
+BATCH_MAX_ROWS = 10000
+
+
+class BatchUpdateItem(BaseModel):
+    key: Union[int, str]
+    values: Dict[str, Any]
+
+
+class BatchUpdate(BaseModel):
+    items: List[BatchUpdateItem] = Field(min_length=1, max_length=BATCH_MAX_ROWS)
+
+
+class BatchDelete(BaseModel):
+    keys: List[Union[int, str]] = Field(min_length=1, max_length=BATCH_MAX_ROWS)
+
+
+class BatchRowResult(BaseModel):
+    key: Union[int, str]
+    status: Literal["updated", "deleted", "not_found"]
+    record: Optional[Dict[str, Any]] = None
+
+
+class BatchResult(BaseModel):
+    affected: int
+    results: List[BatchRowResult]
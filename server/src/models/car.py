@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
+from server.src.models.expand import ClientFields
 
 
 class CarBase(BaseModel):
@@ -15,4 +16,14 @@ class CarResponse(CarBase):
     app_number: Optional[int] = None
 
 class CarList(BaseModel):
-    cars: List[CarResponse]
\ No newline at end of file
+    cars: List[CarResponse]
+    next_after: Optional[str] = None
+    total: Optional[int] = None
+
+class CarDetail(ClientFields, CarResponse):
+    pass
+
+class CarDetailList(BaseModel):
+    cars: List[CarDetail]
+    next_after: Optional[str] = None
+    total: Optional[int] = None
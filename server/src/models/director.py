@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
+from server.src.models.expand import CompanyFields
 
 
 class DirectorBase(BaseModel):
@@ -14,4 +15,10 @@ class DirectorResponse(DirectorBase):
     inn_company: Optional[int] = None
 
 class DirectorList(BaseModel):
-    directors: List[DirectorResponse]
\ No newline at end of file
+    directors: List[DirectorResponse]
+
+class DirectorDetail(CompanyFields, DirectorResponse):
+    pass
+
+class DirectorDetailList(BaseModel):
+    directors: List[DirectorDetail]
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
+from server.src.models.expand import CarFields, WorkerFields
 
 class DriverBase(BaseModel):
     car_number: str
@@ -10,4 +11,10 @@ class DriverResponse(DriverBase):
     number_vin: Optional[str] = None
 
 class DriverList(BaseModel):
-    drivers: List[DriverResponse]
\ No newline at end of file
+    drivers: List[DriverResponse]
+
+class DriverDetail(CarFields, WorkerFields, DriverResponse):
+    pass
+
+class DriverDetailList(BaseModel):
+    drivers: List[DriverDetail]
@@ -0,0 +1,36 @@
+from datetime import date
+from pydantic import BaseModel
+from typing import Optional
+
+
+# Поля связанных таблиц в развёрнутых ответах (?expand=...), по одной группе на связь
+
+
+class WorkerFields(BaseModel):
+    worker_surname: Optional[str] = None
+    worker_firstname: Optional[str] = None
+    worker_lastname: Optional[str] = None
+    worker_post: Optional[str] = None
+
+
+class ClientFields(BaseModel):
+    client_budget: Optional[float] = None
+    client_current_car: Optional[str] = None
+    client_prefer_car: Optional[str] = None
+
+
+class CompanyFields(BaseModel):
+    company_name: Optional[str] = None
+    company_address: Optional[str] = None
+
+
+class CarFields(BaseModel):
+    car_mark: Optional[str] = None
+    car_model: Optional[str] = None
+    car_color: Optional[str] = None
+
+
+class AdmissionFields(BaseModel):
+    admission_date: Optional[date] = None
+    admission_mark: Optional[str] = None
+    admission_model: Optional[str] = None
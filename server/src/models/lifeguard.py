@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List
+from server.src.models.expand import WorkerFields
 
 class LifeguardBase(BaseModel):
     uniform: str
@@ -10,4 +11,10 @@ class LifeguardResponse(LifeguardBase):
     worker_id: int
 
 class LifeguardList(BaseModel):
-    lifeguards: List[LifeguardResponse]
\ No newline at end of file
+    lifeguards: List[LifeguardResponse]
+
+class LifeguardDetail(WorkerFields, LifeguardResponse):
+    pass
+
+class LifeguardDetailList(BaseModel):
+    lifeguards: List[LifeguardDetail]
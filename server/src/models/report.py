@@ -0,0 +1,80 @@
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class ReportBase(BaseModel):
+    # Время обновления материализованного представления; None - посчитано по таблице
+    refreshed_at: Optional[datetime] = None
+
+
+class ExpanseTotal(BaseModel):
+    expanse_type: str
+    entries: int
+    total: float
+    average: float
+    minimum: float
+    maximum: float
+
+class ExpanseReport(ReportBase):
+    rows: List[ExpanseTotal]
+
+
+# Строки отчётов - своя модель на каждую группировку, без полей других группировок
+
+class PayrollByPost(BaseModel):
+    post: str
+    workers: int
+    payroll: int
+    average_salary: float
+    min_salary: int
+    max_salary: int
+
+class PayrollByDirector(BaseModel):
+    # None - сотрудники без директора
+    inn_director: Optional[int]
+    workers: int
+    payroll: int
+    average_salary: float
+    min_salary: int
+    max_salary: int
+
+class PayrollByPostReport(ReportBase):
+    rows: List[PayrollByPost]
+
+class PayrollByDirectorReport(ReportBase):
+    rows: List[PayrollByDirector]
+
+
+class StockByMark(BaseModel):
+    mark: str
+    cars: int
+    available: int
+
+class StockByModel(BaseModel):
+    mark: str
+    model: str
+    cars: int
+    available: int
+
+class StockByYear(BaseModel):
+    year_create: int
+    cars: int
+    available: int
+
+class StockByMarkReport(ReportBase):
+    rows: List[StockByMark]
+
+class StockByModelReport(ReportBase):
+    rows: List[StockByModel]
+
+class StockByYearReport(ReportBase):
+    rows: List[StockByYear]
+
+
+class AdmissionsMonth(BaseModel):
+    month: date
+    admissions: int
+
+class AdmissionsReport(ReportBase):
+    rows: List[AdmissionsMonth]
@@ -0,0 +1,20 @@
+from typing import List
+from pydantic import BaseModel
+from server.src.models.car import CarResponse
+from server.src.models.worker import WorkerHelp
+
+
+class WorkerMatch(WorkerHelp):
+    rank: float
+
+
+class WorkerSearch(BaseModel):
+    workers: List[WorkerMatch]
+
+
+class CarMatch(CarResponse):
+    rank: float
+
+
+class CarSearch(BaseModel):
+    cars: List[CarMatch]
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
+from server.src.models.expand import ClientFields, WorkerFields
 
 class SellerBase(BaseModel):
     seller_type: str
@@ -9,4 +10,10 @@ class SellerResponse(SellerBase):
     app_number: Optional[int] = None
 
 class SellerList(BaseModel):
-    sellers: List[SellerResponse]
\ No newline at end of file
+    sellers: List[SellerResponse]
+
+class SellerDetail(ClientFields, WorkerFields, SellerResponse):
+    pass
+
+class SellerDetailList(BaseModel):
+    sellers: List[SellerDetail]
@@ -22,11 +22,13 @@ class WorkerHelp(BaseModel):
     lastname: str
     phone_number: int
     address: str
-    inn_director: int
+    inn_director: Optional[int] = None
     salary: int = Field(default=20000, ge=20000)
     post: str = Field(default="Безработный")
     experience: int = Field(default=0)
-    id_expanse: int = Field(gt=0)
+    id_expanse: Optional[int] = Field(default=None, gt=0)
 
 class WorkerLine(BaseModel):
-    workers: Optional[List[WorkerHelp]]
\ No newline at end of file
+    workers: Optional[List[WorkerHelp]]
+    next_after: Optional[int] = None
+    total: Optional[int] = None
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""Метрики HTTP-запросов и их выдача в текстовом формате Prometheus"""
+from typing import Dict, Iterable, List, Tuple
+from server.src.database.db import db
+from server.src.database.cache import reference_cache, report_cache
+from server.src.database.metrics import Histogram, RequestTimings
+from server.src.database.statements import registry
+from server.src.scheduler import scheduler
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Маршрут не найден - одна метка вместо исходного пути, чтобы не раздувать число рядов
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.duration = Histogram()
+        self.db_time = Histogram()
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.statuses: Dict[int, int] = {}
+
+
+class RequestMetrics:
+    """Длительность обработки, время в БД и число запросов к БД по маршрутам"""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def observe(self, method: str, route: str, status: int, elapsed: float, timings: RequestTimings):
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.duration.observe(elapsed)
+        metrics.db_time.observe(timings.db_time)
+        metrics.queries.observe(timings.queries)
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+
+request_metrics = RequestMetrics()
+
+
+def server_timing(elapsed: float, timings: RequestTimings) -> str:
+    """Значение заголовка Server-Timing (длительности в миллисекундах)"""
+    return (
+        f'app;dur={elapsed * 1000:.1f}, '
+        f'db;dur={timings.db_time * 1000:.1f};desc="{timings.queries} queries"'
+    )
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def histogram_lines(name: str, histogram: Histogram, labels: Dict[str, str]) -> Iterable[str]:
+    snapshot = histogram.snapshot()
+    for bound, count in snapshot["buckets"].items():
+        yield f"{name}_bucket{format_labels({**labels, 'le': bound})} {count}"
+    yield f"{name}_sum{format_labels(labels)} {snapshot['sum']}"
+    yield f"{name}_count{format_labels(labels)} {snapshot['count']}"
+
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, help_text: str):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    metric("http_requests_total", "counter", "HTTP requests by route and status")
+    for (method, route), metrics in sorted(request_metrics.routes.items()):
+        for status, count in sorted(metrics.statuses.items()):
+            labels = {"method": method, "route": route, "status": str(status)}
+            lines.append(f"http_requests_total{format_labels(labels)} {count}")
+    for name, attribute, help_text in (
+        ("http_request_duration_seconds", "duration", "Request handling time"),
+        ("http_request_db_seconds", "db_time", "Database time per request"),
+        ("http_request_queries", "queries", "Database queries per request"),
+    ):
+        metric(name, "histogram", help_text)
+        for (method, route), metrics in sorted(request_metrics.routes.items()):
+            lines.extend(histogram_lines(name, getattr(metrics, attribute), {"method": method, "route": route}))
+
+    pool = db.pool_stats()
+    for name in ("size", "idle", "acquired", "max_size"):
+        metric(f"db_pool_{name}", "gauge", f"Connection pool {name}")
+        lines.append(f"db_pool_{name} {pool[name]}")
+    metric("db_pool_acquire_wait_seconds", "histogram", "Time waiting for a pool connection")
+    lines.extend(histogram_lines("db_pool_acquire_wait_seconds", db.metrics.acquire_wait, {}))
+    metric("db_query_duration_seconds", "histogram", "Query execution time")
+    lines.extend(histogram_lines("db_query_duration_seconds", db.metrics.query_latency, {}))
+
+    statements = registry.snapshot()
+    metric("db_statement_calls_total", "counter", "Calls per named statement from requests.py")
+    lines.extend(
+        f"db_statement_calls_total{format_labels({'statement': row['name']})} {row['calls']}"
+        for row in statements
+    )
+    metric("db_statement_seconds_total", "counter", "Total time per named statement")
+    lines.extend(
+        f"db_statement_seconds_total{format_labels({'statement': row['name']})} {row['total_seconds']}"
+        for row in statements
+    )
+
+    for prefix, cache in (("reference_cache", reference_cache), ("report_cache", report_cache)):
+        stats = cache.stats()
+        for name, kind in (("entries", "gauge"), ("hits", "counter"), ("misses", "counter")):
+            metric_name = f"{prefix}_{name}" + ("_total" if kind == "counter" else "")
+            metric(metric_name, kind, f"{prefix.replace('_', ' ').capitalize()} {name}")
+            lines.append(f"{metric_name} {stats[name]}")
+
+    jobs = scheduler.jobs.values()
+    for name, attribute, help_text in (
+        ("scheduler_job_runs_total", "runs", "Scheduled job runs"),
+        ("scheduler_job_failures_total", "failures", "Scheduled job runs that raised"),
+        ("scheduler_job_processed_total", "processed", "Rows processed by scheduled jobs"),
+    ):
+        metric(name, "counter", help_text)
+        lines.extend(f"{name}{format_labels({'job': job.name})} {getattr(job, attribute)}" for job in jobs)
+    metric("scheduler_job_duration_seconds", "histogram", "Scheduled job run time")
+    for job in jobs:
+        lines.extend(histogram_lines("scheduler_job_duration_seconds", job.duration, {"job": job.name}))
+
+    return "\n".join(lines) + "\n"
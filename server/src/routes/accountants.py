@@ -1,45 +1,95 @@
-from fastapi import APIRouter
-from random import Random
+from typing import List, Optional
+from fastapi import APIRouter, Request, Depends, Response
 from server.src.database.requests import (
     CREATE_ACCOUNTANT,
     UPDATE_ACCOUNTANT,
     DELETE_ACCOUNTANT,
     GET_ACCOUNTANT,
+    GET_ACCOUNTANT_EXPANDED,
     GET_ALL_ACCOUNTANTS,
+    GET_ALL_ACCOUNTANTS_EXPANDED,
     GET_AVAILABLE_ACCOUNTANTS,
-    GET_RANDOM_ID_NUMBER
+    GET_ACCOUNTANT_VERSION,
+    GET_ACCOUNTANTS_FOR_UPDATE,
+    DELETE_ACCOUNTANTS
 )
-from server.src.database.db import db, Database
+from server.src.database.db import db
+from server.src.database.key_pool import key_pool
+from server.src.models.bulk import BulkResult
+from server.src.routes.bulk import read_bulk_rows
+from server.src.routes.roles import claim_worker, claim_workers, copy_roles
+from server.src.routes.batch import delete_batch, update_batch
+from server.src.models.batch import BatchDelete, BatchResult, BatchUpdate
+from server.src.routes.streaming import StreamFormat, stream_records
+from server.src.routes.conditional import row_etag, table_etag
+from server.src.routes.expand import expand_param, expanded_fields
+from server.src.routes.fields import fields_param, narrowed_query
+from server.src.routes.serialization import encode_records, records_response
 from server.src.models.accountant import (
     AccountantResponse,
     AccountantBase,
-    AccountantList
+    AccountantDetail,
+    AccountantDetailList
 )
 
 router = APIRouter(prefix="/accountants", tags=["accountants"])
 
-async def get_random_id_number(db: Database) -> int:
-    """Получает случайный id_number из таблицы admission_journal"""
-    records = await db.fetch_all(GET_RANDOM_ID_NUMBER)
-    return Random().choice([record['id_number'] for record in records])
+# Связи для ?expand=
+EXPAND = ("worker", "admission")
 
 @router.post("/", response_model=AccountantResponse)
 async def create_accountant(accountant: AccountantBase):
-    available_workers = await db.fetch_all(GET_AVAILABLE_ACCOUNTANTS)
-    selected_worker = available_workers[0]
-    id_number = await get_random_id_number(db)
-    new_accountant = await db.execute_returning(
+    id_number = await key_pool.sample("admission_journal")
+    new_accountant = await claim_worker(
         CREATE_ACCOUNTANT,
-        selected_worker['worker_id'],
         accountant.qual,
         accountant.kit,
         id_number
     )
     return AccountantResponse(**new_accountant)
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_accountants_bulk(request: Request):
+    """Массовое создание из JSON-массива или NDJSON через COPY"""
+    # Ключи выбираются до COPY: внутри него второе соединение из пула не берётся
+    sample_key = await key_pool.sampler("admission_journal")
+
+    async def batches():
+        async for accountants in read_bulk_rows(request, AccountantBase):
+            worker_ids = await claim_workers(GET_AVAILABLE_ACCOUNTANTS, len(accountants))
+            yield [
+                (
+                    worker_id,
+                    accountant.qual,
+                    accountant.kit,
+                    sample_key()
+                )
+                for worker_id, accountant in zip(worker_ids, accountants)
+            ]
+
+    inserted = await copy_roles(
+        "accountant",
+        ["worker_id", "qual", "kit", "id_number"],
+        batches()
+    )
+    return BulkResult(inserted=inserted)
+
+@router.patch("/batch", response_model=BatchResult)
+async def update_accountants_batch(batch: BatchUpdate):
+    """Частичное обновление бухгалтеров одной транзакцией (executemany)"""
+    return await update_batch(
+        batch, GET_ACCOUNTANTS_FOR_UPDATE, UPDATE_ACCOUNTANT, "worker_id",
+        ("qual", "kit", "id_number"), AccountantResponse
+    )
+
+@router.delete("/batch", response_model=BatchResult)
+async def delete_accountants_batch(batch: BatchDelete):
+    """Удаление бухгалтеров по списку ключей одним запросом"""
+    return await delete_batch(batch, DELETE_ACCOUNTANTS)
+
 @router.put("/{worker_id}", response_model=AccountantResponse)
 async def update_accountant(worker_id: int, accountant: AccountantBase):
-    id_number = await get_random_id_number(db)
+    id_number = await key_pool.sample("admission_journal")
     updated_accountant = await db.execute_returning(
         UPDATE_ACCOUNTANT,
         accountant.qual,
@@ -49,17 +99,36 @@ async def update_accountant(worker_id: int, accountant: AccountantBase):
     )
     return AccountantResponse(**updated_accountant)
 
-@router.get("/{worker_id}", response_model=AccountantResponse)
-async def get_accountant(worker_id: int):
-    accountant = await db.fetch_one(GET_ACCOUNTANT, worker_id)
-    return AccountantResponse(**accountant)
+@router.get(
+    "/{worker_id}",
+    response_model=AccountantDetail,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(row_etag("accountant", GET_ACCOUNTANT_VERSION, "worker_id", expand=EXPAND))]
+)
+async def get_accountant(worker_id: int, expand: List[str] = Depends(expand_param(*EXPAND))):
+    accountant = await db.fetch_one(GET_ACCOUNTANT_EXPANDED if expand else GET_ACCOUNTANT, worker_id)
+    return AccountantDetail(**{name: accountant[name] for name in expanded_fields(AccountantResponse, expand)})
+
+@router.get("/", response_model=AccountantDetailList, dependencies=[Depends(table_etag("accountant", expand=EXPAND))])
+async def get_all_accountants(
+    response: Response,
+    stream: Optional[StreamFormat] = None,
+    expand: List[str] = Depends(expand_param(*EXPAND)),
+    fields: Optional[List[str]] = Depends(fields_param(AccountantDetail))
+):
+    """Все записи; expand добавляет поля связанных таблиц из одного JOIN-запроса.
 
-@router.get("/", response_model=AccountantList)
-async def get_all_accountants():
-    records = await db.fetch_all(GET_ALL_ACCOUNTANTS)
-    return AccountantList(
-        accountants=[AccountantResponse(**accountant) for accountant in records]
+    fields оставляет в запросе и ответе только перечисленные поля.
+    """
+    query, columns = narrowed_query(
+        GET_ALL_ACCOUNTANTS_EXPANDED if expand else GET_ALL_ACCOUNTANTS,
+        expanded_fields(AccountantResponse, expand),
+        fields
     )
+    if stream:
+        return stream_records(stream, query, fields=columns)
+    records = await db.fetch_all(query)
+    return records_response(encode_records("accountants", AccountantDetail, records, columns), response)
 
 @router.delete("/{worker_id}")
 async def delete_accountant(worker_id: int):
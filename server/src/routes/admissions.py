@@ -1,16 +1,32 @@
-from fastapi import APIRouter
+from typing import List, Optional
+from fastapi import APIRouter, Request, Depends, Response, Query
 from server.src.database.requests import (
     CREATE_ADMISSION,
     UPDATE_ADMISSION,
     DELETE_ADMISSION,
     GET_ADMISSION,
-    GET_ALL_ADMISSIONS
+    GET_ALL_ADMISSIONS,
+    GET_ADMISSION_VERSION,
+    GET_ADMISSIONS_FOR_UPDATE,
+    DELETE_ADMISSIONS
 )
 from server.src.database.db import db
+from server.src.database.key_pool import key_pool
+from server.src.database.inventory import convert_admissions, pending_admissions
+from server.src.config import settings
+from server.src.models.bulk import BulkResult
+from server.src.routes.bulk import read_bulk_rows
+from server.src.routes.batch import delete_batch, update_batch
+from server.src.models.batch import BatchDelete, BatchResult, BatchUpdate
+from server.src.routes.streaming import StreamFormat, stream_records
+from server.src.routes.conditional import row_etag, table_etag
+from server.src.routes.fields import fields_param, narrowed_query
+from server.src.routes.serialization import encode_records, records_response
 from server.src.models.admission_journal import (
     AdmissionResponse,
     AdmissionBase,
-    AdmissionList
+    AdmissionList,
+    ConversionResult
 )
 
 router = APIRouter(prefix="/admissions", tags=["admissions"])
@@ -26,8 +42,69 @@ async def create_admission(admission: AdmissionBase):
         admission.model,
         admission.year_create,
     )
+    key_pool.add("admission_journal", new_admission["id_number"])
     return AdmissionResponse(**new_admission)
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_admissions_bulk(request: Request):
+    """Массовое создание из JSON-массива или NDJSON через COPY"""
+    async def batches():
+        async for admissions in read_bulk_rows(request, AdmissionBase):
+            yield [
+                (
+                    admission.admission_date,
+                    admission.complectation,
+                    admission.color,
+                    admission.mark,
+                    admission.model,
+                    admission.year_create
+                )
+                for admission in admissions
+            ]
+
+    inserted = await db.copy_records(
+        "admission_journal",
+        [
+            "admission_date",
+            "complectation",
+            "color",
+            "mark",
+            "model",
+            "year_create"
+        ],
+        batches()
+    )
+    key_pool.invalidate("admission_journal")
+    return BulkResult(inserted=inserted)
+
+@router.post("/convert", response_model=ConversionResult)
+async def convert_admissions_to_cars(
+    batch_size: int = Query(default=settings.ADMISSION_BATCH_SIZE, ge=1, le=10000),
+    max_batches: Optional[int] = Query(default=None, ge=1)
+):
+    """Перенос неперенесённых поставок в автомобили пачками; повторный вызов продолжает перенос"""
+    converted, batches = await convert_admissions(batch_size, max_batches)
+    return ConversionResult(converted=converted, batches=batches, pending=await pending_admissions())
+
+@router.patch("/batch", response_model=BatchResult)
+async def update_admissions_batch(batch: BatchUpdate):
+    """Частичное обновление поставок одной транзакцией (executemany)"""
+    return await update_batch(
+        batch, GET_ADMISSIONS_FOR_UPDATE, UPDATE_ADMISSION, "id_number",
+        ("admission_date", "complectation", "color", "mark", "model",
+         "year_create"),
+        AdmissionBase
+    )
+
+@router.delete("/batch", response_model=BatchResult)
+async def delete_admissions_batch(batch: BatchDelete):
+    """Удаление поставок по списку ключей одним запросом"""
+    result = await delete_batch(batch, DELETE_ADMISSIONS)
+    for row in result.results:
+        if row.status == "deleted":
+            key_pool.discard("admission_journal", row.key)
+    return result
+
 @router.put("/{id_number}", response_model=AdmissionResponse)
 async def update_admission(id_number: int, admission: AdmissionBase):
     updated_admission = await db.execute_returning(
@@ -42,19 +119,30 @@ async def update_admission(id_number: int, admission: AdmissionBase):
     )
     return AdmissionResponse(**updated_admission)
 
-@router.get("/{id_number}", response_model=AdmissionResponse)
+@router.get(
+    "/{id_number}",
+    response_model=AdmissionResponse,
+    dependencies=[Depends(row_etag("admission_journal", GET_ADMISSION_VERSION, "id_number"))]
+)
 async def get_admission(id_number: int):
     admission = await db.fetch_one(GET_ADMISSION, id_number)
     return AdmissionResponse(**admission)
 
-@router.get("/", response_model=AdmissionList)
-async def get_all_admissions():
-    records = await db.fetch_all(GET_ALL_ADMISSIONS)
-    return AdmissionList(
-        admissions=[AdmissionResponse(**admission) for admission in records]
-    )
+@router.get("/", response_model=AdmissionList, dependencies=[Depends(table_etag("admission_journal"))])
+async def get_all_admissions(
+    response: Response,
+    stream: Optional[StreamFormat] = None,
+    fields: Optional[List[str]] = Depends(fields_param(AdmissionResponse))
+):
+    """Все записи; fields оставляет в запросе и ответе только перечисленные поля"""
+    query, columns = narrowed_query(GET_ALL_ADMISSIONS, list(AdmissionResponse.model_fields), fields)
+    if stream:
+        return stream_records(stream, query, fields=columns)
+    records = await db.fetch_all(query)
+    return records_response(encode_records("admissions", AdmissionResponse, records, columns), response)
 
 @router.delete("/{id_number}")
 async def delete_admission(id_number: int):
     await db.execute_returning(DELETE_ADMISSION, id_number)
+    key_pool.discard("admission_journal", id_number)
     return "Admission deleted successful"
\ No newline at end of file
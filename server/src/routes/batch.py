@@ -0,0 +1,93 @@
+from typing import Any, Callable, Dict, List, Sequence, Type
+import asyncpg
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from server.src.database.db import db
+from server.src.models.batch import BatchDelete, BatchResult, BatchRowResult, BatchUpdate
+
+
+def cast_key(key, cast: Callable, number: int):
+    try:
+        return cast(key)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail={"row": number, "error": f"Invalid key: {key!r}"})
+
+
+def collect_changes(batch: BatchUpdate, columns: Sequence[str], cast: Callable) -> Dict[Any, Dict[str, Any]]:
+    """Изменения по ключам (повторы одного ключа сливаются по порядку)"""
+    changes: Dict[Any, Dict[str, Any]] = {}
+    for number, item in enumerate(batch.items):
+        unknown = item.values.keys() - set(columns)
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail={"row": number, "error": f"Unknown fields: {sorted(unknown)}"}
+            )
+        changes.setdefault(cast_key(item.key, cast, number), {}).update(item.values)
+    return changes
+
+
+async def update_batch(
+        batch: BatchUpdate,
+        lock_query: str,
+        update_query: str,
+        key: str,
+        columns: Sequence[str],
+        model: Type[BaseModel],
+        cast: Callable = int
+) -> BatchResult:
+    """Частичное обновление многих строк в одной транзакции.
+
+    Строки блокируются FOR UPDATE, изменения накладываются на текущие значения и
+    проверяются моделью, затем UPDATE_* выполняется одним executemany.
+    columns - параметры UPDATE_* по порядку, ключ передаётся последним; модель
+    должна описывать их все, включая внешние ключи.
+    """
+    unchecked = set(columns) - model.model_fields.keys()
+    if unchecked:
+        raise ValueError(f"{model.__name__} does not validate {sorted(unchecked)}")
+    changes = collect_changes(batch, columns, cast)
+    results: List[BatchRowResult] = []
+    rows = []
+    try:
+        async with db.connection() as conn:
+            async with conn.transaction():
+                current = {
+                    record[key]: dict(record)
+                    for record in await db.run(conn, "fetch", lock_query, list(changes))
+                }
+                for number, (row_key, values) in enumerate(changes.items()):
+                    if row_key not in current:
+                        results.append(BatchRowResult(key=row_key, status="not_found"))
+                        continue
+                    merged = {**current[row_key], **values}
+                    try:
+                        merged.update(model.model_validate(merged).model_dump())
+                    except ValidationError as e:
+                        raise HTTPException(status_code=422, detail={"row": number, "errors": e.errors()})
+                    rows.append(tuple(merged[column] for column in columns) + (row_key,))
+                    results.append(BatchRowResult(key=row_key, status="updated", record=merged))
+                if rows:
+                    await db.run(conn, "executemany", update_query, rows)
+    except asyncpg.IntegrityConstraintViolationError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except asyncpg.DataError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return BatchResult(affected=len(rows), results=results)
+
+
+async def delete_batch(batch: BatchDelete, delete_query: str, cast: Callable = int) -> BatchResult:
+    """Удаление многих строк одним запросом с результатом по каждому ключу"""
+    keys = list(dict.fromkeys(cast_key(key, cast, number) for number, key in enumerate(batch.keys)))
+    try:
+        records = await db.fetch_all(delete_query, keys)
+    except asyncpg.IntegrityConstraintViolationError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    deleted = {record[0] for record in records}
+    return BatchResult(
+        affected=len(deleted),
+        results=[
+            BatchRowResult(key=key, status="deleted" if key in deleted else "not_found")
+            for key in keys
+        ]
+    )
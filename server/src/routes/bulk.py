@@ -0,0 +1,56 @@
+import json
+from typing import AsyncIterator, List, Type
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+
+BULK_BATCH_SIZE = 5000
+
+
+def validate_row(model: Type[BaseModel], row, number: int) -> BaseModel:
+    """Валидация одной строки пакета"""
+    try:
+        return model.model_validate(row)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail={"row": number, "errors": e.errors()})
+
+
+async def iter_ndjson(request: Request) -> AsyncIterator:
+    """Построчное чтение NDJSON из потока запроса"""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if buffer.strip():
+        yield json.loads(buffer)
+
+
+async def iter_json(request: Request) -> AsyncIterator:
+    """Чтение JSON-массива из тела запроса"""
+    rows = await request.json()
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=422, detail="Expected a JSON array")
+    for row in rows:
+        yield row
+
+
+async def read_bulk_rows(request: Request, model: Type[BaseModel]) -> AsyncIterator[List[BaseModel]]:
+    """Читает тело запроса (JSON-массив или NDJSON) и отдаёт провалидированные строки пачками"""
+    content_type = request.headers.get("content-type", "")
+    rows = iter_ndjson(request) if "ndjson" in content_type else iter_json(request)
+
+    batch = []
+    number = 0
+    try:
+        async for row in rows:
+            batch.append(validate_row(model, row, number))
+            number += 1
+            if len(batch) >= BULK_BATCH_SIZE:
+                yield batch
+                batch = []
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail={"row": number, "error": str(e)})
+    if batch:
+        yield batch
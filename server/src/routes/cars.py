@@ -1,42 +1,47 @@
-from fastapi import APIRouter, HTTPException
-from random import Random
+from fastapi import APIRouter, HTTPException, Query, Request, Depends, Response
+from typing import List, Optional
 from server.src.database.requests import (
     CREATE_CAR,
     UPDATE_CAR,
     DELETE_CAR,
     GET_CAR,
-    GET_ALL_CARS,
-    GET_RANDOM_APP_NUMBER
+    GET_CAR_EXPANDED,
+    GET_CARS_PAGE,
+    GET_CARS_PAGE_EXPANDED,
+    COUNT_CARS,
+    GET_CAR_VERSION,
+    GET_CARS_FOR_UPDATE,
+    DELETE_CARS
 )
-from server.src.database.db import db, Database
-from string import ascii_uppercase, digits
-import random
+from server.src.database.db import db
+from server.src.database.key_pool import key_pool
+from server.src.models.bulk import BulkResult
+from server.src.routes.bulk import read_bulk_rows
+from server.src.routes.batch import delete_batch, update_batch
+from server.src.models.batch import BatchDelete, BatchResult, BatchUpdate
+from server.src.routes.streaming import StreamFormat, stream_records
+from server.src.routes.conditional import row_etag, table_etag
+from server.src.routes.expand import expand_param, expanded_fields
+from server.src.routes.fields import fields_param, narrowed_query
+from server.src.routes.filters import contains_pattern
+from server.src.routes.serialization import encode_records, records_response
 from server.src.models.car import (
     CarResponse,
     CarBase,
-    CarList
+    CarDetail,
+    CarDetailList
 )
 
 router = APIRouter(prefix="/cars", tags=["cars"])
 
-async def get_random_app_number(db: Database) -> int:
-    """Получает случайный app_number из таблицы client"""
-    records = await db.fetch_all(GET_RANDOM_APP_NUMBER)
-    return Random().choice([record['app_number'] for record in records])
-
-async def generate_random_vin() -> str:
-    allowed_letters = [c for c in ascii_uppercase if c not in 'IOQ']
-    allowed_chars = allowed_letters + list(digits)
-    vin = ''.join(random.choice(allowed_chars) for _ in range(17))
-    return vin
+# Связи для ?expand=
+EXPAND = ("client",)
 
 @router.post("/", response_model=CarResponse)
 async def create_car(car: CarBase):
-    app_number = await get_random_app_number(db)
-    number_vin = await generate_random_vin()
+    app_number = await key_pool.sample("client")
     new_car = await db.execute_returning(
         CREATE_CAR,
-        number_vin,
         car.complectation,
         car.color,
         car.mark,
@@ -44,18 +49,97 @@ async def create_car(car: CarBase):
         car.year_create,
         app_number
     )
+    key_pool.add("car", new_car["number_vin"])
     return CarResponse(**new_car)
 
-@router.get("/", response_model=CarList)
-async def get_all_cars():
-    records = await db.fetch_all(GET_ALL_CARS)
-    return CarList(
-        cars=[CarResponse(**car) for car in records]
+@router.get("/", response_model=CarDetailList, dependencies=[Depends(table_etag("car", expand=EXPAND))])
+async def get_all_cars(
+    response: Response,
+    after: str = "",
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+    search: Optional[str] = None,
+    total: bool = False,
+    stream: Optional[StreamFormat] = None,
+    expand: List[str] = Depends(expand_param(*EXPAND)),
+    fields: Optional[List[str]] = Depends(fields_param(CarDetail))
+):
+    """Страница автомобилей после number_vin = after; без limit - все записи.
+
+    expand=client добавляет поля клиента из того же запроса, fields оставляет
+    только перечисленные поля (number_vin для next_after выбирается всегда).
+    """
+    pattern = contains_pattern(search)
+    query, columns = narrowed_query(
+        GET_CARS_PAGE_EXPANDED if expand else GET_CARS_PAGE,
+        expanded_fields(CarResponse, expand),
+        fields,
+        key="number_vin"
+    )
+    if stream:
+        return stream_records(stream, query, after, pattern, limit, fields=columns)
+    records = await db.fetch_all(query, after, pattern, limit)
+    extra = {"next_after": None, "total": None}
+    if limit and len(records) == limit:
+        extra["next_after"] = records[-1]["number_vin"]
+    if total:
+        count = await db.fetch_one(COUNT_CARS, pattern)
+        extra["total"] = count["count"]
+    return records_response(encode_records("cars", CarDetail, records, columns, **extra), response)
+
+@router.post("/bulk", response_model=BulkResult)
+async def create_cars_bulk(request: Request):
+    """Массовое создание из JSON-массива или NDJSON через COPY (VIN выдаёт БД)"""
+    async def batches():
+        async for cars in read_bulk_rows(request, CarBase):
+            yield [
+                (
+                    car.complectation,
+                    car.color,
+                    car.mark,
+                    car.model,
+                    car.year_create,
+                    await key_pool.sample("client")
+                )
+                for car in cars
+            ]
+
+    inserted = await db.copy_records(
+        "car",
+        [
+            "complectation",
+            "color",
+            "mark",
+            "model",
+            "year_create",
+            "app_number"
+        ],
+        batches()
     )
+    key_pool.invalidate("car")
+    return BulkResult(inserted=inserted)
+
+@router.patch("/batch", response_model=BatchResult)
+async def update_cars_batch(batch: BatchUpdate):
+    """Частичное обновление автомобилей одной транзакцией (executemany)"""
+    return await update_batch(
+        batch, GET_CARS_FOR_UPDATE, UPDATE_CAR, "number_vin",
+        ("complectation", "color", "mark", "model", "year_create",
+         "app_number"),
+        CarResponse, cast=str
+    )
+
+@router.delete("/batch", response_model=BatchResult)
+async def delete_cars_batch(batch: BatchDelete):
+    """Удаление автомобилей по списку ключей одним запросом"""
+    result = await delete_batch(batch, DELETE_CARS, cast=str)
+    for row in result.results:
+        if row.status == "deleted":
+            key_pool.discard("car", row.key)
+    return result
 
 @router.put("/{number_vin}", response_model=CarResponse)
 async def update_car(number_vin: str, car: CarBase):
-    app_number = await get_random_app_number(db)
+    app_number = await key_pool.sample("client")
     updated_car = await db.execute_returning(
         UPDATE_CAR,
         car.complectation,
@@ -68,12 +152,18 @@ async def update_car(number_vin: str, car: CarBase):
     )
     return CarResponse(**updated_car)
 
-@router.get("/{number_vin}", response_model=CarResponse)
-async def get_car(number_vin: str):
-    car = await db.fetch_one(GET_CAR, number_vin)
-    return CarResponse(**car)
+@router.get(
+    "/{number_vin}",
+    response_model=CarDetail,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(row_etag("car", GET_CAR_VERSION, "number_vin", cast=str, expand=EXPAND))]
+)
+async def get_car(number_vin: str, expand: List[str] = Depends(expand_param(*EXPAND))):
+    car = await db.fetch_one(GET_CAR_EXPANDED if expand else GET_CAR, number_vin)
+    return CarDetail(**{name: car[name] for name in expanded_fields(CarResponse, expand)})
 
 @router.delete("/{number_vin}")
 async def delete_director(number_vin: str):
     await db.execute_returning(DELETE_CAR, number_vin)
+    key_pool.discard("car", number_vin)
     return "Car deleted successful"
\ No newline at end of file
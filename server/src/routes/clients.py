@@ -1,12 +1,26 @@
-from fastapi import APIRouter
+from typing import List, Optional
+from fastapi import APIRouter, Request, Depends, Response
 from server.src.database.requests import (
     CREATE_CLIENT,
     UPDATE_CLIENT,
     DELETE_CLIENT,
     GET_CLIENT,
-    GET_ALL_CLIENTS
+    GET_ALL_CLIENTS,
+    GET_CLIENT_VERSION,
+    GET_CLIENTS_FOR_UPDATE,
+    DELETE_CLIENTS
 )
 from server.src.database.db import db
+from server.src.database.key_pool import key_pool
+from server.src.database.cache import reference_cache
+from server.src.models.bulk import BulkResult
+from server.src.routes.bulk import read_bulk_rows
+from server.src.routes.batch import delete_batch, update_batch
+from server.src.models.batch import BatchDelete, BatchResult, BatchUpdate
+from server.src.routes.streaming import StreamFormat, stream_records
+from server.src.routes.conditional import row_etag, table_etag
+from server.src.routes.fields import fields_param, narrowed_query
+from server.src.routes.serialization import encode_records, records_response
 from server.src.models.client import (
     ClientResponse,
     ClientBase,
@@ -23,8 +37,53 @@ async def create_client(client: ClientBase):
         client.current_car,
         client.prefer_car
     )
+    key_pool.add("client", new_client["app_number"])
+    await reference_cache.invalidate("client", new_client["app_number"])
     return ClientResponse(**new_client)
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_clients_bulk(request: Request):
+    """Массовое создание из JSON-массива или NDJSON через COPY"""
+    async def batches():
+        async for clients in read_bulk_rows(request, ClientBase):
+            yield [
+                (
+                    client.budget,
+                    client.current_car,
+                    client.prefer_car
+                )
+                for client in clients
+            ]
+
+    inserted = await db.copy_records(
+        "client",
+        ["budget", "current_car", "prefer_car"],
+        batches()
+    )
+    key_pool.invalidate("client")
+    await reference_cache.invalidate("client")
+    return BulkResult(inserted=inserted)
+
+@router.patch("/batch", response_model=BatchResult)
+async def update_clients_batch(batch: BatchUpdate):
+    """Частичное обновление клиентов одной транзакцией (executemany)"""
+    result = await update_batch(
+        batch, GET_CLIENTS_FOR_UPDATE, UPDATE_CLIENT, "app_number",
+        ("budget", "current_car", "prefer_car"), ClientBase
+    )
+    await reference_cache.invalidate("client")
+    return result
+
+@router.delete("/batch", response_model=BatchResult)
+async def delete_clients_batch(batch: BatchDelete):
+    """Удаление клиентов по списку ключей одним запросом"""
+    result = await delete_batch(batch, DELETE_CLIENTS)
+    for row in result.results:
+        if row.status == "deleted":
+            key_pool.discard("client", row.key)
+    await reference_cache.invalidate("client")
+    return result
+
 @router.put("/{app_number}", response_model=ClientResponse)
 async def update_client(app_number: int, client: ClientBase):
     updated_client = await db.execute_returning(
@@ -34,21 +93,41 @@ async def update_client(app_number: int, client: ClientBase):
         client.prefer_car,
         app_number
     )
+    await reference_cache.invalidate("client", app_number)
     return ClientResponse(**updated_client)
 
-@router.get("/{app_number}", response_model=ClientResponse)
+@router.get(
+    "/{app_number}",
+    response_model=ClientResponse,
+    dependencies=[Depends(row_etag("client", GET_CLIENT_VERSION, "app_number"))]
+)
 async def get_client(app_number: int):
-    client = await db.fetch_one(GET_CLIENT, app_number)
-    return ClientResponse(**client)
-
-@router.get("/", response_model=ClientList)
-async def get_all_clients():
-    records = await db.fetch_all(GET_ALL_CLIENTS)
-    return ClientList(
-        clients=[ClientResponse(**client) for client in records]
-    )
+    async def load():
+        client = await db.fetch_one(GET_CLIENT, app_number)
+        return ClientResponse(**client)
+
+    return await reference_cache.get_or_load("client", GET_CLIENT, (app_number,), load)
+
+@router.get("/", response_model=ClientList, dependencies=[Depends(table_etag("client"))])
+async def get_all_clients(
+    response: Response,
+    stream: Optional[StreamFormat] = None,
+    fields: Optional[List[str]] = Depends(fields_param(ClientResponse))
+):
+    """Все записи; fields оставляет в запросе и ответе только перечисленные поля"""
+    query, columns = narrowed_query(GET_ALL_CLIENTS, list(ClientResponse.model_fields), fields)
+    if stream:
+        return stream_records(stream, query, fields=columns)
+    async def load():
+        records = await db.fetch_all(query)
+        return encode_records("clients", ClientResponse, records, columns)
+
+    body = await reference_cache.get_or_load("client", query, (), load)
+    return records_response(body, response)
 
 @router.delete("/{app_number}")
 async def delete_client(app_number: int):
     await db.execute_returning(DELETE_CLIENT, app_number)
+    key_pool.discard("client", app_number)
+    await reference_cache.invalidate("client", app_number)
     return "Client deleted successful"
\ No newline at end of file
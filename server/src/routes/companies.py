@@ -1,11 +1,15 @@
 from random import randint
-from fastapi import APIRouter
+from typing import List, Optional
+from fastapi import APIRouter, Request, Depends, Response
 from server.src.database.requests import (
     CREATE_COMPANY,
     GET_COMPANY,
     GET_ALL_COMPANIES,
     DELETE_COMPANY,
-    UPDATE_COMPANY
+    UPDATE_COMPANY,
+    GET_COMPANY_VERSION,
+    GET_COMPANIES_FOR_UPDATE,
+    DELETE_COMPANIES
 )
 from server.src.models.company import (
     CompanyBase,
@@ -13,6 +17,16 @@ from server.src.models.company import (
     CompanyList
 )
 from server.src.database.db import db
+from server.src.database.key_pool import key_pool
+from server.src.database.cache import reference_cache
+from server.src.models.bulk import BulkResult
+from server.src.routes.bulk import read_bulk_rows
+from server.src.routes.batch import delete_batch, update_batch
+from server.src.models.batch import BatchDelete, BatchResult, BatchUpdate
+from server.src.routes.streaming import StreamFormat, stream_records
+from server.src.routes.conditional import row_etag, table_etag
+from server.src.routes.fields import fields_param, narrowed_query
+from server.src.routes.serialization import encode_records, records_response
 
 router = APIRouter(prefix="/companies", tags=["companies"])
 
@@ -28,8 +42,54 @@ async def create_company(company: CompanyBase):
         company.name_company,
         company.address
     )
+    key_pool.add("company", new_company["inn"])
+    await reference_cache.invalidate("company", new_company["inn"])
     return CompanyResponse(**new_company)
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_companies_bulk(request: Request):
+    """Массовое создание из JSON-массива или NDJSON через COPY"""
+    async def batches():
+        async for companies in read_bulk_rows(request, CompanyBase):
+            yield [
+                (
+                    generate_random_inn(),
+                    company.name_company,
+                    company.address
+                )
+                for company in companies
+            ]
+
+    inserted = await db.copy_records(
+        "company",
+        ["inn", "name_company", "address"],
+        batches()
+    )
+    key_pool.invalidate("company")
+    await reference_cache.invalidate("company")
+    return BulkResult(inserted=inserted)
+
+@router.patch("/batch", response_model=BatchResult)
+async def update_companies_batch(batch: BatchUpdate):
+    """Частичное обновление компаний одной транзакцией (executemany)"""
+    result = await update_batch(
+        batch, GET_COMPANIES_FOR_UPDATE, UPDATE_COMPANY, "inn",
+        ("name_company", "address"), CompanyBase
+    )
+    await reference_cache.invalidate("company")
+    return result
+
+@router.delete("/batch", response_model=BatchResult)
+async def delete_companies_batch(batch: BatchDelete):
+    """Удаление компаний по списку ключей одним запросом"""
+    result = await delete_batch(batch, DELETE_COMPANIES)
+    for row in result.results:
+        if row.status == "deleted":
+            key_pool.discard("company", row.key)
+    await reference_cache.invalidate("company")
+    await reference_cache.invalidate("director")
+    return result
+
 @router.put("/{inn}", response_model=CompanyResponse)
 async def update_company(inn: int, company: CompanyBase):
     updated_company = await db.execute_returning(
@@ -38,21 +98,43 @@ async def update_company(inn: int, company: CompanyBase):
         company.address,
         inn
     )
+    await reference_cache.invalidate("company", inn)
     return CompanyResponse(**updated_company)
 
-@router.get("/{inn}", response_model=CompanyResponse)
+@router.get(
+    "/{inn}",
+    response_model=CompanyResponse,
+    dependencies=[Depends(row_etag("company", GET_COMPANY_VERSION, "inn"))]
+)
 async def get_company(inn: int):
-    company = await db.fetch_one(GET_COMPANY, inn)
-    return CompanyResponse(**company)
-
-@router.get("/", response_model=CompanyList)
-async def get_all_companies():
-    records = await db.fetch_all(GET_ALL_COMPANIES)
-    return CompanyList(
-        companies=[CompanyResponse(**company) for company in records]
-    )
+    async def load():
+        company = await db.fetch_one(GET_COMPANY, inn)
+        return CompanyResponse(**company)
+
+    return await reference_cache.get_or_load("company", GET_COMPANY, (inn,), load)
+
+@router.get("/", response_model=CompanyList, dependencies=[Depends(table_etag("company"))])
+async def get_all_companies(
+    response: Response,
+    stream: Optional[StreamFormat] = None,
+    fields: Optional[List[str]] = Depends(fields_param(CompanyResponse))
+):
+    """Все записи; fields оставляет в запросе и ответе только перечисленные поля"""
+    query, columns = narrowed_query(GET_ALL_COMPANIES, list(CompanyResponse.model_fields), fields)
+    if stream:
+        return stream_records(stream, query, fields=columns)
+    async def load():
+        records = await db.fetch_all(query)
+        return encode_records("companies", CompanyResponse, records, columns)
+
+    body = await reference_cache.get_or_load("company", query, (), load)
+    return records_response(body, response)
 
 @router.delete("/{inn}")
 async def delete_company(inn: int):
     await db.execute_returning(DELETE_COMPANY, inn)
+    key_pool.discard("company", inn)
+    await reference_cache.invalidate("company", inn)
+    # director.inn_company ссылается на компанию, закэшированные директора могли измениться
+    await reference_cache.invalidate("director")
     return "Company deleted successful"
\ No newline at end of file
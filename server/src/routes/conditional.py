@@ -0,0 +1,66 @@
+import hashlib
+from typing import Callable, Dict, Optional, Sequence
+from fastapi import Request, Response
+from server.src.database.versions import get_row_version, get_table_versions
+from server.src.routes.expand import expanded_tables
+
+
+class NotModified(Exception):
+    """Клиентская копия актуальна, отвечаем 304"""
+
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def apply_etag(request: Request, response: Response, etag: str):
+    if etag_matches(request, etag):
+        raise NotModified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def table_versions_tag(versions: Dict[str, int]) -> str:
+    return ".".join(f"{table}.{version}" for table, version in versions.items())
+
+
+def table_etag(table: str, expand: Sequence[str] = ()) -> Callable:
+    """Зависимость для списков: ETag из версии таблицы и параметров запроса.
+
+    expand - связи, которые список может развернуть (?expand=): их таблицы
+    тоже входят в ETag, когда связь запрошена.
+    """
+    async def dependency(request: Request, response: Response):
+        versions = await get_table_versions([table, *expanded_tables(request, expand)])
+        params = hashlib.blake2b(request.url.query.encode(), digest_size=6).hexdigest()
+        apply_etag(request, response, f'W/"{table_versions_tag(versions)}.{params}"')
+    return dependency
+
+
+def row_etag(table: str, query: str, param: str, cast: Callable = int, expand: Sequence[str] = ()) -> Callable:
+    """Зависимость для одной записи: ETag из xmin строки (и версий таблиц развёрнутых связей)"""
+    async def dependency(request: Request, response: Response):
+        try:
+            key = cast(request.path_params[param])
+        except (KeyError, ValueError):
+            return
+        version: Optional[str] = await get_row_version(query, key)
+        if version is None:
+            return
+        etag = f"{table}.{key}.{version}"
+        related = expanded_tables(request, expand)
+        if related:
+            etag += "." + table_versions_tag(await get_table_versions(related))
+        apply_etag(request, response, f'W/"{etag}"')
+    return dependency
+
+
+def not_modified_handler(_: Request, exc: NotModified) -> Response:
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": "no-cache"})
@@ -1,27 +1,41 @@
-from random import Random
 from random import randint
-from fastapi import APIRouter
+from typing import List, Optional
+from fastapi import APIRouter, Request, Depends, Response
 from server.src.database.requests import (
     CREATE_DIRECTOR,
     UPDATE_DIRECTOR,
     DELETE_DIRECTOR,
     GET_DIRECTOR,
+    GET_DIRECTOR_EXPANDED,
     GET_ALL_DIRECTORS,
-    GET_RANDOM_INN
+    GET_ALL_DIRECTORS_EXPANDED,
+    GET_DIRECTOR_VERSION,
+    GET_DIRECTORS_FOR_UPDATE,
+    DELETE_DIRECTORS
 )
-from server.src.database.db import db, Database
+from server.src.database.db import db
+from server.src.database.key_pool import key_pool
+from server.src.database.cache import reference_cache
+from server.src.models.bulk import BulkResult
+from server.src.routes.bulk import read_bulk_rows
+from server.src.routes.batch import delete_batch, update_batch
+from server.src.models.batch import BatchDelete, BatchResult, BatchUpdate
+from server.src.routes.streaming import StreamFormat, stream_records
+from server.src.routes.conditional import row_etag, table_etag
+from server.src.routes.expand import expand_param, expanded_fields
+from server.src.routes.fields import fields_param, narrowed_query
+from server.src.routes.serialization import encode_records, records_response
 from server.src.models.director import (
     DirectorBase,
     DirectorResponse,
-    DirectorList
+    DirectorDetail,
+    DirectorDetailList
 )
 
 router = APIRouter(prefix="/directors", tags=["directors"])
 
-async def get_random_inn(db: Database) -> int:
-    """Получает случайный ИНН из таблицы company"""
-    records = await db.fetch_all(GET_RANDOM_INN)
-    return Random().choice([record['inn'] for record in records])
+# Связи для ?expand=
+EXPAND = ("company",)
 
 def generate_random_inn() -> int:
     """Генерирует рандомный ИНН"""
@@ -30,7 +44,7 @@ def generate_random_inn() -> int:
 @router.post("/", response_model=DirectorResponse)
 async def create_director(director: DirectorBase):
     inn = generate_random_inn()
-    inn_company = await get_random_inn(db)
+    inn_company = await key_pool.sample("company")
     new_director = await db.execute_returning(
         CREATE_DIRECTOR,
         inn,
@@ -40,11 +54,66 @@ async def create_director(director: DirectorBase):
         director.lastname,
         inn_company
     )
+    key_pool.add("director", new_director["inn"])
+    await reference_cache.invalidate("director", new_director["inn"])
     return DirectorResponse(**new_director)
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_directors_bulk(request: Request):
+    """Массовое создание из JSON-массива или NDJSON через COPY"""
+    async def batches():
+        async for directors in read_bulk_rows(request, DirectorBase):
+            yield [
+                (
+                    generate_random_inn(),
+                    director.profit,
+                    director.surname,
+                    director.firstname,
+                    director.lastname,
+                    await key_pool.sample("company")
+                )
+                for director in directors
+            ]
+
+    inserted = await db.copy_records(
+        "director",
+        [
+            "inn",
+            "profit",
+            "surname",
+            "firstname",
+            "lastname",
+            "inn_company"
+        ],
+        batches()
+    )
+    key_pool.invalidate("director")
+    await reference_cache.invalidate("director")
+    return BulkResult(inserted=inserted)
+
+@router.patch("/batch", response_model=BatchResult)
+async def update_directors_batch(batch: BatchUpdate):
+    """Частичное обновление директоров одной транзакцией (executemany)"""
+    result = await update_batch(
+        batch, GET_DIRECTORS_FOR_UPDATE, UPDATE_DIRECTOR, "inn",
+        ("profit", "surname", "firstname", "lastname", "inn_company"), DirectorResponse
+    )
+    await reference_cache.invalidate("director")
+    return result
+
+@router.delete("/batch", response_model=BatchResult)
+async def delete_directors_batch(batch: BatchDelete):
+    """Удаление директоров по списку ключей одним запросом"""
+    result = await delete_batch(batch, DELETE_DIRECTORS)
+    for row in result.results:
+        if row.status == "deleted":
+            key_pool.discard("director", row.key)
+    await reference_cache.invalidate("director")
+    return result
+
 @router.put("/{inn}", response_model=DirectorResponse)
 async def update_director(inn: int, director: DirectorBase):
-    inn_company = await get_random_inn(db)
+    inn_company = await key_pool.sample("company")
     updated_director = await db.execute_returning(
         UPDATE_DIRECTOR,
         director.profit,
@@ -54,21 +123,59 @@ async def update_director(inn: int, director: DirectorBase):
         inn_company,
         inn
     )
+    await reference_cache.invalidate("director", inn)
     return DirectorResponse(**updated_director)
 
-@router.get("/{inn}", response_model=DirectorResponse)
-async def get_director(inn: int):
-    director = await db.fetch_one(GET_DIRECTOR, inn)
-    return DirectorResponse(**director)
+@router.get(
+    "/{inn}",
+    response_model=DirectorDetail,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(row_etag("director", GET_DIRECTOR_VERSION, "inn", expand=EXPAND))]
+)
+async def get_director(inn: int, expand: List[str] = Depends(expand_param(*EXPAND))):
+    if expand:
+        # Развёрнутая запись зависит и от компании, поэтому мимо кэша справочника
+        director = await db.fetch_one(GET_DIRECTOR_EXPANDED, inn)
+        return DirectorDetail(**{name: director[name] for name in expanded_fields(DirectorResponse, expand)})
+
+    async def load():
+        director = await db.fetch_one(GET_DIRECTOR, inn)
+        return DirectorResponse(**director)
+
+    return await reference_cache.get_or_load("director", GET_DIRECTOR, (inn,), load)
 
-@router.get("/", response_model=DirectorList)
-async def get_all_directors():
-    records = await db.fetch_all(GET_ALL_DIRECTORS)
-    return DirectorList(
-        directors=[DirectorResponse(**director) for director in records]
+@router.get("/", response_model=DirectorDetailList, dependencies=[Depends(table_etag("director", expand=EXPAND))])
+async def get_all_directors(
+    response: Response,
+    stream: Optional[StreamFormat] = None,
+    expand: List[str] = Depends(expand_param(*EXPAND)),
+    fields: Optional[List[str]] = Depends(fields_param(DirectorDetail))
+):
+    """Все директора; expand=company добавляет поля компании из одного JOIN-запроса (без кэша).
+
+    fields оставляет в запросе и ответе только перечисленные поля.
+    """
+    query, columns = narrowed_query(
+        GET_ALL_DIRECTORS_EXPANDED if expand else GET_ALL_DIRECTORS,
+        expanded_fields(DirectorResponse, expand),
+        fields
     )
+    if stream:
+        return stream_records(stream, query, fields=columns)
+    if expand:
+        records = await db.fetch_all(query)
+        return records_response(encode_records("directors", DirectorDetail, records, columns), response)
+
+    async def load():
+        records = await db.fetch_all(query)
+        return encode_records("directors", DirectorResponse, records, columns)
+
+    body = await reference_cache.get_or_load("director", query, (), load)
+    return records_response(body, response)
 
 @router.delete("/{inn}")
 async def delete_director(inn: int):
     await db.execute_returning(DELETE_DIRECTOR, inn)
+    key_pool.discard("director", inn)
+    await reference_cache.invalidate("director", inn)
     return "Director deleted successful"
\ No newline at end of file
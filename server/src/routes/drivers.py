@@ -1,46 +1,95 @@
-from fastapi import APIRouter
-from random import Random
+from typing import List, Optional
+from fastapi import APIRouter, Request, Depends, Response
 from server.src.database.requests import (
     CREATE_DRIVER,
     UPDATE_DRIVER,
     DELETE_DRIVER,
     GET_DRIVER,
+    GET_DRIVER_EXPANDED,
     GET_ALL_DRIVERS,
+    GET_ALL_DRIVERS_EXPANDED,
     GET_AVAILABLE_DRIVERS,
-    GET_RANDOM_NUMBER_VIN
+    GET_DRIVER_VERSION,
+    GET_DRIVERS_FOR_UPDATE,
+    DELETE_DRIVERS
 )
-from server.src.database.db import db, Database
+from server.src.database.db import db
+from server.src.database.key_pool import key_pool
+from server.src.models.bulk import BulkResult
+from server.src.routes.bulk import read_bulk_rows
+from server.src.routes.roles import claim_worker, claim_workers, copy_roles
+from server.src.routes.batch import delete_batch, update_batch
+from server.src.models.batch import BatchDelete, BatchResult, BatchUpdate
+from server.src.routes.streaming import StreamFormat, stream_records
+from server.src.routes.conditional import row_etag, table_etag
+from server.src.routes.expand import expand_param, expanded_fields
+from server.src.routes.fields import fields_param, narrowed_query
+from server.src.routes.serialization import encode_records, records_response
 from server.src.models.driver import (
     DriverResponse,
     DriverBase,
-    DriverList
+    DriverDetail,
+    DriverDetailList
 )
 
 router = APIRouter(prefix="/drivers", tags=["drivers"])
 
-async def get_random_number_vin(db: Database) -> str:
-    """Получает случайный VIN-номер из таблицы car"""
-    records = await db.fetch_all(GET_RANDOM_NUMBER_VIN)
-    return Random().choice([record['number_vin'] for record in records])
-
+# Связи для ?expand=
+EXPAND = ("worker", "car")
 
 @router.post("/", response_model=DriverResponse)
 async def create_driver(driver: DriverBase):
-    available_workers = await db.fetch_all(GET_AVAILABLE_DRIVERS)
-    selected_worker = available_workers[0]
-    number_vin = await get_random_number_vin(db)
-    new_driver = await db.execute_returning(
+    number_vin = await key_pool.sample("car")
+    new_driver = await claim_worker(
         CREATE_DRIVER,
-        selected_worker['worker_id'],
         driver.car_number,
         driver.snacks,
         number_vin
     )
     return DriverResponse(**new_driver)
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_drivers_bulk(request: Request):
+    """Массовое создание из JSON-массива или NDJSON через COPY"""
+    # Ключи выбираются до COPY: внутри него второе соединение из пула не берётся
+    sample_key = await key_pool.sampler("car")
+
+    async def batches():
+        async for drivers in read_bulk_rows(request, DriverBase):
+            worker_ids = await claim_workers(GET_AVAILABLE_DRIVERS, len(drivers))
+            yield [
+                (
+                    worker_id,
+                    driver.car_number,
+                    driver.snacks,
+                    sample_key()
+                )
+                for worker_id, driver in zip(worker_ids, drivers)
+            ]
+
+    inserted = await copy_roles(
+        "driver",
+        ["worker_id", "car_number", "snacks", "number_vin"],
+        batches()
+    )
+    return BulkResult(inserted=inserted)
+
+@router.patch("/batch", response_model=BatchResult)
+async def update_drivers_batch(batch: BatchUpdate):
+    """Частичное обновление водителей одной транзакцией (executemany)"""
+    return await update_batch(
+        batch, GET_DRIVERS_FOR_UPDATE, UPDATE_DRIVER, "worker_id",
+        ("car_number", "snacks", "number_vin"), DriverResponse
+    )
+
+@router.delete("/batch", response_model=BatchResult)
+async def delete_drivers_batch(batch: BatchDelete):
+    """Удаление водителей по списку ключей одним запросом"""
+    return await delete_batch(batch, DELETE_DRIVERS)
+
 @router.put("/{worker_id}", response_model=DriverResponse)
 async def update_driver(worker_id: int, driver: DriverBase):
-    number_vin = await get_random_number_vin(db)
+    number_vin = await key_pool.sample("car")
     updated_driver = await db.execute_returning(
         UPDATE_DRIVER,
         driver.car_number,
@@ -50,17 +99,36 @@ async def update_driver(worker_id: int, driver: DriverBase):
     )
     return DriverResponse(**updated_driver)
 
-@router.get("/{worker_id}", response_model=DriverResponse)
-async def get_driver(worker_id: int):
-    driver = await db.fetch_one(GET_DRIVER, worker_id)
-    return DriverResponse(**driver)
+@router.get(
+    "/{worker_id}",
+    response_model=DriverDetail,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(row_etag("driver", GET_DRIVER_VERSION, "worker_id", expand=EXPAND))]
+)
+async def get_driver(worker_id: int, expand: List[str] = Depends(expand_param(*EXPAND))):
+    driver = await db.fetch_one(GET_DRIVER_EXPANDED if expand else GET_DRIVER, worker_id)
+    return DriverDetail(**{name: driver[name] for name in expanded_fields(DriverResponse, expand)})
+
+@router.get("/", response_model=DriverDetailList, dependencies=[Depends(table_etag("driver", expand=EXPAND))])
+async def get_all_drivers(
+    response: Response,
+    stream: Optional[StreamFormat] = None,
+    expand: List[str] = Depends(expand_param(*EXPAND)),
+    fields: Optional[List[str]] = Depends(fields_param(DriverDetail))
+):
+    """Все записи; expand добавляет поля связанных таблиц из одного JOIN-запроса.
 
-@router.get("/", response_model=DriverList)
-async def get_all_drivers():
-    records = await db.fetch_all(GET_ALL_DRIVERS)
-    return DriverList(
-        drivers=[DriverResponse(**driver) for driver in records]
+    fields оставляет в запросе и ответе только перечисленные поля.
+    """
+    query, columns = narrowed_query(
+        GET_ALL_DRIVERS_EXPANDED if expand else GET_ALL_DRIVERS,
+        expanded_fields(DriverResponse, expand),
+        fields
     )
+    if stream:
+        return stream_records(stream, query, fields=columns)
+    records = await db.fetch_all(query)
+    return records_response(encode_records("drivers", DriverDetail, records, columns), response)
 
 @router.delete("/{worker_id}")
 async def delete_driver(worker_id: int):
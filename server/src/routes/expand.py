@@ -0,0 +1,61 @@
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Type
+from fastapi import HTTPException, Query, Request
+from pydantic import BaseModel
+from server.src.models.expand import AdmissionFields, CarFields, ClientFields, CompanyFields, WorkerFields
+
+
+class Relation(NamedTuple):
+    """Связь, которую можно развернуть: таблица (для ETag) и поля, которые она добавляет"""
+    table: str
+    model: Type[BaseModel]
+
+
+RELATIONS: Dict[str, Relation] = {
+    "worker": Relation("workers", WorkerFields),
+    "client": Relation("client", ClientFields),
+    "company": Relation("company", CompanyFields),
+    "car": Relation("car", CarFields),
+    "admission": Relation("admission_journal", AdmissionFields),
+}
+
+
+def split_names(value: Optional[str]) -> List[str]:
+    names: List[str] = []
+    for name in (value or "").split(","):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def expand_param(*allowed: str) -> Callable:
+    """Зависимость: связи из ?expand=worker,client (только из allowed, иначе 422)"""
+    description = f"Связи через запятую: {', '.join(allowed)}"
+
+    def dependency(expand: Optional[str] = Query(default=None, description=description)) -> List[str]:
+        names = split_names(expand)
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown expand: {', '.join(unknown)}; allowed: {', '.join(allowed)}"
+            )
+        return names
+    return dependency
+
+
+def expanded_tables(request: Request, allowed: Sequence[str]) -> List[str]:
+    """Таблицы развёрнутых связей запроса - для ETag (неизвестные имена отклонит expand_param)"""
+    return [
+        RELATIONS[name].table
+        for name in split_names(request.query_params.get("expand"))
+        if name in allowed
+    ]
+
+
+def expanded_fields(model: Type[BaseModel], expand: Sequence[str]) -> List[str]:
+    """Поля ответа: поля модели записи и поля развёрнутых связей"""
+    fields = list(model.model_fields)
+    for name in expand:
+        fields.extend(RELATIONS[name].model.model_fields)
+    return fields
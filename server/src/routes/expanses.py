@@ -1,12 +1,26 @@
-from fastapi import APIRouter
+from typing import List, Optional
+from fastapi import APIRouter, Request, Depends, Response
 from server.src.database.requests import (
     CREATE_EXPANSE,
     UPDATE_EXPANSE,
     DELETE_EXPANSE,
     GET_EXPANSE,
-    GET_ALL_EXPANSES
+    GET_ALL_EXPANSES,
+    GET_EXPANSE_VERSION,
+    GET_EXPANSES_FOR_UPDATE,
+    DELETE_EXPANSES
 )
 from server.src.database.db import db
+from server.src.database.key_pool import key_pool
+from server.src.database.cache import reference_cache
+from server.src.models.bulk import BulkResult
+from server.src.routes.bulk import read_bulk_rows
+from server.src.routes.batch import delete_batch, update_batch
+from server.src.models.batch import BatchDelete, BatchResult, BatchUpdate
+from server.src.routes.streaming import StreamFormat, stream_records
+from server.src.routes.conditional import row_etag, table_etag
+from server.src.routes.fields import fields_param, narrowed_query
+from server.src.routes.serialization import encode_records, records_response
 from server.src.models.expanse_journal import (
     ExpanseResponse,
     ExpanseBase,
@@ -23,8 +37,53 @@ async def create_expanse(expanse: ExpanseBase):
         expanse.expanse_sum,
         expanse.expanse_name
     )
+    key_pool.add("expanse_journal", new_expanse["id_expanse"])
+    await reference_cache.invalidate("expanse_journal", new_expanse["id_expanse"])
     return ExpanseResponse(**new_expanse)
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_expanses_bulk(request: Request):
+    """Массовое создание из JSON-массива или NDJSON через COPY"""
+    async def batches():
+        async for expanses in read_bulk_rows(request, ExpanseBase):
+            yield [
+                (
+                    expanse.expanse_type,
+                    expanse.expanse_sum,
+                    expanse.expanse_name
+                )
+                for expanse in expanses
+            ]
+
+    inserted = await db.copy_records(
+        "expanse_journal",
+        ["expanse_type", "expanse_sum", "expanse_name"],
+        batches()
+    )
+    key_pool.invalidate("expanse_journal")
+    await reference_cache.invalidate("expanse_journal")
+    return BulkResult(inserted=inserted)
+
+@router.patch("/batch", response_model=BatchResult)
+async def update_expanses_batch(batch: BatchUpdate):
+    """Частичное обновление расходов одной транзакцией (executemany)"""
+    result = await update_batch(
+        batch, GET_EXPANSES_FOR_UPDATE, UPDATE_EXPANSE, "id_expanse",
+        ("expanse_type", "expanse_sum", "expanse_name"), ExpanseBase
+    )
+    await reference_cache.invalidate("expanse_journal")
+    return result
+
+@router.delete("/batch", response_model=BatchResult)
+async def delete_expanses_batch(batch: BatchDelete):
+    """Удаление расходов по списку ключей одним запросом"""
+    result = await delete_batch(batch, DELETE_EXPANSES)
+    for row in result.results:
+        if row.status == "deleted":
+            key_pool.discard("expanse_journal", row.key)
+    await reference_cache.invalidate("expanse_journal")
+    return result
+
 @router.put("/{id_expanse}", response_model=ExpanseResponse)
 async def update_expanse(id_expanse: int, expanse: ExpanseBase):
     updated_expanse = await db.execute_returning(
@@ -34,21 +93,41 @@ async def update_expanse(id_expanse: int, expanse: ExpanseBase):
         expanse.expanse_name,
         id_expanse
     )
+    await reference_cache.invalidate("expanse_journal", id_expanse)
     return ExpanseResponse(**updated_expanse)
 
-@router.get("/{id_expanse}", response_model=ExpanseResponse)
+@router.get(
+    "/{id_expanse}",
+    response_model=ExpanseResponse,
+    dependencies=[Depends(row_etag("expanse_journal", GET_EXPANSE_VERSION, "id_expanse"))]
+)
 async def get_expanse(id_expanse: int):
-    expanse = await db.fetch_one(GET_EXPANSE, id_expanse)
-    return ExpanseResponse(**expanse)
-
-@router.get("/", response_model=ExpanseList)
-async def get_all_expanses():
-    records = await db.fetch_all(GET_ALL_EXPANSES)
-    return ExpanseList(
-        expanses=[ExpanseResponse(**expanse) for expanse in records]
-    )
+    async def load():
+        expanse = await db.fetch_one(GET_EXPANSE, id_expanse)
+        return ExpanseResponse(**expanse)
+
+    return await reference_cache.get_or_load("expanse_journal", GET_EXPANSE, (id_expanse,), load)
+
+@router.get("/", response_model=ExpanseList, dependencies=[Depends(table_etag("expanse_journal"))])
+async def get_all_expanses(
+    response: Response,
+    stream: Optional[StreamFormat] = None,
+    fields: Optional[List[str]] = Depends(fields_param(ExpanseResponse))
+):
+    """Все записи; fields оставляет в запросе и ответе только перечисленные поля"""
+    query, columns = narrowed_query(GET_ALL_EXPANSES, list(ExpanseResponse.model_fields), fields)
+    if stream:
+        return stream_records(stream, query, fields=columns)
+    async def load():
+        records = await db.fetch_all(query)
+        return encode_records("expanses", ExpanseResponse, records, columns)
+
+    body = await reference_cache.get_or_load("expanse_journal", query, (), load)
+    return records_response(body, response)
 
 @router.delete("/{id_expanse}")
 async def delete_expanse(id_expanse: int):
     await db.execute_returning(DELETE_EXPANSE, id_expanse)
+    key_pool.discard("expanse_journal", id_expanse)
+    await reference_cache.invalidate("expanse_journal", id_expanse)
     return "Expanse deleted successful"
\ No newline at end of file
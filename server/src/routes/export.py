@@ -0,0 +1,148 @@
+import os
+import tempfile
+from typing import List, Literal, Tuple
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from server.src.database.db import db
+from server.src.database.requests import (
+    GET_ALL_ACCOUNTANTS,
+    GET_ALL_ADMISSIONS,
+    GET_ALL_CARS,
+    GET_ALL_CLIENTS,
+    GET_ALL_COMPANIES,
+    GET_ALL_DIRECTORS,
+    GET_ALL_DRIVERS,
+    GET_ALL_EXPANSES,
+    GET_ALL_LIFEGUARDS,
+    GET_ALL_SELLERS,
+    GET_ALL_WORKERS
+)
+from server.src.routes.streaming import stream_records
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+EXPORT_QUERIES = {
+    "accountants": GET_ALL_ACCOUNTANTS,
+    "admissions": GET_ALL_ADMISSIONS,
+    "cars": GET_ALL_CARS,
+    "clients": GET_ALL_CLIENTS,
+    "companies": GET_ALL_COMPANIES,
+    "directors": GET_ALL_DIRECTORS,
+    "drivers": GET_ALL_DRIVERS,
+    "expanses": GET_ALL_EXPANSES,
+    "lifeguards": GET_ALL_LIFEGUARDS,
+    "sellers": GET_ALL_SELLERS,
+    "workers": GET_ALL_WORKERS,
+}
+
+ExportEntity = Literal[
+    "accountants", "admissions", "cars", "clients", "companies", "directors",
+    "drivers", "expanses", "lifeguards", "sellers", "workers"
+]
+
+ExportFormat = Literal["xlsx", "csv", "parquet"]
+
+MEDIA_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+async def write_xlsx(query: str, path: str):
+    """Запись таблицы в xlsx через write-only книгу (строки не держатся в памяти)"""
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise HTTPException(status_code=501, detail="XLSX export requires openpyxl")
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Data")
+
+    def append_rows(records, with_header: bool):
+        if with_header:
+            sheet.append(list(records[0].keys()))
+        for record in records:
+            sheet.append(list(record.values()))
+
+    with_header = True
+    async for records in db.iterate(query):
+        await run_in_threadpool(append_rows, records, with_header)
+        with_header = False
+    await run_in_threadpool(workbook.save, path)
+
+
+def arrow_schema(pa, columns: List[Tuple[str, str]]):
+    """Схема parquet по типам столбцов запроса"""
+    # По значениям первой пачки столбец, целиком NULL в ней, получил бы тип null
+    # и следующая пачка с непустым значением не записалась бы
+    types = {
+        "bool": pa.bool_(),
+        "int2": pa.int16(),
+        "int4": pa.int32(),
+        "int8": pa.int64(),
+        "float4": pa.float32(),
+        "float8": pa.float64(),
+        "numeric": pa.decimal128(38, 10),
+        "date": pa.date32(),
+        "timestamp": pa.timestamp("us"),
+        "timestamptz": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types.get(type_name, pa.string())) for name, type_name in columns])
+
+
+async def write_parquet(query: str, path: str):
+    """Запись таблицы в parquet, по одной row group на пачку курсора"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    schema = arrow_schema(pa, await db.describe(query))
+    # Остальные типы (text, varchar и пр.) пишутся строками
+    as_text = [field.name for field in schema if pa.types.is_string(field.type)]
+    # Писатель создаётся до чтения: пустая таблица тоже даёт корректный файл со схемой
+    writer = pq.ParquetWriter(path, schema)
+    try:
+        async for records in db.iterate(query):
+            rows = [dict(record) for record in records]
+            for row in rows:
+                for name in as_text:
+                    if row[name] is not None and not isinstance(row[name], str):
+                        row[name] = str(row[name])
+            table = pa.Table.from_pylist(rows, schema=schema)
+            await run_in_threadpool(writer.write_table, table)
+    finally:
+        writer.close()
+
+
+WRITERS = {
+    "xlsx": write_xlsx,
+    "parquet": write_parquet,
+}
+
+
+@router.get("/{entity}.{extension}")
+async def export_table(entity: ExportEntity, extension: ExportFormat):
+    """Выгрузка таблицы целиком в xlsx, csv или parquet"""
+    query = EXPORT_QUERIES[entity]
+    if extension == "csv":
+        response = stream_records("csv", query)
+        response.headers["Content-Disposition"] = f'attachment; filename="{entity}.csv"'
+        return response
+
+    fd, path = tempfile.mkstemp(suffix=f".{extension}")
+    os.close(fd)
+    try:
+        await WRITERS[extension](query, path)
+    except BaseException:
+        os.remove(path)
+        raise
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[extension],
+        filename=f"{entity}.{extension}",
+        background=BackgroundTask(os.remove, path)
+    )
@@ -0,0 +1,57 @@
+from typing import Callable, List, Optional, Sequence, Tuple, Type
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from server.src.database.projection import narrow_select
+from server.src.routes.expand import split_names
+
+
+def fields_param(model: Type[BaseModel]) -> Callable:
+    """Зависимость: поля из ?fields=a,b (только поля модели ответа, иначе 422); None - все поля"""
+    allowed = list(model.model_fields)
+    description = f"Поля через запятую: {', '.join(allowed)}"
+
+    def dependency(fields: Optional[str] = Query(default=None, description=description)) -> Optional[List[str]]:
+        if fields is None:
+            return None
+        names = split_names(fields)
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown fields: {', '.join(unknown)}; allowed: {', '.join(allowed)}"
+            )
+        if not names:
+            raise HTTPException(status_code=422, detail="No fields requested")
+        return names
+    return dependency
+
+
+def select_fields(available: Sequence[str], fields: Optional[Sequence[str]]) -> List[str]:
+    """Поля ответа: все доступные или только запрошенные (в порядке модели)"""
+    if fields is None:
+        return list(available)
+    missing = [name for name in fields if name not in available]
+    if missing:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Fields {', '.join(missing)} need the matching expand"
+        )
+    return [name for name in available if name in fields]
+
+
+def with_key(fields: Sequence[str], key: str) -> List[str]:
+    """Столбцы запроса: поля ответа и ключ пагинации, даже если его нет в fields"""
+    return list(fields) if key in fields else [*fields, key]
+
+
+def narrowed_query(
+        query: str,
+        available: Sequence[str],
+        fields: Optional[Sequence[str]],
+        key: Optional[str] = None
+) -> Tuple[str, List[str]]:
+    """Запрос и поля ответа с учётом ?fields= (без fields - запрос как есть и все поля)"""
+    columns = select_fields(available, fields)
+    if fields is None:
+        return query, columns
+    return narrow_select(query, with_key(columns, key) if key else columns), columns
@@ -0,0 +1,9 @@
+from typing import Optional
+
+
+def contains_pattern(search: Optional[str]) -> Optional[str]:
+    """Шаблон ILIKE «содержит search»: %, _ и \\ из строки поиска ищутся как обычные символы"""
+    if not search:
+        return None
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
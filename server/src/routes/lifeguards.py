@@ -1,34 +1,87 @@
-from fastapi import APIRouter
+from typing import List, Optional
+from fastapi import APIRouter, Request, Depends, Response
 from server.src.database.requests import (
     CREATE_LIFEGUARD,
     UPDATE_LIFEGUARD,
     DELETE_LIFEGUARD,
     GET_LIFEGUARD,
+    GET_LIFEGUARD_EXPANDED,
     GET_ALL_LIFEGUARDS,
-    GET_AVAILABLE_LIFEGUARDS
+    GET_ALL_LIFEGUARDS_EXPANDED,
+    GET_AVAILABLE_LIFEGUARDS,
+    GET_LIFEGUARD_VERSION,
+    GET_LIFEGUARDS_FOR_UPDATE,
+    DELETE_LIFEGUARDS
 )
 from server.src.database.db import db
+from server.src.models.bulk import BulkResult
+from server.src.routes.bulk import read_bulk_rows
+from server.src.routes.roles import claim_worker, claim_workers, copy_roles
+from server.src.routes.batch import delete_batch, update_batch
+from server.src.models.batch import BatchDelete, BatchResult, BatchUpdate
+from server.src.routes.streaming import StreamFormat, stream_records
+from server.src.routes.conditional import row_etag, table_etag
+from server.src.routes.expand import expand_param, expanded_fields
+from server.src.routes.fields import fields_param, narrowed_query
+from server.src.routes.serialization import encode_records, records_response
 from server.src.models.lifeguard import (
     LifeguardResponse,
     LifeguardBase,
-    LifeguardList
+    LifeguardDetail,
+    LifeguardDetailList
 )
 
 router = APIRouter(prefix="/lifeguards", tags=["lifeguards"])
 
+# Связи для ?expand=
+EXPAND = ("worker",)
+
 @router.post("/", response_model=LifeguardResponse)
 async def create_lifeguard(lifeguard: LifeguardBase):
-    available_workers = await db.fetch_all(GET_AVAILABLE_LIFEGUARDS)
-    selected_worker = available_workers[0]
-    new_lifeguard = await db.execute_returning(
+    new_lifeguard = await claim_worker(
         CREATE_LIFEGUARD,
-        selected_worker['worker_id'],
         lifeguard.uniform,
         lifeguard.kit,
         lifeguard.security_zone
     )
     return LifeguardResponse(**new_lifeguard)
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_lifeguards_bulk(request: Request):
+    """Массовое создание из JSON-массива или NDJSON через COPY"""
+    async def batches():
+        async for lifeguards in read_bulk_rows(request, LifeguardBase):
+            worker_ids = await claim_workers(GET_AVAILABLE_LIFEGUARDS, len(lifeguards))
+            yield [
+                (
+                    worker_id,
+                    lifeguard.uniform,
+                    lifeguard.kit,
+                    lifeguard.security_zone
+                )
+                for worker_id, lifeguard in zip(worker_ids, lifeguards)
+            ]
+
+    inserted = await copy_roles(
+        "lifeguards",
+        ["worker_id", "uniform", "kit", "security_zone"],
+        batches()
+    )
+    return BulkResult(inserted=inserted)
+
+@router.patch("/batch", response_model=BatchResult)
+async def update_lifeguards_batch(batch: BatchUpdate):
+    """Частичное обновление охранников одной транзакцией (executemany)"""
+    return await update_batch(
+        batch, GET_LIFEGUARDS_FOR_UPDATE, UPDATE_LIFEGUARD, "worker_id",
+        ("uniform", "kit", "security_zone"), LifeguardBase
+    )
+
+@router.delete("/batch", response_model=BatchResult)
+async def delete_lifeguards_batch(batch: BatchDelete):
+    """Удаление охранников по списку ключей одним запросом"""
+    return await delete_batch(batch, DELETE_LIFEGUARDS)
+
 @router.put("/{worker_id}", response_model=LifeguardResponse)
 async def update_lifeguard(worker_id: int, lifeguard: LifeguardBase):
     updated_lifeguard = await db.execute_returning(
@@ -40,17 +93,36 @@ async def update_lifeguard(worker_id: int, lifeguard: LifeguardBase):
     )
     return LifeguardResponse(**updated_lifeguard)
 
-@router.get("/{worker_id}", response_model=LifeguardResponse)
-async def get_lifeguard(worker_id: int):
-    lifeguard = await db.fetch_one(GET_LIFEGUARD, worker_id)
-    return LifeguardResponse(**lifeguard)
+@router.get(
+    "/{worker_id}",
+    response_model=LifeguardDetail,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(row_etag("lifeguards", GET_LIFEGUARD_VERSION, "worker_id", expand=EXPAND))]
+)
+async def get_lifeguard(worker_id: int, expand: List[str] = Depends(expand_param(*EXPAND))):
+    lifeguard = await db.fetch_one(GET_LIFEGUARD_EXPANDED if expand else GET_LIFEGUARD, worker_id)
+    return LifeguardDetail(**{name: lifeguard[name] for name in expanded_fields(LifeguardResponse, expand)})
+
+@router.get("/", response_model=LifeguardDetailList, dependencies=[Depends(table_etag("lifeguards", expand=EXPAND))])
+async def get_all_lifeguards(
+    response: Response,
+    stream: Optional[StreamFormat] = None,
+    expand: List[str] = Depends(expand_param(*EXPAND)),
+    fields: Optional[List[str]] = Depends(fields_param(LifeguardDetail))
+):
+    """Все записи; expand добавляет поля связанных таблиц из одного JOIN-запроса.
 
-@router.get("/", response_model=LifeguardList)
-async def get_all_lifeguards():
-    records = await db.fetch_all(GET_ALL_LIFEGUARDS)
-    return LifeguardList(
-        lifeguards=[LifeguardResponse(**lifeguard) for lifeguard in records]
+    fields оставляет в запросе и ответе только перечисленные поля.
+    """
+    query, columns = narrowed_query(
+        GET_ALL_LIFEGUARDS_EXPANDED if expand else GET_ALL_LIFEGUARDS,
+        expanded_fields(LifeguardResponse, expand),
+        fields
     )
+    if stream:
+        return stream_records(stream, query, fields=columns)
+    records = await db.fetch_all(query)
+    return records_response(encode_records("lifeguards", LifeguardDetail, records, columns), response)
 
 @router.delete("/{worker_id}")
 async def delete_lifeguard(worker_id: int):
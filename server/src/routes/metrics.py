@@ -0,0 +1,38 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from server.src.database.db import db
+from server.src.database.statements import registry
+from server.src.database.cache import reference_cache
+from server.src.monitoring import render_prometheus
+from server.src.scheduler import scheduler
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """Все метрики в текстовом формате Prometheus"""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/db")
+async def get_db_metrics():
+    """Размер пула, занятые соединения, ожидание соединения и задержки запросов"""
+    return db.pool_stats()
+
+
+@router.get("/statements")
+async def get_statement_metrics():
+    """Число вызовов и время выполнения именованных запросов из requests.py"""
+    return registry.snapshot()
+
+
+@router.get("/cache")
+async def get_cache_metrics():
+    """Размер и попадания кэша справочных таблиц"""
+    return reference_cache.stats()
+
+
+@router.get("/scheduler")
+async def get_scheduler_metrics():
+    """Запуски, ошибки и длительность периодических задач"""
+    return scheduler.stats()
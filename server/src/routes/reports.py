@@ -0,0 +1,82 @@
+import hashlib
+from datetime import date
+from typing import Dict, Literal, Optional, Type, Union
+from fastapi import APIRouter, Query, Request, Response
+from pydantic import BaseModel
+from server.src.database.cache import report_cache
+from server.src.database.db import db
+from server.src.database.reports import REPORTS, report_source
+from server.src.models.report import (
+    AdmissionsMonth,
+    AdmissionsReport,
+    ExpanseReport,
+    ExpanseTotal,
+    PayrollByDirector,
+    PayrollByDirectorReport,
+    PayrollByPost,
+    PayrollByPostReport,
+    StockByMark,
+    StockByMarkReport,
+    StockByModel,
+    StockByModelReport,
+    StockByYear,
+    StockByYearReport
+)
+from server.src.routes.conditional import apply_etag
+from server.src.routes.serialization import encode_records, records_response
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+PayrollGroup = Literal["post", "director"]
+
+StockGroup = Literal["mark", "model", "year"]
+
+# Модель строки отчёта для каждой группировки
+PAYROLL_ROWS: Dict[str, Type[BaseModel]] = {"post": PayrollByPost, "director": PayrollByDirector}
+
+STOCK_ROWS: Dict[str, Type[BaseModel]] = {"mark": StockByMark, "model": StockByModel, "year": StockByYear}
+
+
+async def run_report(request: Request, response: Response, name: str, model: Type[BaseModel], *args):
+    """Отчёт из кэша; ключ кэша и ETag - версия данных, из которых он посчитан"""
+    report = REPORTS[name]
+    source = await report_source(report)
+    params = hashlib.blake2b(request.url.query.encode(), digest_size=6).hexdigest()
+    mode = "view" if source.refreshed_at is not None else "table"
+    apply_etag(request, response, f'W/"report.{name}.{mode}.{source.version}.{params}"')
+
+    async def load():
+        records = await db.fetch_all(source.query, *args)
+        return encode_records("rows", model, records, refreshed_at=source.refreshed_at)
+
+    body = await report_cache.get_or_load(report.table, source.query, (source.version, *args), load)
+    return records_response(body, response)
+
+
+@router.get("/expanses", response_model=ExpanseReport)
+async def get_expanses_report(request: Request, response: Response):
+    """Число, сумма, среднее, минимум и максимум расходов по типу"""
+    return await run_report(request, response, "expanses_by_type", ExpanseTotal)
+
+
+@router.get("/payroll", response_model=Union[PayrollByPostReport, PayrollByDirectorReport])
+async def get_payroll_report(request: Request, response: Response, by: PayrollGroup = "post"):
+    """Фонд оплаты труда по должности или по директору"""
+    return await run_report(request, response, f"payroll_by_{by}", PAYROLL_ROWS[by])
+
+
+@router.get("/stock", response_model=Union[StockByMarkReport, StockByModelReport, StockByYearReport])
+async def get_stock_report(request: Request, response: Response, by: StockGroup = "mark"):
+    """Число автомобилей и свободных (без клиента) по марке, марке и модели или году выпуска"""
+    return await run_report(request, response, f"stock_by_{by}", STOCK_ROWS[by])
+
+
+@router.get("/admissions", response_model=AdmissionsReport)
+async def get_admissions_report(
+    request: Request,
+    response: Response,
+    from_month: Optional[date] = Query(default=None),
+    to_month: Optional[date] = Query(default=None)
+):
+    """Поставки по месяцам; from_month и to_month - любые даты первого и последнего месяца"""
+    return await run_report(request, response, "admissions_by_month", AdmissionsMonth, from_month, to_month)
@@ -0,0 +1,44 @@
+from typing import AsyncIterable, List
+import asyncpg
+from fastapi import HTTPException
+from server.src.database.db import db
+
+CLAIM_ATTEMPTS = 3
+
+
+async def claim_worker(query: str, *args):
+    """Вставка роли с атомарным выбором свободного сотрудника (CREATE_ACCOUNTANT и др.).
+
+    Параллельная транзакция могла занять того же сотрудника и закоммитить до нашей
+    блокировки строки - тогда первичный ключ роли не даст дубля, и запрос повторяется.
+    """
+    for _ in range(CLAIM_ATTEMPTS):
+        try:
+            record = await db.execute_returning(query, *args)
+        except asyncpg.UniqueViolationError:
+            continue
+        if record is None:
+            raise HTTPException(status_code=409, detail="No available workers")
+        return record
+    raise HTTPException(status_code=409, detail="Could not claim an available worker")
+
+
+async def claim_workers(query: str, count: int) -> List[int]:
+    """Свободные сотрудники для пачки массовой вставки (GET_AVAILABLE_* внутри copy_roles)"""
+    worker_ids = [record["worker_id"] for record in await db.fetch_all(query, count)]
+    if len(worker_ids) < count:
+        raise HTTPException(status_code=409, detail="Not enough available workers")
+    return worker_ids
+
+
+async def copy_roles(table: str, columns: List[str], batches: AsyncIterable[List[tuple]]) -> int:
+    """Массовая вставка ролей: выбор сотрудников и COPY в одной транзакции на одном соединении.
+
+    Строки сотрудников заблокированы до конца транзакции, поэтому параллельные загрузки
+    их не получат; нарушение первичного ключа роли всё же возвращается как 409, а не 500.
+    """
+    try:
+        async with db.transaction():
+            return await db.copy_records(table, columns, batches)
+    except asyncpg.UniqueViolationError:
+        raise HTTPException(status_code=409, detail="Workers were claimed concurrently")
@@ -0,0 +1,84 @@
+import re
+from typing import Optional
+from fastapi import APIRouter, Query, Response
+from server.src.config import settings
+from server.src.database.db import db
+from server.src.database.requests import (
+    HAS_EXTENSION,
+    SEARCH_CARS,
+    SEARCH_CARS_FUZZY,
+    SEARCH_WORKERS,
+    SEARCH_WORKERS_FUZZY
+)
+from server.src.models.search import CarMatch, CarSearch, WorkerMatch, WorkerSearch
+from server.src.routes.serialization import encode_records, records_response
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+# Слова запроса сверх этого числа отбрасываются
+MAX_TERMS = 8
+
+# Префикс из одной буквы совпадает почти со всем индексом: такие слова отбрасываются,
+# если есть более длинные, а иначе ищутся целиком
+MIN_PREFIX_LENGTH = 2
+
+# Есть ли pg_trgm (миграция 0004_search ставит его, если расширение доступно); проверяется один раз
+trigram: Optional[bool] = None
+
+
+async def has_trigram() -> bool:
+    global trigram
+    if trigram is None:
+        record = await db.fetch_one(HAS_EXTENSION, "pg_trgm")
+        trigram = record[0]
+    return trigram
+
+
+def prefix_query(q: str, weight: str = "") -> Optional[str]:
+    """Строка поиска в tsquery: все слова как префиксы (иван петр -> иван:* & петр:*).
+
+    weight оставляет только совпадения в полях с этим весом (A: иван:*A & петр:*A).
+    """
+    terms = re.findall(r"\w+", q)[:MAX_TERMS]
+    if not terms:
+        return None
+    prefixes = [f"{term}:*{weight}" for term in terms if len(term) >= MIN_PREFIX_LENGTH]
+    if prefixes:
+        return " & ".join(prefixes)
+    return " & ".join(f"{term}:{weight}" if weight else term for term in terms)
+
+
+async def search(query: str, fuzzy_query: str, q: str, limit: int):
+    """Совпадения по убыванию ранга среди кандидатов (сначала совпавшие по главным полям).
+
+    Без pg_trgm - только полнотекстовые.
+    """
+    tsquery = prefix_query(q)
+    if tsquery is None:
+        return []
+    named = prefix_query(q, "A")
+    if await has_trigram():
+        return await db.fetch_all(fuzzy_query, tsquery, limit, settings.SEARCH_CANDIDATES, named, q)
+    return await db.fetch_all(query, tsquery, limit, settings.SEARCH_CANDIDATES, named)
+
+
+@router.get("/workers", response_model=WorkerSearch)
+async def search_workers(
+    response: Response,
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=100)
+):
+    """Поиск сотрудников по ФИО, должности и адресу (подходит для подсказок при вводе)"""
+    records = await search(SEARCH_WORKERS, SEARCH_WORKERS_FUZZY, q, limit)
+    return records_response(encode_records("workers", WorkerMatch, records), response)
+
+
+@router.get("/cars", response_model=CarSearch)
+async def search_cars(
+    response: Response,
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=100)
+):
+    """Поиск автомобилей по VIN, марке, модели, комплектации и цвету"""
+    records = await search(SEARCH_CARS, SEARCH_CARS_FUZZY, q, limit)
+    return records_response(encode_records("cars", CarMatch, records), response)
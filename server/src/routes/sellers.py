@@ -1,44 +1,93 @@
-from fastapi import APIRouter
-from random import Random
+from typing import List, Optional
+from fastapi import APIRouter, Request, Depends, Response
 from server.src.database.requests import (
     CREATE_SELLER,
     UPDATE_SELLER,
     DELETE_SELLER,
     GET_SELLER,
+    GET_SELLER_EXPANDED,
     GET_ALL_SELLERS,
+    GET_ALL_SELLERS_EXPANDED,
     GET_AVAILABLE_SELLERS,
-    GET_RANDOM_APP_NUMBER
+    GET_SELLER_VERSION,
+    GET_SELLERS_FOR_UPDATE,
+    DELETE_SELLERS
 )
-from server.src.database.db import db, Database
+from server.src.database.db import db
+from server.src.database.key_pool import key_pool
+from server.src.models.bulk import BulkResult
+from server.src.routes.bulk import read_bulk_rows
+from server.src.routes.roles import claim_worker, claim_workers, copy_roles
+from server.src.routes.batch import delete_batch, update_batch
+from server.src.models.batch import BatchDelete, BatchResult, BatchUpdate
+from server.src.routes.streaming import StreamFormat, stream_records
+from server.src.routes.conditional import row_etag, table_etag
+from server.src.routes.expand import expand_param, expanded_fields
+from server.src.routes.fields import fields_param, narrowed_query
+from server.src.routes.serialization import encode_records, records_response
 from server.src.models.seller import (
     SellerResponse,
     SellerBase,
-    SellerList
+    SellerDetail,
+    SellerDetailList
 )
 
 router = APIRouter(prefix="/sellers", tags=["sellers"])
 
-async def get_random_app_number(db: Database) -> int:
-    """Получает случайный app_number из таблицы client"""
-    records = await db.fetch_all(GET_RANDOM_APP_NUMBER)
-    return Random().choice([record['app_number'] for record in records])
+# Связи для ?expand=
+EXPAND = ("worker", "client")
 
 @router.post("/", response_model=SellerResponse)
 async def create_seller(seller: SellerBase):
-    available_workers = await db.fetch_all(GET_AVAILABLE_SELLERS)
-    selected_worker = available_workers[0]
-    app_number = await get_random_app_number(db)
-    new_seller = await db.execute_returning(
+    app_number = await key_pool.sample("client")
+    new_seller = await claim_worker(
         CREATE_SELLER,
-        selected_worker['worker_id'],
         seller.seller_type,
         app_number
     )
     return SellerResponse(**new_seller)
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_sellers_bulk(request: Request):
+    """Массовое создание из JSON-массива или NDJSON через COPY"""
+    # Ключи выбираются до COPY: внутри него второе соединение из пула не берётся
+    sample_key = await key_pool.sampler("client")
+
+    async def batches():
+        async for sellers in read_bulk_rows(request, SellerBase):
+            worker_ids = await claim_workers(GET_AVAILABLE_SELLERS, len(sellers))
+            yield [
+                (
+                    worker_id,
+                    seller.seller_type,
+                    sample_key()
+                )
+                for worker_id, seller in zip(worker_ids, sellers)
+            ]
+
+    inserted = await copy_roles(
+        "seller",
+        ["worker_id", "seller_type", "app_number"],
+        batches()
+    )
+    return BulkResult(inserted=inserted)
+
+@router.patch("/batch", response_model=BatchResult)
+async def update_sellers_batch(batch: BatchUpdate):
+    """Частичное обновление продавцов одной транзакцией (executemany)"""
+    return await update_batch(
+        batch, GET_SELLERS_FOR_UPDATE, UPDATE_SELLER, "worker_id",
+        ("seller_type", "app_number"), SellerResponse
+    )
+
+@router.delete("/batch", response_model=BatchResult)
+async def delete_sellers_batch(batch: BatchDelete):
+    """Удаление продавцов по списку ключей одним запросом"""
+    return await delete_batch(batch, DELETE_SELLERS)
+
 @router.put("/{worker_id}", response_model=SellerResponse)
 async def update_seller(worker_id: int, seller: SellerBase):
-    app_number = await get_random_app_number(db)
+    app_number = await key_pool.sample("client")
     updated_seller = await db.execute_returning(
         UPDATE_SELLER,
         seller.seller_type,
@@ -47,17 +96,36 @@ async def update_seller(worker_id: int, seller: SellerBase):
     )
     return SellerResponse(**updated_seller)
 
-@router.get("/{worker_id}", response_model=SellerResponse)
-async def get_seller(worker_id: int):
-    seller = await db.fetch_one(GET_SELLER, worker_id)
-    return SellerResponse(**seller)
+@router.get(
+    "/{worker_id}",
+    response_model=SellerDetail,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(row_etag("seller", GET_SELLER_VERSION, "worker_id", expand=EXPAND))]
+)
+async def get_seller(worker_id: int, expand: List[str] = Depends(expand_param(*EXPAND))):
+    seller = await db.fetch_one(GET_SELLER_EXPANDED if expand else GET_SELLER, worker_id)
+    return SellerDetail(**{name: seller[name] for name in expanded_fields(SellerResponse, expand)})
+
+@router.get("/", response_model=SellerDetailList, dependencies=[Depends(table_etag("seller", expand=EXPAND))])
+async def get_all_sellers(
+    response: Response,
+    stream: Optional[StreamFormat] = None,
+    expand: List[str] = Depends(expand_param(*EXPAND)),
+    fields: Optional[List[str]] = Depends(fields_param(SellerDetail))
+):
+    """Все записи; expand добавляет поля связанных таблиц из одного JOIN-запроса.
 
-@router.get("/", response_model=SellerList)
-async def get_all_sellers():
-    records = await db.fetch_all(GET_ALL_SELLERS)
-    return SellerList(
-        sellers=[SellerResponse(**seller) for seller in records]
+    fields оставляет в запросе и ответе только перечисленные поля.
+    """
+    query, columns = narrowed_query(
+        GET_ALL_SELLERS_EXPANDED if expand else GET_ALL_SELLERS,
+        expanded_fields(SellerResponse, expand),
+        fields
     )
+    if stream:
+        return stream_records(stream, query, fields=columns)
+    records = await db.fetch_all(query)
+    return records_response(encode_records("sellers", SellerDetail, records, columns), response)
 
 @router.delete("/{worker_id}")
 async def delete_seller(worker_id: int):
@@ -0,0 +1,88 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Type
+from uuid import UUID
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+try:
+    import orjson
+except ImportError:  # без orjson работает стандартный json, только медленнее
+    orjson = None
+
+
+def encode_default(value: Any):
+    """Типы asyncpg, которые не сериализуются напрямую"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dump_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=encode_default)
+    return json.dumps(
+        payload, default=encode_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class RecordsJSONResponse(Response):
+    """JSON-ответ без построения pydantic-моделей (bytes отдаются как есть)"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dump_json(content)
+
+
+def model_defaults(model: Type[BaseModel]) -> Dict[str, Any]:
+    return {
+        name: None if field.default is PydanticUndefined else field.default
+        for name, field in model.model_fields.items()
+    }
+
+
+def project_records(
+        model: Type[BaseModel],
+        records: Sequence,
+        fields: Optional[Sequence[str]] = None
+) -> List[Dict[str, Any]]:
+    """Записи asyncpg в словари с полями модели ответа (или только fields), без валидации"""
+    if not records:
+        return []
+    defaults = model_defaults(model)
+    if fields is not None:
+        defaults = {name: defaults[name] for name in fields}
+    if set(records[0].keys()) == defaults.keys():
+        return [dict(record) for record in records]
+    return [
+        {name: record.get(name, default) for name, default in defaults.items()}
+        for record in records
+    ]
+
+
+def encode_records(
+        key: str,
+        model: Type[BaseModel],
+        records: Sequence,
+        fields: Optional[Sequence[str]] = None,
+        **extra
+) -> bytes:
+    """Тело списка {key: [...], **extra} сразу в JSON-байты"""
+    return dump_json({key: project_records(model, records, fields), **extra})
+
+
+def records_response(body: bytes, response: Response) -> RecordsJSONResponse:
+    """Готовое тело с заголовками, выставленными зависимостями (например, ETag)"""
+    headers = {
+        name: value for name, value in response.headers.items()
+        if name != "content-length"
+    }
+    return RecordsJSONResponse(body, headers=headers)
@@ -0,0 +1,61 @@
+import csv
+import io
+from typing import AsyncIterator, Literal, Optional, Sequence
+from fastapi.responses import StreamingResponse
+from server.src.database.db import db
+from server.src.routes.serialization import dump_json
+
+StreamFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def encode_ndjson(chunks: AsyncIterator) -> AsyncIterator[bytes]:
+    """Строки в том же виде, что и в JSON-списках (dump_json): числа остаются числами"""
+    async for records in chunks:
+        yield b"".join(dump_json(dict(record)) + b"\n" for record in records)
+
+
+async def encode_csv(chunks: AsyncIterator) -> AsyncIterator[str]:
+    header_written = False
+    async for records in chunks:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not header_written:
+            writer.writerow(records[0].keys())
+            header_written = True
+        writer.writerows(record.values() for record in records)
+        yield buffer.getvalue()
+
+
+ENCODERS = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+}
+
+
+async def project_chunks(chunks: AsyncIterator, fields: Sequence[str]) -> AsyncIterator:
+    async for records in chunks:
+        yield [{name: record[name] for name in fields} for record in records]
+
+
+def stream_records(
+        stream: StreamFormat,
+        query: str,
+        *args,
+        fields: Optional[Sequence[str]] = None
+) -> StreamingResponse:
+    """Потоковая отдача результата запроса в NDJSON или CSV без загрузки всей таблицы в память.
+
+    fields - столбцы, которые попадут в ответ (по умолчанию все столбцы запроса).
+    """
+    chunks = db.iterate(query, *args)
+    if fields is not None:
+        chunks = project_chunks(chunks, fields)
+    return StreamingResponse(
+        ENCODERS[stream](chunks),
+        media_type=MEDIA_TYPES[stream]
+    )
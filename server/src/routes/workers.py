@@ -1,53 +1,110 @@
-from random import Random
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Depends, Response
 from server.src.database.requests import (
     CREATE_WORKER,
-    GET_ALL_WORKERS,
+    GET_WORKERS_PAGE,
+    COUNT_WORKERS,
     GET_WORKER,
     DELETE_WORKER,
     UPDATE_WORKER,
-    GET_RANDOM_ID_EXPANSE,
-    GET_RANDOM_INN_DIRECTOR
+    GET_WORKER_VERSION,
+    GET_WORKERS_FOR_UPDATE,
+    DELETE_WORKERS
 )
 from server.src.models.worker import WorkerLine, WorkerBase, WorkerCreate, WorkerHelp
-from server.src.database.db import db, Database
+from server.src.database.db import db
+from server.src.database.key_pool import key_pool
+from server.src.models.bulk import BulkResult
+from server.src.routes.bulk import read_bulk_rows
+from server.src.routes.batch import delete_batch, update_batch
+from server.src.models.batch import BatchDelete, BatchResult, BatchUpdate
+from server.src.routes.streaming import StreamFormat, stream_records
+from server.src.routes.conditional import row_etag, table_etag
+from server.src.routes.fields import fields_param, narrowed_query
+from server.src.routes.filters import contains_pattern
+from server.src.routes.serialization import encode_records, records_response
 
 router = APIRouter(prefix="/workers", tags=["workers"])
 
 
-async def get_random_id_expanse(db: Database) -> int:
-    """Получает случайный id_expanse из таблицы expanse_journal"""
-    records = await db.fetch_all(GET_RANDOM_ID_EXPANSE)
-    return Random().choice([record['id_expanse'] for record in records])
-
-async def get_random_inn_director(db: Database) -> int:
-    """Получает случайный inn_director из таблицы director"""
-    records = await db.fetch_all(GET_RANDOM_INN_DIRECTOR)
-    return Random().choice([record['inn'] for record in records])
-
 @router.post("/", response_model=WorkerBase)
 async def create_worker(worker: WorkerCreate):
-    id_expanse = await get_random_id_expanse(db)
-    inn_director = await get_random_inn_director(db)
-    new_worker = await db.execute_returning(
-        CREATE_WORKER,
-        worker.salary,
-        worker.post,
-        worker.experience,
-        worker.surname,
-        worker.firstname,
-        worker.lastname,
-        worker.phone_number,
-        worker.address,
-        id_expanse,
-        inn_director
-    )
+    async with db.transaction():
+        id_expanse = await key_pool.sample("expanse_journal")
+        inn_director = await key_pool.sample("director")
+        new_worker = await db.execute_returning(
+            CREATE_WORKER,
+            worker.salary,
+            worker.post,
+            worker.experience,
+            worker.surname,
+            worker.firstname,
+            worker.lastname,
+            worker.phone_number,
+            worker.address,
+            id_expanse,
+            inn_director
+        )
     return WorkerHelp(**new_worker)
 
+@router.post("/bulk", response_model=BulkResult)
+async def create_workers_bulk(request: Request):
+    """Массовое создание из JSON-массива или NDJSON через COPY"""
+    async def batches():
+        async for workers in read_bulk_rows(request, WorkerCreate):
+            yield [
+                (
+                    worker.salary,
+                    worker.post,
+                    worker.experience,
+                    worker.surname,
+                    worker.firstname,
+                    worker.lastname,
+                    worker.phone_number,
+                    worker.address,
+                    await key_pool.sample("expanse_journal"),
+                    await key_pool.sample("director")
+                )
+                for worker in workers
+            ]
+
+    inserted = await db.copy_records(
+        "workers",
+        [
+            "salary",
+            "post",
+            "experience",
+            "surname",
+            "firstname",
+            "lastname",
+            "phone_number",
+            "address",
+            "id_expanse",
+            "inn_director"
+        ],
+        batches()
+    )
+    return BulkResult(inserted=inserted)
+
+@router.patch("/batch", response_model=BatchResult)
+async def update_workers_batch(batch: BatchUpdate):
+    """Частичное обновление сотрудников одной транзакцией (executemany)"""
+    return await update_batch(
+        batch, GET_WORKERS_FOR_UPDATE, UPDATE_WORKER, "worker_id",
+        ("salary", "post", "experience", "surname", "firstname", "lastname",
+         "phone_number", "address", "id_expanse", "inn_director"),
+        WorkerCreate
+    )
+
+@router.delete("/batch", response_model=BatchResult)
+async def delete_workers_batch(batch: BatchDelete):
+    """Удаление сотрудников по списку ключей одним запросом"""
+    return await delete_batch(batch, DELETE_WORKERS)
+
 @router.put("/{worker_id}", response_model=WorkerBase)
 async def update_worker(worker_id: int, worker: WorkerCreate):
-    id_expanse = await get_random_id_expanse(db)
-    inn_director = await get_random_inn_director(db)
+    id_expanse = await key_pool.sample("expanse_journal")
+    inn_director = await key_pool.sample("director")
     updated_worker = await db.execute_returning(
         UPDATE_WORKER,
         worker.salary,
@@ -65,28 +122,42 @@ async def update_worker(worker_id: int, worker: WorkerCreate):
     return WorkerHelp(**updated_worker)
 
 
-@router.get("/{worker_id}", response_model=WorkerHelp)  # Изменили на WorkerHelp
+@router.get(
+    "/{worker_id}",
+    response_model=WorkerHelp,
+    dependencies=[Depends(row_etag("workers", GET_WORKER_VERSION, "worker_id"))]
+)
 async def get_worker(worker_id: int):
     worker = await db.fetch_one(GET_WORKER, worker_id)
     return WorkerHelp(**worker)
 
-@router.get("/", response_model=WorkerLine)
-async def get_all_workers():
-    records = await db.fetch_all(GET_ALL_WORKERS)
-    workers_schema = WorkerLine(workers=[WorkerHelp(
-        worker_id=worker["worker_id"],
-        salary=worker["salary"],
-        post=worker["post"],
-        experience=worker["experience"],
-        surname=worker["surname"],
-        firstname=worker["firstname"],
-        lastname=worker["lastname"],
-        phone_number=worker["phone_number"],
-        address=worker["address"],
-        id_expanse=worker["id_expanse"],
-        inn_director=worker["inn_director"]
-    ) for worker in records])
-    return workers_schema
+@router.get("/", response_model=WorkerLine, dependencies=[Depends(table_etag("workers"))])
+async def get_all_workers(
+    response: Response,
+    after: int = Query(default=0, ge=0),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+    search: Optional[str] = None,
+    post: Optional[str] = None,
+    total: bool = False,
+    stream: Optional[StreamFormat] = None,
+    fields: Optional[List[str]] = Depends(fields_param(WorkerHelp))
+):
+    """Страница сотрудников после worker_id = after; без limit - все записи.
+
+    fields оставляет только перечисленные поля (worker_id для next_after выбирается всегда).
+    """
+    pattern = contains_pattern(search)
+    query, columns = narrowed_query(GET_WORKERS_PAGE, list(WorkerHelp.model_fields), fields, key="worker_id")
+    if stream:
+        return stream_records(stream, query, after, pattern, post, limit, fields=columns)
+    records = await db.fetch_all(query, after, pattern, post, limit)
+    extra = {"next_after": None, "total": None}
+    if limit and len(records) == limit:
+        extra["next_after"] = records[-1]["worker_id"]
+    if total:
+        count = await db.fetch_one(COUNT_WORKERS, pattern, post)
+        extra["total"] = count["count"]
+    return records_response(encode_records("workers", WorkerHelp, records, columns, **extra), response)
 
 @router.delete("/{worker_id}")
 async def delete_user(worker_id: int):
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from server.src.database.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+JOB_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+
+
+class Job:
+    """Периодическая задача и её метрики"""
+
+    def __init__(self, name: str, interval: float, func: Callable[[], Awaitable[Optional[int]]]):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.runs = 0
+        self.failures = 0
+        self.processed = 0
+        self.last_started: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.duration = Histogram(JOB_BUCKETS)
+
+    async def run_once(self):
+        """Один запуск; func возвращает число обработанных строк (или None)"""
+        self.last_started = time.time()
+        started = time.perf_counter()
+        try:
+            processed = await self.func()
+        except Exception as e:
+            self.failures += 1
+            self.last_error = repr(e)
+            logger.exception("Scheduled job %s failed", self.name)
+        else:
+            self.processed += processed or 0
+            self.last_error = None
+        finally:
+            self.runs += 1
+            self.last_duration = time.perf_counter() - started
+            self.duration.observe(self.last_duration)
+
+    async def loop(self):
+        # Первый запуск в случайный момент интервала, чтобы процессы не чистили таблицы одновременно
+        await asyncio.sleep(random.uniform(0, self.interval))
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "interval": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "processed": self.processed,
+            "last_started": self.last_started,
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+            "duration_seconds": self.duration.snapshot(),
+        }
+
+
+class Scheduler:
+    """Фоновые периодические задачи процесса (очистка просроченных данных и т.п.).
+
+    Задачи регистрируются через add до старта приложения и запускаются в lifespan.
+    Каждый процесс выполняет их независимо, поэтому задачи должны быть идемпотентны.
+    """
+
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+        self.tasks: List[asyncio.Task] = []
+
+    def add(self, name: str, interval: float, func: Callable[[], Awaitable[Optional[int]]]) -> Job:
+        if name in self.jobs:
+            raise ValueError(f"Job {name} is already scheduled")
+        job = Job(name, interval, func)
+        self.jobs[name] = job
+        return job
+
+    async def open(self):
+        self.tasks = [
+            asyncio.create_task(job.loop(), name=f"job:{job.name}")
+            for job in self.jobs.values()
+            if job.interval > 0
+        ]
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [job.snapshot() for job in self.jobs.values()]
+
+
+scheduler = Scheduler()